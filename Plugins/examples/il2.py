@@ -85,8 +85,7 @@ sticky_flaps = StickyButtons([10, 11])
 @throttle.button(28)  # bottom thumb hat down
 def flaps_dn(event, joy):
     if event.is_pressed:
-        sticky_flaps.release_all()
-        sticky_flaps.press(11)
+        sticky_flaps.press_only(11)
     else:
         if is_paddle_pulled(joy):
             return
@@ -96,8 +95,7 @@ def flaps_dn(event, joy):
 @throttle.button(30)  # bottom thumb hat up
 def flaps_up(event, joy):
     if event.is_pressed:
-        sticky_flaps.release_all()
-        sticky_flaps.press(10)
+        sticky_flaps.press_only(10)
     else:
         if is_paddle_pulled(joy):
             return
@@ -112,8 +110,7 @@ sticky_trim = StickyButtons([12, 13])
 @stick.button(9)  # trim hat up
 def trim_nose_dn(event, joy):
     if event.is_pressed:
-        sticky_trim.release_all()
-        sticky_trim.press(13)
+        sticky_trim.press_only(13)
     else:
         # always release this trim direction
         sticky_trim.release(13)
@@ -122,8 +119,7 @@ def trim_nose_dn(event, joy):
 @stick.button(11)  # trim hat dn
 def trim_nose_up(event, joy):
     if event.is_pressed:
-        sticky_trim.release_all()
-        sticky_trim.press(12)
+        sticky_trim.press_only(12)
     else:
         if is_paddle_pulled(joy):
             return
@@ -2,7 +2,8 @@ from gremlin.user_plugin import *
 
 from jge.utils.easing_functions import EasingGenerator, SmoothStep
 from jge.axes.tuned_axis import AxisTuning, TunedAxis
-from jge.axes.trimmed_axis import Scaling, TrimmedAxis
+from jge.axes.trimmed_axis import Scaling, TrimBundle, TrimmedAxis
+from jge.axes.specialize import specialize_trimmed_axis
 
 from Plugins.device_decorators import stick, pedals, is_paddle_pulled
 
@@ -52,31 +53,27 @@ z_axis = TrimmedAxis(
     TunedAxis(3, AxisTuning(z_curvature.value)), smooth_trim_easing=easing
 )
 
+# bundles trim all of their axes together from one scheduler task
+all_axes = TrimBundle([x_axis, y_axis, z_axis])
+stick_axes = TrimBundle([x_axis, y_axis])
+
 
 def reset_trim():
     """helper function to reset trim on all axes"""
-    x_axis.trim_smooth(0)
-    y_axis.trim_smooth(0)
-    z_axis.trim_smooth(0)
+    all_axes.trim_smooth([0, 0, 0])
 
 
 # handle axis movement ---------------------------------------------------------
 
-
-@stick.axis(1)
-def roll_moved(event):
-    x_axis.set_vjoy(event.value, Scaling.Dynamic)
-
-
-@stick.axis(2)
-def pitch_moved(event):
-    y_axis.set_vjoy(event.value, Scaling.Dynamic)
-
-
+# these callbacks are generated just for each axis's settings, so they do as
+# little work per event as possible. they're equivalent to:
+#
+# def roll_moved(event):
+#     x_axis.set_vjoy(event.value, Scaling.Dynamic)
+roll_moved = stick.axis(1)(specialize_trimmed_axis(x_axis, Scaling.Dynamic))
+pitch_moved = stick.axis(2)(specialize_trimmed_axis(y_axis, Scaling.Dynamic))
 # it's technically crosswind axis 6 even though it's labeled as axis 3 in JG UI. weird.
-@pedals.axis(6)
-def rudder_moved(event):
-    z_axis.set_vjoy(event.value, Scaling.Dynamic)
+rudder_moved = pedals.axis(6)(specialize_trimmed_axis(z_axis, Scaling.Dynamic))
 
 
 # handle position trimming -----------------------------------------------------
@@ -92,8 +89,7 @@ def position_trim(event, joy):
             reset_trim()
         else:
             # only trim stick axes
-            x_axis.trim_smooth()
-            y_axis.trim_smooth()
+            stick_axes.trim_smooth()
 
 
 # handle HAT switch trimming ---------------------------------------------------
@@ -2,7 +2,7 @@ import gremlin
 from gremlin.user_plugin import *
 
 from jge.utils import utils
-from jge.utils.lut import LookupTable
+from jge.utils.lut import Interpolation, LookupTable
 from jge.axes.lut_axis import LutAxis
 from jge.utils.smoothing import ExponentialSmoothing, PassthroughSmoothing
 
@@ -52,6 +52,13 @@ centered_fov = IntegerVariable(
     is_optional=False,
 )
 
+use_smooth_curve = BoolVariable(
+    "Smooth Curve",
+    "Whether to use a smooth curve through the centered FoV, instead of two straight lines meeting at center.",
+    initial_value=False,
+    is_optional=False,
+)
+
 use_smoothing = BoolVariable(
     "Smooth Axis",
     "Whether to smooth the axis or not.",
@@ -87,9 +94,16 @@ coef = smoothing_coef.value / 100.0
 pasthrough = passthrough_region.value / 100.0
 smoothing = PassthroughSmoothing(ExponentialSmoothing(coef), pasthrough)
 
+# a smooth curve through the centered FOV is opt in, since it changes the FOV
+# everywhere besides the ends and center
+interpolation = (
+    Interpolation.MonotoneCubic if use_smooth_curve.value else Interpolation.Linear
+)
 zoom_axis = LutAxis(
     vjoy_axis_num.value,
-    LookupTable.FromPoints([(-1, -1), (0, fov_val), (1, 1)]),
+    LookupTable.FromPoints(
+        [(-1, -1), (0, fov_val), (1, 1)], interpolation=interpolation
+    ),
 )
 axis_dectorator = controller_axis.create_decorator(mode.value)
 
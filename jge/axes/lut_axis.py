@@ -1,12 +1,19 @@
-from jge.gremlin_interface import VjoyAxis
+from array import array
+
+from jge.gremlin_interface import (
+    VjoyAxis,
+    HID_AXIS_RESOLUTION,
+    quantize_hid_axis,
+    dequantize_hid_axis,
+    quantize_vjoy_axis,
+)
 from jge.utils.lut import LookupTable
 
 
 class LutAxis:
     def __init__(self, axis_id: int, lut: LookupTable, device_id: int = 1) -> None:
         """
-        A simple axis that uses a lookup table to linearly interpolate output
-        values.
+        A simple axis that uses a lookup table to interpolate output values.
 
         Args:
             * axis_id (int): vjoy axis ID
@@ -30,7 +37,65 @@ class LutAxis:
         self._axis = VjoyAxis(axis_id, device_id)
         self._lut = lut
 
+        # lookups are faster on a uniform grid, so use one when it matches the
+        # LUT exactly. it clamps instead of extrapolating past the end keys,
+        # so the LUT also has to cover the whole [-1, 1] input range
+        if lut.keys[0] <= -1 and lut.keys[-1] >= 1:
+            uniform_lut = lut.to_uniform()
+            if uniform_lut.max_deviation < 1e-9:
+                self._lut = uniform_lut
+
+        # vjoy integer for each controller axis step, and the controller
+        # axis's resolution (see use_int_domain())
+        self._int_outputs = None
+        self._int_resolution = HID_AXIS_RESOLUTION
+
+    def use_int_domain(
+        self, enabled: bool = True, input_resolution: int = HID_AXIS_RESOLUTION
+    ) -> None:
+        """
+        switches set() to work entirely with ints. the input gets quantized to
+        the controller's HID step, which indexes a table holding the vjoy
+        integer for every step, and that gets written to vjoy as is. the vjoy
+        integers are exactly what the float path ends up with (for inputs JG
+        made from HID values), minus all the float math and clamping.
+
+        Args:
+            * enabled (bool, optional): Defaults to True.
+            * input_resolution (int, optional): number of steps the
+              controller axis has, e.g. 2**10 for a 10 bit axis. the table has
+              one entry per step. Defaults to HID_AXIS_RESOLUTION.
+        """
+
+        if not enabled:
+            self._int_outputs = None
+            return
+
+        self._int_resolution = input_resolution
+        self._int_outputs = array(
+            "i", [self._calc_int_output(i) for i in range(input_resolution + 1)]
+        )
+
+    def _calc_int_output(self, step: int) -> int:
+        """calcs the vjoy integer for a controller axis step"""
+        input = dequantize_hid_axis(step, self._int_resolution)
+        return quantize_vjoy_axis(self._lut.output(input))
+
+    def calc_output_many(self, inputs):
+        """
+        calculates outputs for a whole buffer of inputs at once (for offline
+        tools, replays, UIs, etc.) without setting the vjoy axis
+
+        returns a numpy array if numpy is installed, else an array("d")
+        """
+        return self._lut.output_many(inputs)
+
     def set(self, input: float) -> None:
         """calculates output and sets vjoy axis's value"""
+        if self._int_outputs is not None:
+            step = quantize_hid_axis(input, self._int_resolution)
+            self._axis.set_int_val(self._int_outputs[step])
+            return
+
         output = self._lut.output(input)
         self._axis.set_val(output)
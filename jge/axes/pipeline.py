@@ -0,0 +1,222 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional. it only speeds up evaluating lots of inputs at once
+    np = None
+
+from jge.utils import utils
+from jge.utils.lut import LookupTable, UniformTable
+from jge.utils.easing_functions import SmoothStart, SmoothStop, SmoothStep
+from jge.axes.tuned_axis import AxisTuning, TunedAxis
+from jge.gremlin_interface import VjoyAxis, VJOY_AXIS_RESOLUTION
+
+
+class Pure:
+    def __init__(self, fn) -> None:
+        """
+        marks a function as pure for a Pipeline: its output only depends on its
+        input (no smoothing, trim, timers, etc.), so it can be precomputed into
+        a table.
+
+        NOTE a pipeline treats any callable it doesn't recognize as stateful,
+        so wrap your own pure lambdas in this to get them fused
+
+        Args:
+            * fn (function/functor): takes a float and returns a float
+        """
+        self._fn = fn
+
+    def __call__(self, x: float) -> float:
+        return self._fn(x)
+
+    @staticmethod
+    def Clamp(min_val: float = -1.0, max_val: float = 1.0):
+        return Pure(lambda x: utils.clamp(x, min_val, max_val))
+
+    @staticmethod
+    def Invert():
+        return Pure(lambda x: -x)
+
+    @staticmethod
+    def Normalize(min_val: float = -1.0, max_val: float = 1.0):
+        """maps [min_val, max_val] to [0, 1], like a slider's input"""
+        return Pure(lambda x: utils.normalize(x, min_val, max_val))
+
+    @staticmethod
+    def Denormalize(min_val: float = -1.0, max_val: float = 1.0):
+        """maps [0, 1] to [min_val, max_val], like a slider's output"""
+        return Pure(lambda x: utils.denormalize(x, min_val, max_val))
+
+
+def _get_pure_fn(stage):
+    """returns stage as a pure function, or None if it isn't known to be pure"""
+
+    if isinstance(stage, (Pure, AxisTuning, SmoothStart, SmoothStop, SmoothStep)):
+        return stage
+    if isinstance(stage, TunedAxis):
+        return stage.calc_output
+    if isinstance(stage, (LookupTable, UniformTable)):
+        return stage.output
+    return None
+
+
+def _compose(fns):
+    def composed(x: float) -> float:
+        for fn in fns:
+            x = fn(x)
+        return x
+
+    return composed
+
+
+class Pipeline:
+    def __init__(self, stages, resolution: int = VJOY_AXIS_RESOLUTION) -> None:
+        """
+        runs input through an ordered list of stages, after fusing every run of
+        consecutive pure stages into a single precomputed table. so no matter
+        how many pure stages you chain, each run of them only costs one table
+        lookup per event.
+
+        pure stages are: AxisTuning, TunedAxis, LookupTable, UniformTable, the
+        easing functors (SmoothStart, SmoothStop, SmoothStep), and anything
+        wrapped in Pure (including Pure.Clamp(), Pure.Invert(), etc.).
+
+        any other callable (smoothing, trim, etc.) is stateful, and gets called
+        live on every event, in between the fused tables.
+
+        Args:
+            * stages (List): stages to run input through, in order. each one
+              takes a float and returns a float (or is a LookupTable, etc.)
+            * resolution (int, optional): number of segments in each fused
+              table. Defaults to VJOY_AXIS_RESOLUTION, so each segment is a
+              single vjoy step.
+
+        NOTE each fused table spans inputs [-1, 1] and clamps anything outside
+        of that, so stages feeding a fused run should output [-1, 1]
+
+        NOTE tables are computed when the pipeline is made, so call rebuild()
+        if you change any pure stage (like an AxisTuning's curvature) after
+        """
+
+        self._stages = list(stages)
+        self._resolution = resolution
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """fuses the stages again, so changes to pure stages get picked up"""
+
+        # steps that run on every event (fused tables and stateful stages), and
+        # just the callables for the hot path
+        self._steps = []
+        self._step_fns = []
+        self._tables = []
+
+        run = []
+        for stage in self._stages + [None]:
+            fn = None if stage is None else _get_pure_fn(stage)
+            if fn is not None:
+                run.append(fn)
+                continue
+
+            # a stateful stage (or the end) finishes the current run
+            if run:
+                fused_fn = _compose(run)
+                table = UniformTable.FromFunction(fused_fn, -1.0, 1.0, self._resolution)
+                self._tables.append((table, fused_fn))
+                self._steps.append(table)
+                self._step_fns.append(table.output)
+                run = []
+            if stage is not None:
+                self._steps.append(stage)
+                self._step_fns.append(stage)
+
+    def get_max_error(self) -> float:
+        """
+        returns the max error any fused table has vs its stages' math. NOTE
+        this is slow, since it has to run all the math again
+        """
+        return max((table.max_error(fn) for table, fn in self._tables), default=0.0)
+
+    def __call__(self, input: float) -> float:
+        return self.output(input)
+
+    def output(self, input: float) -> float:
+        """runs input through all the steps"""
+        for fn in self._step_fns:
+            input = fn(input)
+        return input
+
+    def output_many(self, inputs):
+        """
+        same as output(), but for a whole buffer of inputs at once. NOTE
+        stateful steps get called once per input, in order, just like if the
+        inputs were separate events.
+
+        returns a numpy array if numpy is installed, else an array("d")
+        """
+
+        if np is None:
+            return array("d", [self.output(x) for x in inputs])
+
+        outputs = np.asarray(inputs, dtype=np.float64)
+        for step in self._steps:
+            if isinstance(step, UniformTable):
+                outputs = step.output_many(outputs)
+            else:
+                outputs = np.array([step(x) for x in outputs.tolist()])
+        return outputs
+
+
+class PipelineAxis:
+    def __init__(self, axis_id: int, pipeline: Pipeline, device_id: int = 1) -> None:
+        """
+        an axis that runs input through a Pipeline and sets a vjoy axis
+
+        Args:
+            * axis_id (int): vjoy axis ID
+            * pipeline (Pipeline): pipeline to run input through
+            * device_id (int, optional): vjoy device ID. Defaults to 1.
+        """
+
+        self._axis = VjoyAxis(axis_id, device_id)
+        self._pipeline = pipeline
+
+    def set(self, input: float) -> None:
+        """calculates output and sets vjoy axis's value"""
+        self._axis.set_val(self._pipeline.output(input))
+
+
+if __name__ == "__main__":
+    from jge.utils.smoothing import ExponentialSmoothing
+
+    tuning = AxisTuning(0.4, False, (0.05, 0), (1, 1))
+    lut = LookupTable.FromPoints([(0.2, 0.1), (1, 1)], make_symmetrical=True)
+    stages = [tuning, lut, Pure.Invert(), Pure.Clamp(-0.9, 0.9)]
+
+    # all pure stages fuse into a single table
+    pipeline = Pipeline(stages)
+    assert len(pipeline._steps) == 1
+    assert pipeline.get_max_error() < 1e-3
+    for i in range(-100, 101):
+        x = i / 100
+        expected = utils.clamp(-lut.output(tuning(x)), -0.9, 0.9)
+        assert abs(pipeline(x) - expected) < 1e-3
+
+    # stateful stages split the runs and stay live
+    smoothing = ExponentialSmoothing(0.5)
+    pipeline = Pipeline([tuning, smoothing, lut, Pure.Invert()])
+    assert len(pipeline._steps) == 3 and pipeline._steps[1] is smoothing
+    check_smoothing = ExponentialSmoothing(0.5)
+    for x in [0.5, 0.5, -0.2, 1.0]:
+        expected = -lut.output(check_smoothing(tuning(x)))
+        assert abs(pipeline(x) - expected) < 1e-3
+
+    from jge.utils.profiling import time_per_call
+
+    unfused = _compose([tuning, lut.output, Pure.Invert(), Pure.Clamp(-0.9, 0.9)])
+    pipeline = Pipeline(stages)
+    print("per event cost:")
+    print(f"  stage by stage: {time_per_call(unfused, 0.3) * 1e9:.0f} ns")
+    print(f"  fused pipeline: {time_per_call(pipeline.output, 0.3) * 1e9:.0f} ns")
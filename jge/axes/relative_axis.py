@@ -1,26 +1,18 @@
-import threading
-import time
-
 from jge.utils.easing_functions import EasingGenerator
+from jge.utils.scheduler import get_scheduler
 from jge.gremlin_interface import VjoyAxis
 
 
 class RelativeAxis:
-    # TODO async threads get a little weird if you use this with a hat switch,
-    # because you can do a circle on the hat and potentially start a second
-    # competing thread that'll be incrementing the axis in the other direction.
-    # (because you never released the hat - never went back to the hat's central
-    # position)
-    #
-    # actually you can easily do it with two buttons as well. holding button 1
-    # to inc the axis and then holding button 2 to dec the axis results in two
-    # competing threads and releasing either of the buttons stops it all.
+    # NOTE a new press replaces whatever motion was already going, so doing a
+    # circle on a hat (without going back to the hat's central position) or
+    # holding two buttons at once never results in competing motions. the most
+    # recent press wins.
     #
-    # i'm just going to leave it for now. i'm not sure of a simple way to fix
-    # that behavior. it's tempting to keep a list of presses and delete an entry
-    # on release and only stop once the list is empty, but that won't work with
-    # hats which can have a different number of presses/releases if you do
-    # circles.
+    # TODO releasing either of two held buttons still stops it all. it's
+    # tempting to keep a list of presses and delete an entry on release and
+    # only stop once the list is empty, but that won't work with hats which can
+    # have a different number of presses/releases if you do circles.
 
     def __init__(
         self, axis_id: int, easing_generator: EasingGenerator, device_id: int = 1
@@ -42,8 +34,8 @@ class RelativeAxis:
 
         self._axis = VjoyAxis(axis_id, device_id)
         self._easing_generator = easing_generator.copy()
-        # keeps track of if button is pressed or not (for the async timer)
-        self._is_pressed = False
+        # scheduler task that moves the axis while the button is pressed
+        self._task = None
 
     def press(self, direction: int):
         """
@@ -53,25 +45,23 @@ class RelativeAxis:
         :return:
         """
 
-        self._is_pressed = True
-        threading.Thread(target=self.__run_async, args=[direction]).start()
+        self.release()
+        self._easing_generator.reset()
+        self._task = get_scheduler().call_every(
+            self._easing_generator.get_sleep_time(), self.__step, direction, delay_s=0
+        )
 
     def release(self):
         """stops the relative axis's motion"""
 
-        self._is_pressed = False
+        if self._task:
+            self._task.cancel()
 
-    def __run_async(self, direction: int):
-        # NOTE this should only ever be called on a separate thread because it
-        # uses sleep, which will block the rest of the JG python code from
-        # running
+    def __step(self, direction: int):
+        # smoothly moves the axis while the button is pressed. this gets called
+        # periodically by the scheduler until released
 
-        # smoothly moves the axis while the button is pressed
-
-        self._easing_generator.reset()
-        while self._is_pressed:
-            output = self._easing_generator.get_output()
+        output = self._easing_generator.get_output()
 
-            # direction will either be +-1
-            self._axis.inc_val(direction * output)
-            time.sleep(self._easing_generator.get_sleep_time())
+        # direction will either be +-1
+        self._axis.inc_val(direction * output)
@@ -0,0 +1,371 @@
+"""
+builds an axis's current configuration into a python function made just for it,
+with every setting inlined as a constant and every branch that can't happen for
+that configuration left out. the function gets compiled once with compile(),
+and then it can be used directly as a JG axis callback.
+
+if the configuration changes later (e.g. a tuning's curvature), the function
+notices and falls back to the axis's normal (generic) path. specialize the axis
+again to get the fast path back.
+"""
+
+import math
+
+from jge.axes.tuned_axis import AxisTuning, TunedAxis
+from jge.axes.trimmed_axis import Scaling, TrimmedAxis
+
+
+class _CodeBuilder:
+    def __init__(self) -> None:
+        self.lines = []
+        self.namespace = {"copysign": math.copysign}
+        self._indent = 0
+
+    def add(self, line: str) -> None:
+        self.lines.append("    " * self._indent + line)
+
+    def indent(self) -> None:
+        self._indent += 1
+
+    def dedent(self) -> None:
+        self._indent -= 1
+
+    def add_global(self, name: str, val) -> str:
+        self.namespace[name] = val
+        return name
+
+    def build(self, fn_name: str, filename: str):
+        source = "\n".join(self.lines) + "\n"
+        code = compile(source, filename, "exec")
+        exec(code, self.namespace)
+        fn = self.namespace[fn_name]
+        # keep the source around, it's really handy when debugging
+        fn.source = source
+        return fn
+
+
+def _add_transform(code: _CodeBuilder, tuning: AxisTuning, name: str, x: str, y: str):
+    """adds code that does tuning._transform_input(x) and stores it in y"""
+
+    if tuning.is_compiled():
+        # same math as UniformTable.output()
+        table = tuning._table
+        starts = code.add_global(f"{name}_starts", table._starts)
+        deltas = code.add_global(f"{name}_deltas", table._deltas)
+        code.add(f"pos = ({x} - {table.x_min!r}) * {table._scale!r}")
+        code.add("if pos <= 0:")
+        code.add(f"    {y} = {table.vals[0]!r}")
+        code.add(f"elif pos >= {table._max_idx}:")
+        code.add(f"    {y} = {table.vals[table._max_idx]!r}")
+        code.add("else:")
+        code.add("    i = int(pos)")
+        code.add("    if i == pos:")
+        code.add("        i -= 1")
+        code.add(f"    {y} = {starts}[i] + {deltas}[i] * (pos - i)")
+        return
+
+    # same math as AxisTuning._calc_transform(), with lerps, normalizing and
+    # the sigmoid written out using the tuning's values
+    dz = tuning._deadzone_pt
+    sat = tuning._saturation_pt
+    curvature = tuning._curvature
+
+    code.add(f"abs_x = abs({x})")
+    branch = "if"
+    if dz.x > 0:
+        code.add(f"if abs_x < {dz.x!r}:")
+        code.add(f"    {y} = {dz.y!r} * (abs_x / {dz.x!r})")
+        branch = "elif"
+    code.add(f"{branch} abs_x < {sat.x!r}:")
+    code.add(f"    norm_x = (abs_x - {dz.x!r}) / {sat.x - dz.x!r}")
+    code.add(
+        f"    norm_y = (norm_x - {curvature!r} * norm_x) / "
+        f"({curvature!r} - {2 * curvature!r} * norm_x + 1)"
+    )
+    code.add(f"    {y} = {dz.y!r} * (1 - norm_y) + {sat.y!r} * norm_y")
+    code.add("else:")
+    code.add(f"    {y} = {sat.y!r}")
+    code.add(f"{y} = copysign({y}, {x})")
+    if tuning._invert:
+        code.add(f"{y} = -{y}")
+
+
+def _add_tuned_output(code: _CodeBuilder, tuned_axis: TunedAxis, x: str, y: str):
+    """adds code that does tuned_axis.calc_output(x) and stores it in y"""
+
+    right = tuned_axis._right_tuning
+    left = tuned_axis._left_tuning
+
+    if tuned_axis._is_slider:
+        # same math as TunedAxis._calc_slider_output()
+        code.add(f"slider_x = ({x} - -1) / 2")
+        _add_transform(code, right, "right", "slider_x", y)
+        if right.inverted_coef == -1:
+            code.add(f"{y} += 1")
+        code.add(f"{y} = -1 * (1 - {y}) + 1 * {y}")
+
+    elif left is right and not right.is_compiled():
+        # the math is the same on both sides, so don't branch
+        _add_transform(code, right, "right", x, y)
+
+    else:
+        code.add(f"if {x} < 0:")
+        code.indent()
+        _add_transform(code, left, "left", x, y)
+        code.dedent()
+        code.add("else:")
+        code.indent()
+        _add_transform(code, right, "right", x, y)
+        code.dedent()
+
+
+def _add_config_check(code: _CodeBuilder, tuned_axis: TunedAxis) -> str:
+    """
+    returns an expression that's True if the tuned axis's config changed, or if
+    its output went somewhere else than the vjoy axis set_val() was taken from
+    (e.g. limit_output_rate() wrapped it) or went int (use_int_domain())
+    """
+
+    right = code.add_global("right_tuning", tuned_axis._right_tuning)
+    left = code.add_global("left_tuning", tuned_axis._left_tuning)
+    tuned = code.add_global("tuned_axis", tuned_axis)
+    vjoy_axis = code.add_global("vjoy_axis", tuned_axis._axis)
+    return (
+        f"{right}._version != {tuned_axis._right_tuning._version} or "
+        f"{left}._version != {tuned_axis._left_tuning._version} or "
+        f"{tuned}._axis is not {vjoy_axis} or "
+        f"{tuned}._int_outputs is not None"
+    )
+
+
+def specialize_tuned_axis(tuned_axis: TunedAxis, from_event: bool = True):
+    """
+    returns a function that does the same thing as tuned_axis.set(), made just
+    for the tuned axis's current configuration
+
+    Args:
+        * tuned_axis (TunedAxis): axis to specialize
+        * from_event (bool, optional): if True, the function takes a JG event
+          (so you can use it as the axis callback) instead of the input value.
+          Defaults to True.
+
+    NOTE changing is_slider, or swapping out tunings after specializing isn't
+    supported. changing values on the tunings is fine, and so is limiting the
+    output rate or using the int domain, those just take the generic path
+    """
+
+    code = _CodeBuilder()
+    code.add_global("generic_set", tuned_axis.set)
+    code.add_global("set_val", tuned_axis._axis.set_val)
+    config_changed = _add_config_check(code, tuned_axis)
+
+    # NOTE JG looks at callback parameter names, so the event has to be called
+    # event
+    code.add("def specialized(event):" if from_event else "def specialized(x):")
+    code.indent()
+    if from_event:
+        code.add("x = event.value")
+    code.add(f"if {config_changed}:")
+    code.add("    return generic_set(x)")
+    _add_tuned_output(code, tuned_axis, "x", "y")
+    code.add("set_val(y)")
+
+    return code.build("specialized", "<specialized TunedAxis>")
+
+
+def specialize_trimmed_axis(
+    trimmed_axis: TrimmedAxis, scaling_type: Scaling, from_event: bool = True
+):
+    """
+    returns a function that does the same thing as
+    trimmed_axis.set_vjoy(input, scaling_type), made just for the trimmed
+    axis's current configuration and the scaling type
+
+    Args:
+        * trimmed_axis (TrimmedAxis): axis to specialize
+        * scaling_type (Scaling): scaling type we want done
+        * from_event (bool, optional): if True, the function takes a JG event
+          (so you can use it as the axis callback) instead of the input value.
+          Defaults to True.
+
+    NOTE trim is still read live, so all the trimming modes work like normal.
+    while output is blocked by trimming, rate limited or in the int domain, the
+    generic path handles it.
+
+    NOTE like TunedAxis, changing the tunings' values is fine, but the trimmed
+    axis's own settings (clamp_output and the dynamic scaling degree/delay)
+    get built in, so specialize again if you change them
+    """
+
+    tuned_axis = trimmed_axis._tuned_axis
+    if trimmed_axis._tuning_version != tuned_axis._right_tuning._version:
+        trimmed_axis._recalc_scaling()
+
+    code = _CodeBuilder()
+    code.add_global("axis", trimmed_axis)
+    code.add_global("scaling_type", scaling_type)
+    code.add_global("lock", trimmed_axis._lock)
+    code.add_global("generic_set_vjoy", trimmed_axis._set_vjoy)
+    code.add_global("set_val", tuned_axis._axis.set_val)
+    config_changed = _add_config_check(code, tuned_axis)
+
+    # NOTE JG looks at callback parameter names, so the event has to be called
+    # event
+    code.add("def specialized(event):" if from_event else "def specialized(x):")
+    code.indent()
+    if from_event:
+        code.add("x = event.value")
+    # same as TrimmedAxis.set_vjoy()
+    code.add("lock.acquire()")
+    code.add("try:")
+    code.indent()
+    code.add(
+        f"if {config_changed} or axis._output_blocked or "
+        "axis._int_table is not None:"
+    )
+    code.add("    return generic_set_vjoy(x, scaling_type)")
+    code.add("axis._prev_raw_input = x")
+    code.add("axis._prev_scaling = scaling_type")
+
+    # same as TrimmedAxis.calc_output()
+    _add_tuned_output(code, tuned_axis, "x", "y")
+
+    if scaling_type == Scaling.Static:
+        code.add("y *= axis._max_scaling_coef")
+    elif scaling_type == Scaling.Dynamic:
+        # same as TrimmedAxis._calc_dynamic_scaling_coef()
+        delay = trimmed_axis._dyn_scaling_delay
+        code.add("abs_x = abs(x)")
+        code.add(f"if abs_x >= {delay!r}:")
+        code.add(
+            f"    blend = ((abs_x - {delay!r}) * {trimmed_axis._blend_scale!r}) "
+            f"** {trimmed_axis._dyn_scaling_degree!r}"
+        )
+        code.add("    if blend > 1:")
+        code.add("        blend = 1")
+        code.add("    y *= 1 + axis._scaling_coef_range * blend")
+
+    code.add("y += axis._trim_offset")
+
+    if trimmed_axis._clamp_output:
+        y_sat = tuned_axis._right_tuning.saturation_pt.y
+        code.add(f"if y > {y_sat!r}:")
+        code.add(f"    y = {y_sat!r}")
+        code.add(f"elif y < {-y_sat!r}:")
+        code.add(f"    y = {-y_sat!r}")
+
+    code.add("set_val(y)")
+    code.dedent()
+    code.add("finally:")
+    code.add("    lock.release()")
+
+    return code.build("specialized", "<specialized TrimmedAxis>")
+
+
+if __name__ == "__main__":
+    from jge.utils.profiling import get_counter_alloc, max_sweep_alloc, time_per_call
+
+    xs = [i / 500 for i in range(-500, 501)]
+
+    def check(fn, expected_fn, get_output):
+        for x in xs:
+            fn(x)
+            output = get_output()
+            expected_fn(x)
+            assert output == get_output(), (x, output, get_output())
+
+    tuned_axes = [
+        TunedAxis(1, AxisTuning(0.3, False, (0.05, 0.1), (0.9, 0.95))),
+        TunedAxis(2, AxisTuning(-0.5, True), AxisTuning(0.2, False, (0.1, 0))),
+        TunedAxis(3, AxisTuning(0.4, True, (0.1, 0), (0.8, 1)), is_slider=True),
+    ]
+    for tuned_axis in tuned_axes:
+        for compiled in [False, True]:
+            if compiled:
+                tuned_axis.compile()
+            fn = specialize_tuned_axis(tuned_axis, from_event=False)
+            check(fn, tuned_axis.set, tuned_axis._axis.get_val)
+
+    # config changes fall back to the generic path
+    tuning = AxisTuning(0.3)
+    tuned_axis = TunedAxis(4, tuning)
+    fn = specialize_tuned_axis(tuned_axis, from_event=False)
+    tuning.curvature = -0.3
+    check(fn, tuned_axis.set, tuned_axis._axis.get_val)
+
+    tuning = AxisTuning(0.3, False, (0.05, 0), (0.95, 1))
+    clamped_axis = TrimmedAxis(TunedAxis(5, tuning), clamp_output=True)
+    clamped_axis.set_trim(0.3)
+    for scaling in Scaling:
+        fn = specialize_trimmed_axis(clamped_axis, scaling, from_event=False)
+        check(
+            fn,
+            lambda x: clamped_axis.set_vjoy(x, scaling),
+            clamped_axis._tuned_axis._axis.get_val,
+        )
+        assert max_sweep_alloc(fn, xs) <= get_counter_alloc(2)
+
+    tuning.saturation_pt = (0.8, 1)
+    check(
+        fn,
+        lambda x: clamped_axis.set_vjoy(x, scaling),
+        clamped_axis._tuned_axis._axis.get_val,
+    )
+
+    # limiting the output rate or going int after specializing takes the
+    # generic path, so both still apply
+    from jge.utils import clock
+
+    rate_axis = TunedAxis(8, AxisTuning(0.3))
+    rate_trimmed = TrimmedAxis(TunedAxis(9, AxisTuning(0.3)))
+    rate_fns = [
+        (rate_axis, specialize_tuned_axis(rate_axis, from_event=False)),
+        (
+            rate_trimmed._tuned_axis,
+            specialize_trimmed_axis(rate_trimmed, Scaling.Static, from_event=False),
+        ),
+    ]
+    ramp = [i / 300 for i in range(300)]
+    for axis, fn in rate_fns:
+        with clock.use_clock(clock.SimulatedClock()) as sim:
+            axis.limit_output_rate(100)
+            for x in ramp:
+                fn(x)
+                sim.advance(0.001)
+            sim.advance(0.1)
+            # 300 inputs over 0.3s at 100 Hz
+            assert 0 < axis._axis.num_writes <= 0.3 * 100 + 1, axis._axis.num_writes
+            assert axis._axis.get_val() == axis.calc_output(ramp[-1])
+            axis.limit_output_rate(None)
+
+    int_axis = TunedAxis(10, AxisTuning(0.3, False, (0.05, 0), (0.95, 1)))
+    int_trimmed = TrimmedAxis(TunedAxis(11, AxisTuning(0.3)))
+    int_trimmed.set_trim(0.2)
+    fn = specialize_tuned_axis(int_axis, from_event=False)
+    trimmed_fn = specialize_trimmed_axis(int_trimmed, Scaling.Static, from_event=False)
+    int_axis.use_int_domain()
+    int_trimmed.use_int_domain()
+    check(fn, int_axis.set, int_axis._axis.get_val)
+    check(
+        trimmed_fn,
+        lambda x: int_trimmed.set_vjoy(x, Scaling.Static),
+        int_trimmed._tuned_axis._axis.get_val,
+    )
+
+    # benchmark
+    tuned_axis = TunedAxis(6, AxisTuning(0.3, False, (0.05, 0), (0.95, 1)))
+    tuned_axis.compile()
+    trimmed_axis = TrimmedAxis(TunedAxis(7, AxisTuning(0.3)))
+    bench_xs = [-0.9, -0.6, -0.3, -0.1, 0.1, 0.3, 0.6, 0.9]
+
+    def bench(fn, *args):
+        costs = [time_per_call(fn, x, *args) for x in bench_xs]
+        return sum(costs) / len(costs) * 1e9
+
+    print("per event cost (generic vs specialized):")
+    fn = specialize_tuned_axis(tuned_axis, from_event=False)
+    print(f"  TunedAxis: {bench(tuned_axis.set):.0f} ns vs {bench(fn):.0f} ns")
+    for scaling in Scaling:
+        fn = specialize_trimmed_axis(trimmed_axis, scaling, from_event=False)
+        generic = bench(trimmed_axis.set_vjoy, scaling)
+        print(f"  TrimmedAxis {scaling}: {generic:.0f} ns vs {bench(fn):.0f} ns")
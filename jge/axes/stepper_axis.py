@@ -175,3 +175,12 @@ class StepperAxis:
 if __name__ == "__main__":
     print(StepperVals.FromSpecificVals([2400, 2700, 3000], (1000, 3000)))
     print(StepperVals.FromRange(31, (0, 1000), curvature=0.5))
+
+    # next_value() picks up from wherever the vjoy axis got moved to
+    stepper_axis = StepperAxis(1, StepperVals.FromRange(5, (-1.0, 1.0)))
+    stepper_axis._axis.set_val(0.1)
+    stepper_axis.next_value()
+    assert stepper_axis._axis.get_val() == 0.5
+    stepper_axis.prev_value()
+    stepper_axis.prev_value()
+    assert stepper_axis._axis.get_val() == -0.5
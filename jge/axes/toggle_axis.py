@@ -55,3 +55,17 @@ class ToggleAxis:
             # we need to toggle, so store current axis val, and go to toggle val
             self._old_val = self._axis.get_val()
             self._axis.set_val(val)
+
+
+if __name__ == "__main__":
+    toggle_axis = ToggleAxis(1, initial_val=0.5, axis_range=(0.0, 1.0))
+    toggle_axis.step_axis(0.25)
+    assert toggle_axis._axis.get_val() == 0.75
+    toggle_axis.step_axis(0.5)
+    assert toggle_axis._axis.get_val() == 1.0
+
+    # toggling to a value and back restores the old one
+    toggle_axis.toggle_to(0.0)
+    assert toggle_axis._axis.get_val() == 0.0
+    toggle_axis.toggle_to(0.0)
+    assert toggle_axis._axis.get_val() == 1.0
@@ -1,10 +1,25 @@
 import threading
-import time
+from array import array
 from enum import Enum
 
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional. it only speeds up evaluating lots of inputs at once
+    np = None
+
 from jge.utils import utils
+from jge.utils.lut import IntTable
 from jge.axes.tuned_axis import TunedAxis, AxisTuning
+from jge.gremlin_interface import (
+    HID_AXIS_RESOLUTION,
+    quantize_hid_axis,
+    dequantize_hid_axis,
+    quantize_vjoy_axis,
+    vjoy_frame,
+)
 from jge.utils.easing_functions import EasingGenerator
+from jge.utils.scheduler import get_scheduler
 
 
 class Scaling(Enum):
@@ -15,6 +30,13 @@ class Scaling(Enum):
     Dynamic = 3  # dynamic scaling coef. changes with controller pos
 
 
+# NOTE looking up an enum member (like Scaling.Nil) allocates a little every time
+# (at least in python 3.11), so keep references to them for the hot path
+_SCALING_NIL = Scaling.Nil
+_SCALING_STATIC = Scaling.Static
+_SCALING_DYNAMIC = Scaling.Dynamic
+
+
 class TrimmedAxis:
     def __init__(
         self,
@@ -84,13 +106,74 @@ class TrimmedAxis:
 
         self._trim_offset = 0
         self._max_scaling_coef = 0
+        self._scaling_coef_range = 0
+        self._recalc_scaling()
+
+        # serializes the event thread's and the trim animation's access to the
+        # trim and vjoy axis
+        self._lock = threading.RLock()
         self.set_trim(0)
 
         # vals for internal bookkeeping
         self._prev_raw_input = 0
         self._prev_scaling = Scaling.Dynamic
         self._output_blocked = False
-        self._is_hat_pressed = False
+        # margin the raw input has to get inside of to unblock output for
+        # central trimming. None when central trimming isn't waiting
+        self._center_margin = None
+        # bundle (and our index in it) that's waiting on us to be centered
+        self._central_bundle = None
+        self._central_bundle_idx = 0
+        # the one trim animation (smooth trim or trim hat) in flight, and an id
+        # that changes every time it gets replaced
+        self._trim_task = None
+        self._trim_hat_task = None
+        self._trim_anim_id = 0
+
+        # int domain table, and the trim, scaling and tuning version it's for
+        # (see use_int_domain())
+        self._int_table = None
+        self._int_resolution = HID_AXIS_RESOLUTION
+        self._int_trim = 0
+        self._int_scaling = Scaling.Dynamic
+        self._int_version = 0
+
+    def use_int_domain(
+        self, enabled: bool = True, input_resolution: int = HID_AXIS_RESOLUTION
+    ) -> None:
+        """
+        switches set_vjoy() to work with ints. the input gets quantized to the
+        controller's HID step, which indexes a table holding the vjoy integer
+        for every step, and that gets written to vjoy as is. the vjoy integers
+        are exactly what the float path ends up with (for inputs JG made from
+        HID values).
+
+        NOTE since output depends on trim, the table is filled in as inputs
+        come in, and goes stale whenever the trim, scaling type or tuning
+        changes (which is cheap, nothing gets cleared). so while trim is
+        animating, events cost about the same as the float path.
+
+        Args:
+            * enabled (bool, optional): Defaults to True.
+            * input_resolution (int, optional): number of steps the
+              controller axis has, e.g. 2**10 for a 10 bit axis. the table has
+              one entry per step. Defaults to HID_AXIS_RESOLUTION.
+        """
+
+        with self._lock:
+            if not enabled:
+                self._int_table = None
+                return
+
+            self._int_resolution = input_resolution
+            self._int_table = IntTable(self._calc_int_output, input_resolution + 1)
+            self._int_version = self._tuned_axis._right_tuning._version
+
+    def _calc_int_output(self, step: int) -> int:
+        """calcs the vjoy integer for a controller axis step"""
+        input = dequantize_hid_axis(step, self._int_resolution)
+        output = self.calc_output(input, self._int_scaling)
+        return quantize_vjoy_axis(output)
 
     def set_trim(self, trim: float = None) -> None:
         """
@@ -101,14 +184,15 @@ class TrimmedAxis:
             vjoy axis's current value. Defaults to None.
         """
 
-        if trim is None:
-            # use the vjoy axis's current value
-            self._trim_offset = self._tuned_axis._axis.get_val()
-        else:
-            self._trim_offset = trim
+        with self._lock:
+            if trim is None:
+                # use the vjoy axis's current value
+                self._trim_offset = self._tuned_axis._axis.get_val()
+            else:
+                self._trim_offset = trim
 
-        self._trim_offset = utils.clamp(self._trim_offset, -1, 1)
-        self._recalc_max_scaling_coef()
+            self._trim_offset = utils.clamp(self._trim_offset, -1, 1)
+            self._recalc_max_scaling_coef()
 
     def _recalc_max_scaling_coef(self):
         """recalcs max scaling coef. call this after setting trim"""
@@ -124,9 +208,30 @@ class TrimmedAxis:
         # scaling coef is the ratio of this distance to the distance with 0 trim
         self._max_scaling_coef = max_dist / y_sat
 
+        # dynamic scaling blends from a coef of 1 up to the max coef, so this is
+        # the only part of dynamic scaling that depends on trim
+        self._scaling_coef_range = self._max_scaling_coef - 1
+
         # NOTE if the scaling is correct, the far saturation point should not
         # move as we trim!
 
+    def _recalc_scaling(self):
+        """
+        recalcs everything scaling needs from the tuning. this happens
+        automatically if the tuning changes
+        """
+
+        tuning = self._tuned_axis._right_tuning
+        self._tuning_version = tuning._version
+
+        # the dynamic scaling blend only depends on the delay, degree and
+        # saturation.x, so precompute what we can here instead of normalizing
+        # on every event. see _calc_dynamic_scaling_coef() for more details
+        blend_range = tuning.saturation_pt.x - self._dyn_scaling_delay
+        self._blend_scale = 1 / blend_range if blend_range > 0 else 0.0
+
+        self._recalc_max_scaling_coef()
+
     def _calc_dynamic_scaling_coef(self, raw_input: float) -> float:
         """
         calculate dynamic scaling coef based on input
@@ -147,8 +252,8 @@ class TrimmedAxis:
 
         # else calc a "dynamic" scaling coef.
 
-        # it's easiest to deal with normalized inputs/outputs ranging from [0,
-        # 1] which can be denormalized later on.
+        # it's easiest to deal with a normalized blend factor ranging from [0,
+        # 1], where 0 is no scaling and 1 is max scaling.
 
         # the normalized range over which scaling occurs
         # 1. would normally be [0, 1]
@@ -161,41 +266,64 @@ class TrimmedAxis:
         # TODO this is still not quite right. the problem is idk exactly what i
         # want the desired behavior to be.
 
-        # norm_input = utils.normalize(raw_input, self._dyn_scaling_delay, 1)
-        norm_input = utils.normalize(
-            raw_input,
-            self._dyn_scaling_delay,
-            self._tuned_axis._right_tuning.saturation_pt.x,
-        )
-        # NOTE norm_input will now be [0, 1]
-
-        # apply power (norm_input is still [0, 1])
-        norm_input = norm_input**self._dyn_scaling_degree
+        # normalize input over [delay, saturation.x] and apply power. this is
+        # equivalent to utils.normalize() followed by **degree, but the scale
+        # was precomputed in _recalc_scaling()
+        norm_input = (raw_input - self._dyn_scaling_delay) * self._blend_scale
+        blend = norm_input**self._dyn_scaling_degree
         # TODO this could actually be replaced with any smoothing function. it's
         # currently equivalent to smooth start. i don't think it makes sense to
         # use anything else though. (if changed remember to update UI graphs!)
 
-        # use the normalized input to lerp the scaling coef
-        # 1. input of 0 -> scaling coef of 1 (no scaling)
-        # 2. input of 1 -> max scaling coef
-        dyn_scaling_coef = utils.lerp(0, 1, 1, self._max_scaling_coef, norm_input)
-
         # NOTE if you adjust normalized range above by saturation.x (to get
-        # desired saturation point behavior), then coef can go over max, so
+        # desired saturation point behavior), then the blend can go over 1, so
         # clamp it
-        dyn_scaling_coef = utils.clamp(dyn_scaling_coef, 1, self._max_scaling_coef)
+        if blend > 1:
+            blend = 1
 
-        return dyn_scaling_coef
+        # use the blend to go from a scaling coef of 1 (no scaling) to max
+        # scaling coef. trim only changes the range, so it's a single multiply
+        return 1 + self._scaling_coef_range * blend
 
     def _get_scaling_coef(self, raw_input: float, scaling_type: Scaling) -> float:
         """return scaling coefficient based on the scaling type"""
-        if scaling_type == Scaling.Nil:
+        if scaling_type is _SCALING_NIL:
             return 1
-        if scaling_type == Scaling.Static:
+        if scaling_type is _SCALING_STATIC:
             return self._max_scaling_coef
-        if scaling_type == Scaling.Dynamic:
+        if scaling_type is _SCALING_DYNAMIC:
             return self._calc_dynamic_scaling_coef(raw_input)
 
+    def _get_scaling_coef_many(self, raw_inputs, scaling_type: Scaling):
+        """
+        same as _get_scaling_coef(), but for a whole buffer of inputs.
+
+        returns a numpy array if numpy is installed, else an array("d")
+        """
+
+        if np is None:
+            return array(
+                "d", [self._get_scaling_coef(x, scaling_type) for x in raw_inputs]
+            )
+
+        abs_inputs = np.abs(np.asarray(raw_inputs, dtype=np.float64))
+
+        if scaling_type is _SCALING_NIL:
+            return np.ones_like(abs_inputs)
+        if scaling_type is _SCALING_STATIC:
+            return np.full_like(abs_inputs, self._max_scaling_coef)
+
+        # else do the same math as _calc_dynamic_scaling_coef() on the inputs
+        # that are past the scaling delay
+        coefs = np.ones_like(abs_inputs)
+        is_scaled = abs_inputs >= self._dyn_scaling_delay
+        norm_inputs = (abs_inputs[is_scaled] - self._dyn_scaling_delay) * (
+            self._blend_scale
+        )
+        blends = np.minimum(norm_inputs**self._dyn_scaling_degree, 1)
+        coefs[is_scaled] = 1 + self._scaling_coef_range * blends
+        return coefs
+
     def calc_output(self, raw_input: float, scaling_type: Scaling) -> float:
         """
         calculates output based on scaling type
@@ -208,6 +336,9 @@ class TrimmedAxis:
             float: output for vjoy
         """
 
+        if self._tuning_version != self._tuned_axis._right_tuning._version:
+            self._recalc_scaling()
+
         output = self._tuned_axis.calc_output(raw_input)
         scaling_coef = self._get_scaling_coef(raw_input, scaling_type)
         output *= scaling_coef
@@ -220,6 +351,30 @@ class TrimmedAxis:
 
         return output
 
+    def calc_output_many(self, raw_inputs, scaling_type: Scaling):
+        """
+        same as calc_output(), but for a whole buffer of inputs (a list, array,
+        numpy array, etc.) at once. useful for graphs and offline tools.
+
+        returns a numpy array if numpy is installed, else an array("d")
+        """
+
+        if np is None:
+            return array("d", [self.calc_output(x, scaling_type) for x in raw_inputs])
+
+        if self._tuning_version != self._tuned_axis._right_tuning._version:
+            self._recalc_scaling()
+
+        output = self._tuned_axis.calc_output_many(raw_inputs)
+        output *= self._get_scaling_coef_many(raw_inputs, scaling_type)
+        output += self._trim_offset
+
+        if self._clamp_output:
+            y_sat = self._tuned_axis._right_tuning.saturation_pt.y
+            np.clip(output, -y_sat, y_sat, out=output)
+
+        return output
+
     def set_vjoy(self, raw_input: float, scaling_type: Scaling):
         """
         calculates output based on scaling type and sets vjoy axis's value
@@ -229,12 +384,36 @@ class TrimmedAxis:
             * scaling_type (Scaling): scaling type we want done
         """
 
+        # NOTE `with self._lock:` allocates on every call, acquire/release don't
+        self._lock.acquire()
+        try:
+            self._set_vjoy(raw_input, scaling_type)
+        finally:
+            self._lock.release()
+
+    def _set_vjoy(self, raw_input: float, scaling_type: Scaling):
+        # NOTE hold self._lock while calling this
+
         # always update prev raw input so we know when the physical stick gets
         # centered (for central pos trim mode)
         self._prev_raw_input = raw_input
         self._prev_scaling = scaling_type
 
         if self._output_blocked:
+            # central trimming gets unblocked right here as soon as the raw
+            # input makes it back inside the center margin
+            if self._central_bundle is not None:
+                # the bundle unblocks (and sets) all its axes once they're all
+                # centered, so there's nothing left to do here
+                self._central_bundle._on_axis_input(self._central_bundle_idx, raw_input)
+                return
+            if self._center_margin is None or abs(raw_input) >= self._center_margin:
+                return
+            self._center_margin = None
+            self._output_blocked = False
+
+        if self._int_table is not None:
+            self._set_int(raw_input, scaling_type)
             return
 
         output = self.calc_output(raw_input, scaling_type)
@@ -242,11 +421,47 @@ class TrimmedAxis:
         # set the axis's value directly
         self._tuned_axis._axis.set_val(output)
 
+    def _set_int(self, raw_input: float, scaling_type: Scaling):
+        # NOTE hold self._lock while calling this
+        if (
+            self._trim_offset != self._int_trim
+            or scaling_type is not self._int_scaling
+            or self._tuned_axis._right_tuning._version != self._int_version
+        ):
+            self._int_trim = self._trim_offset
+            self._int_scaling = scaling_type
+            self._int_version = self._tuned_axis._right_tuning._version
+            self._int_table.reset()
+
+        step = quantize_hid_axis(raw_input, self._int_resolution)
+        self._tuned_axis._axis.set_int_val(self._int_table.output(step))
+
     def inc_trim(self, delta: float):
         """
         instantly increments trim by the specified amount
         """
-        self.set_trim(self._trim_offset + delta)
+        with self._lock:
+            self.set_trim(self._trim_offset + delta)
+
+    def _stop_trim_animation(self):
+        """
+        stops the trim animation in flight (if any), and leaves the central
+        trimmer bundle waiting on us (if any). NOTE hold self._lock while
+        calling this
+        """
+
+        if self._trim_task:
+            self._trim_task.cancel()
+            self._trim_task = None
+        # a step that's already waiting on the lock sees this and bails
+        self._trim_anim_id += 1
+
+        if self._central_bundle is not None:
+            # we still wait to be centered, just on our own from now on
+            bundle = self._central_bundle
+            self._central_bundle = None
+            self._center_margin = bundle._centers[self._central_bundle_idx]
+            bundle._on_axis_left(self._central_bundle_idx)
 
     def trim_timed(self, trim: float = None, time_s: float = 0.3):
         """
@@ -260,15 +475,18 @@ class TrimmedAxis:
               to 0.3.
         """
 
-        # set trim and start thread to sleep
-        self._output_blocked = True
-        self.set_trim(trim)
-        threading.Thread(target=self.__async_trim_timed, args=[time_s]).start()
+        # set trim and schedule unblocking output
+        with self._lock:
+            self._stop_trim_animation()
+            self._output_blocked = True
+            self._center_margin = None
+            self.set_trim(trim)
+        get_scheduler().call_later(time_s, self.__async_trim_timed)
 
-    def __async_trim_timed(self, time_s: float):
-        time.sleep(time_s)
-        self._output_blocked = False
-        self.set_vjoy(self._prev_raw_input, self._prev_scaling)
+    def __async_trim_timed(self):
+        with self._lock:
+            self._output_blocked = False
+            self._set_vjoy(self._prev_raw_input, self._prev_scaling)
 
     def trim_smooth(self, trim: float = None):
         """
@@ -282,25 +500,46 @@ class TrimmedAxis:
               using the vjoy axis's current value. Defaults to None.
         """
 
-        threading.Thread(target=self.__async_trim_smooth, args=[trim]).start()
-
-    def __async_trim_smooth(self, trim: float):
-        if trim is None:
-            trim = self._tuned_axis._axis.get_val()
-
-        starting_trim = self._trim_offset
-        trim_delta = trim - starting_trim
-        sign = 1 if trim_delta >= 0 else -1
-        trim_delta = abs(trim_delta)
-
-        self._smooth_trim_easing.reset()
-        self._smooth_trim_easing.set_magnitude(trim_delta)
-
-        for _ in range(self._smooth_trim_easing.get_num_steps()):
+        with self._lock:
+            if trim is None:
+                trim = self._tuned_axis._axis.get_val()
+
+            # latest request wins. it takes over from wherever the trim
+            # currently is, even if that's halfway through another animation
+            self._stop_trim_animation()
+
+            starting_trim = self._trim_offset
+            trim_delta = trim - starting_trim
+            sign = 1 if trim_delta >= 0 else -1
+            trim_delta = abs(trim_delta)
+
+            self._smooth_trim_easing.reset()
+            self._smooth_trim_easing.set_magnitude(trim_delta)
+
+            self._trim_task = get_scheduler().call_every(
+                self._smooth_trim_easing.get_sleep_time(),
+                self.__async_trim_smooth,
+                self._trim_anim_id,
+                starting_trim,
+                sign,
+                num_calls=self._smooth_trim_easing.get_num_steps(),
+                delay_s=0,
+            )
+
+    def __async_trim_smooth(self, anim_id: int, starting_trim: float, sign: int):
+        with self._lock:
+            if anim_id != self._trim_anim_id:
+                return
             output = sign * self._smooth_trim_easing.get_output()
             self.set_trim(starting_trim + output)
-            self.set_vjoy(self._prev_raw_input, self._prev_scaling)
-            time.sleep(self._smooth_trim_easing.get_sleep_time())
+            self._write_trim_step()
+
+    def _write_trim_step(self):
+        # one vjoy write per animation tick. NOTE hold self._lock while calling
+        # this. output blocked by a central trim is left alone, so only the
+        # event thread ever has to deal with unblocking it
+        if not self._output_blocked:
+            self._set_vjoy(self._prev_raw_input, self._prev_scaling)
 
     def trim_central(self, trim: float = None, center: float = 0.05):
         """
@@ -314,18 +553,15 @@ class TrimmedAxis:
               the axis centered. Defaults to 0.05.
         """
 
-        self._output_blocked = True
-        self.set_trim(trim)
-        threading.Thread(target=self.__async_trim_central, args=[center]).start()
+        with self._lock:
+            self._stop_trim_animation()
+            self._output_blocked = True
+            self._center_margin = center
+            self.set_trim(trim)
 
-    def __async_trim_central(self, center: float):
-        # while output is blocked, check if we can unblock it, else sleep
-        while self._output_blocked:
-            if abs(self._prev_raw_input) < center:
-                self._output_blocked = False
-                self.set_vjoy(self._prev_raw_input, self._prev_scaling)
-            else:
-                time.sleep(0.020)
+            # set_vjoy() unblocks output once the input gets centered, but the
+            # stick might already be there
+            self._set_vjoy(self._prev_raw_input, self._prev_scaling)
 
     def press_trim_hat(self, direction: int):
         """
@@ -337,18 +573,32 @@ class TrimmedAxis:
             * direction (int): should be -1 or 1
         """
 
-        self._is_hat_pressed = True
-        threading.Thread(target=self.__async_trim_hat, args=[direction]).start()
+        with self._lock:
+            self._stop_trim_animation()
+            self._trim_hat_easing.reset()
+            self._trim_task = get_scheduler().call_every(
+                self._trim_hat_easing.get_sleep_time(),
+                self.__async_trim_hat,
+                self._trim_anim_id,
+                direction,
+                delay_s=0,
+            )
+            self._trim_hat_task = self._trim_task
 
     def release_trim_hat(self):
-        self._is_hat_pressed = False
-
-    def __async_trim_hat(self, direction: int):
-        self._trim_hat_easing.reset()
-        while self._is_hat_pressed:
+        with self._lock:
+            # only stop the animation if it's still the trim hat's
+            if self._trim_hat_task and self._trim_task is self._trim_hat_task:
+                self._stop_trim_animation()
+            self._trim_hat_task = None
+
+    def __async_trim_hat(self, anim_id: int, direction: int):
+        with self._lock:
+            if anim_id != self._trim_anim_id:
+                return
             trim_delta = direction * self._trim_hat_easing.get_output()
             self.inc_trim(trim_delta)
-            time.sleep(self._trim_hat_easing.get_sleep_time())
+            self._write_trim_step()
 
 
 class CentralTrimmerBundle:
@@ -358,6 +608,12 @@ class CentralTrimmerBundle:
         you'll probably want to wait until all axes are centered before
         unblocking output.
 
+        NOTE there's no polling. each axis reports its raw input from
+        set_vjoy(), and the bundle keeps count of how many axes are still
+        outside their center, so checking is O(1) no matter the bundle size.
+        an axis that gets trimmed on its own (or by another bundle) while the
+        bundle waits leaves it, and waits to be centered on its own instead.
+
         Args:
             * axes_list (List[TrimmedAxis]): list of trim axes to include in
               this bundle
@@ -371,7 +627,17 @@ class CentralTrimmerBundle:
         self._axes = axes_list
         self._centers = centers_list
 
-        self._centers_need_checked = False
+        # guards the bookkeeping below, since axes report from whatever thread
+        # they get set or trimmed on. NOTE never held while taking an axis's
+        # lock, so it can't deadlock with them
+        self._lock = threading.Lock()
+        # whether we're waiting on axes to get centered, which axes are still
+        # part of the wait, which of those are still outside their center, and
+        # how many of them
+        self._is_waiting = False
+        self._is_member = [False] * len(axes_list)
+        self._is_outside = [False] * len(axes_list)
+        self._num_outside = 0
 
     def trim_central(self, trims_list=None):
         """
@@ -386,33 +652,242 @@ class CentralTrimmerBundle:
         if trims_list is None:
             trims_list = [None] * len(self._axes)
 
-        self._centers_need_checked = True
+        # axes leaving a previous wait shouldn't unblock anything
+        with self._lock:
+            self._is_waiting = False
 
         # block output and set trim on all axes
-        for axis, trim in zip(self._axes, trims_list):
-            axis._output_blocked = True
-            axis.set_trim(trim)
-
-        threading.Thread(target=self.__async_trim_central).start()
-
-    def __async_trim_central(self):
-        # while output is blocked, check if we can unblock it, else sleep
-        while self._centers_need_checked:
-            time.sleep(0.020)
-            self._check_centers()
-
-    def _check_centers(self):
-        for axis, center in zip(self._axes, self._centers):
-            if abs(axis._prev_raw_input) > center:
-                # if just a single axis is out of tolerances, return
+        for i, (axis, trim) in enumerate(zip(self._axes, trims_list)):
+            with axis._lock:
+                axis._stop_trim_animation()
+                axis._output_blocked = True
+                axis._center_margin = None
+                axis._central_bundle = self
+                axis._central_bundle_idx = i
+                axis.set_trim(trim)
+
+        # count the axes that aren't centered yet. set_vjoy() keeps this count
+        # up to date from here on. NOTE an axis that already got trimmed again
+        # on another thread isn't ours anymore
+        with self._lock:
+            self._is_member = [axis._central_bundle is self for axis in self._axes]
+            self._is_outside = [
+                is_member and abs(axis._prev_raw_input) > center
+                for axis, center, is_member in zip(
+                    self._axes, self._centers, self._is_member
+                )
+            ]
+            self._num_outside = sum(self._is_outside)
+            self._is_waiting = self._num_outside > 0
+
+        if not self._is_waiting:
+            self._unblock()
+
+    def _on_axis_input(self, idx: int, raw_input: float):
+        """
+        called by a blocked axis's set_vjoy() with its latest raw input
+        """
+
+        is_outside = abs(raw_input) > self._centers[idx]
+        with self._lock:
+            if not self._is_waiting or not self._is_member[idx]:
                 return
+            if is_outside == self._is_outside[idx]:
+                return
+            self._is_outside[idx] = is_outside
+            self._num_outside += 1 if is_outside else -1
+            if self._num_outside > 0:
+                return
+            self._is_waiting = False
 
-        # else they were all within their respective center, so clear output
-        # blocking on all of them
+        self._unblock()
+
+    def _on_axis_left(self, idx: int):
+        """
+        called by an axis that got trimmed some other way while we wait on it
+        """
+
+        with self._lock:
+            if not self._is_waiting or not self._is_member[idx]:
+                return
+            self._is_member[idx] = False
+            if not self._is_outside[idx]:
+                return
+            self._is_outside[idx] = False
+            self._num_outside -= 1
+            if self._num_outside > 0:
+                return
+            self._is_waiting = False
+
+        self._unblock()
+
+    def _unblock(self):
+        # all axes still in the bundle are within their respective center, so
+        # clear output blocking on them and catch them up on their latest inputs
+        axes = []
         for axis in self._axes:
-            axis._output_blocked = False
+            with axis._lock:
+                if axis._central_bundle is self:
+                    axis._central_bundle = None
+                    axis._output_blocked = False
+                    axes.append(axis)
+
+        with vjoy_frame():
+            for axis in axes:
+                axis.set_vjoy(axis._prev_raw_input, axis._prev_scaling)
+
+
+class TrimBundle:
+    def __init__(self, axes_list, smooth_trim_easing: EasingGenerator = None):
+        """
+        smoothly trims a bundle of axes together (like a helo's cyclic,
+        collective and pedals). every axis gets trimmed and written in the same
+        tick of one scheduler task, instead of each axis running its own.
+
+        each axis eases with its own smooth trim easing, but axes with the same
+        easing (see EasingGenerator.is_same_as()) share it, so it only gets
+        evaluated once per tick. NOTE easings that tick at different rates
+        can't share a tick, so they each get a task of their own
+
+        Args:
+            * axes_list (List[TrimmedAxis]): list of trim axes to include in
+              this bundle
+            * smooth_trim_easing (EasingGenerator, optional): easing to use for
+              all axes instead of their own. Defaults to None.
+        """
+
+        self._axes = axes_list
+
+        if smooth_trim_easing is not None:
+            easings = [smooth_trim_easing] * len(axes_list)
+        else:
+            easings = []
+            for i, axis in enumerate(axes_list):
+                easing = getattr(axis, "_smooth_trim_easing", None)
+                if easing is None:
+                    raise ValueError(
+                        f"axis {i} in the bundle has no smooth trim easing. give "
+                        "it one, or give the bundle one to use for all axes"
+                    )
+                easings.append(easing)
+
+        # one copy of each distinct easing, and which one each axis uses
+        self._easings = []
+        self._easing_idxs = []
+        for easing in easings:
+            for k, shared_easing in enumerate(self._easings):
+                if shared_easing.is_same_as(easing):
+                    break
+            else:
+                k = len(self._easings)
+                self._easings.append(easing.copy())
+            self._easing_idxs.append(k)
+
+        # guards everything below, since trim_smooth() runs on the event thread
+        # and ticks run on the scheduler's. NOTE taken before any axis's lock
+        self._lock = threading.Lock()
+        self._tasks = []
+        # changes every time the bundle's animation gets replaced
+        self._anim_id = 0
+        # per axis animation bookkeeping, see trim_smooth()
+        self._anim_ids = [0] * len(axes_list)
+        self._starting_trims = [0.0] * len(axes_list)
+        self._trim_deltas = [0.0] * len(axes_list)
+        # per easing, the biggest change it runs over and the fraction of the
+        # way there its axes are
+        self._max_trim_deltas = [0.0] * len(self._easings)
+        self._fractions = [0.0] * len(self._easings)
+
+    def trim_smooth(self, trims_list=None):
+        """
+        smoothly sets trim on all axes over a duration
 
-        self._centers_need_checked = False
+        Args:
+            * trims_list (List[float]): list of trim values to set for each
+              axis. setting this to None uses the vjoy axis's current val for
+              each axis in the bundle.
+        """
+
+        if trims_list is None:
+            trims_list = [None] * len(self._axes)
+
+        with self._lock:
+            for task in self._tasks:
+                task.cancel()
+            self._tasks = []
+            self._anim_id += 1
+
+            for i, (axis, trim) in enumerate(zip(self._axes, trims_list)):
+                with axis._lock:
+                    if trim is None:
+                        trim = axis._tuned_axis._axis.get_val()
+
+                    # latest request wins, same as TrimmedAxis.trim_smooth(). if
+                    # the axis gets another trim request while we're running,
+                    # its id changes and we leave it alone from then on
+                    axis._stop_trim_animation()
+                    self._anim_ids[i] = axis._trim_anim_id
+                    self._starting_trims[i] = axis._trim_offset
+                    self._trim_deltas[i] = utils.clamp(trim, -1, 1) - axis._trim_offset
+
+            # each easing runs over the biggest change among its axes, and
+            # every one of them moves the same fraction of its own change each
+            # tick
+            for k in range(len(self._easings)):
+                self._max_trim_deltas[k] = 0.0
+            for i, delta in enumerate(self._trim_deltas):
+                k = self._easing_idxs[i]
+                self._max_trim_deltas[k] = max(self._max_trim_deltas[k], abs(delta))
+
+            # easings that tick at the same rate share a task
+            easing_idxs_by_sleep_time = {}
+            for k, easing in enumerate(self._easings):
+                if self._max_trim_deltas[k] == 0:
+                    continue
+                easing.reset()
+                easing.set_magnitude(self._max_trim_deltas[k])
+                easing_idxs_by_sleep_time.setdefault(easing.get_sleep_time(), [])
+                easing_idxs_by_sleep_time[easing.get_sleep_time()].append(k)
+
+            for sleep_time_s, easing_idxs in easing_idxs_by_sleep_time.items():
+                # NOTE an easing with fewer steps just stays at its end
+                num_steps = max(self._easings[k].get_num_steps() for k in easing_idxs)
+                task = get_scheduler().call_every(
+                    sleep_time_s,
+                    self.__async_trim_smooth,
+                    self._anim_id,
+                    easing_idxs,
+                    num_calls=num_steps,
+                    delay_s=0,
+                )
+                self._tasks.append(task)
+
+    def __async_trim_smooth(self, anim_id: int, easing_idxs):
+        with self._lock:
+            # checked under the lock, so a tick never mixes an old animation
+            # with a new one
+            if anim_id != self._anim_id:
+                return
+
+            # one evaluation per easing
+            for k in easing_idxs:
+                easing_output = self._easings[k].get_output()
+                self._fractions[k] = easing_output / self._max_trim_deltas[k]
+
+            # every axis's step goes out together
+            with vjoy_frame():
+                for i, axis in enumerate(self._axes):
+                    k = self._easing_idxs[i]
+                    if k not in easing_idxs:
+                        continue
+                    with axis._lock:
+                        if axis._trim_anim_id != self._anim_ids[i]:
+                            continue
+                        axis.set_trim(
+                            self._starting_trims[i]
+                            + self._fractions[k] * self._trim_deltas[i]
+                        )
+                        axis._write_trim_step()
 
 
 if __name__ == "__main__":
@@ -429,8 +904,222 @@ if __name__ == "__main__":
     trimmed_axis.set_vjoy(0, Scaling.Dynamic)
     trimmed_axis.inc_trim(0.1)
 
-    trimmed_axis.set_trim(0)
-    trimmed_axis.trim_smooth(0.1)
-    trimmed_axis.trim_smooth(-0.2)
+    # batches should match one at a time
+    clamped_axis = TrimmedAxis(
+        TunedAxis(2, AxisTuning(-0.3, False, (0.05, 0.1), (0.9, 0.8))), True
+    )
+    clamped_axis.set_trim(-0.4)
+    xs = [i / 500.0 for i in range(-500, 501)]
+    for axis in [trimmed_axis, clamped_axis]:
+        for scaling in Scaling:
+            ys = axis.calc_output_many(xs, scaling)
+            coefs = axis._get_scaling_coef_many(xs, scaling)
+            for x, y, coef in zip(xs, ys, coefs):
+                assert abs(y - axis.calc_output(x, scaling)) < 1e-12
+                assert abs(coef - axis._get_scaling_coef(x, scaling)) < 1e-12
+
+    # setting vjoy shouldn't allocate anything per event, besides bumping the
+    # int write counters (the vjoy axis's and the mock's). NOTE the input has
+    # to move, else every write after the first gets suppressed
+    from jge.utils.profiling import get_counter_alloc, max_sweep_alloc
+
+    sweep = [i / 1000 - 1.0 for i in range(2001)]
+    for scaling in Scaling:
+        alloc = max_sweep_alloc(trimmed_axis.set_vjoy, sweep, scaling)
+        assert alloc <= get_counter_alloc(2), (scaling, alloc)
+
+    # changing the tuning's saturation gets picked up by dynamic scaling
+    tuning.saturation_pt = (0.5, 1)
+    assert abs(trimmed_axis.calc_output(0.5, Scaling.Dynamic) - 1.2) < 1e-12
+    tuning.saturation_pt = (1, 1)
+
+    # central trimming unblocks as soon as the input is centered
+    trimmed_axis.set_vjoy(0.5, Scaling.Dynamic)
+    trimmed_axis.trim_central(0.2, 0.05)
+    trimmed_axis.set_vjoy(0.3, Scaling.Dynamic)
+    assert trimmed_axis._output_blocked
+    trimmed_axis.set_vjoy(0.01, Scaling.Dynamic)
+    assert not trimmed_axis._output_blocked
+
+    # bundles wait on all of their axes
+    bundle = CentralTrimmerBundle([trimmed_axis, clamped_axis], [0.05, 0.1])
+    trimmed_axis.set_vjoy(0.5, Scaling.Dynamic)
+    clamped_axis.set_vjoy(0.05, Scaling.Dynamic)
+    bundle.trim_central([0.1, 0.2])
+    assert bundle._num_outside == 1
+    clamped_axis.set_vjoy(0.5, Scaling.Dynamic)
+    trimmed_axis.set_vjoy(0, Scaling.Dynamic)
+    assert bundle._num_outside == 1 and clamped_axis._output_blocked
+    clamped_axis.set_vjoy(-0.1, Scaling.Dynamic)
+    assert bundle._num_outside == 0
+    assert not trimmed_axis._output_blocked and not clamped_axis._output_blocked
+
+    # trimming a member on its own while the bundle waits takes it out of the
+    # bundle, so the rest don't wait on it forever
+    trimmed_axis.set_vjoy(0.5, Scaling.Dynamic)
+    clamped_axis.set_vjoy(0.5, Scaling.Dynamic)
+    bundle.trim_central([0.1, 0.2])
+    assert bundle._num_outside == 2
+    clamped_axis.set_vjoy(0, Scaling.Dynamic)
+    assert bundle._num_outside == 1 and clamped_axis._output_blocked
     trimmed_axis.trim_smooth(0.3)
-    trimmed_axis.trim_smooth(-0.4)
+    with trimmed_axis._lock:
+        trimmed_axis._stop_trim_animation()
+    assert bundle._num_outside == 0 and not clamped_axis._output_blocked
+    # and the one trimmed on its own still waits to be centered
+    assert trimmed_axis._output_blocked and trimmed_axis._central_bundle is None
+    trimmed_axis.set_vjoy(0.2, Scaling.Dynamic)
+    assert trimmed_axis._output_blocked
+    trimmed_axis.set_vjoy(0.01, Scaling.Dynamic)
+    assert not trimmed_axis._output_blocked
+
+    # same for a member trimmed centrally on its own, which keeps its own center
+    trimmed_axis.set_vjoy(0.5, Scaling.Dynamic)
+    clamped_axis.set_vjoy(0.5, Scaling.Dynamic)
+    bundle.trim_central([0.1, 0.2])
+    trimmed_axis.trim_central(0.1, 0.3)
+    assert bundle._num_outside == 1 and clamped_axis._output_blocked
+    trimmed_axis.set_vjoy(0.2, Scaling.Dynamic)
+    assert not trimmed_axis._output_blocked and clamped_axis._output_blocked
+    clamped_axis.set_vjoy(0, Scaling.Dynamic)
+    assert not clamped_axis._output_blocked and not bundle._is_waiting
+    trimmed_axis.set_trim(0)
+
+    # benchmark per event cost of each scaling type (inputs are past the
+    # dynamic scaling delay, so dynamic scaling actually has to blend)
+    from jge.utils.profiling import time_per_call
+
+    print("set_vjoy() per event cost:")
+    bench_xs = [-0.9, -0.6, -0.3, -0.1, 0.1, 0.3, 0.6, 0.9]
+    for scaling in Scaling:
+        costs = [time_per_call(trimmed_axis.set_vjoy, x, scaling) for x in bench_xs]
+        print(f"  {scaling}: {sum(costs) / len(costs) * 1e9:.0f} ns")
+
+    # replaying some stick movement through the int domain path ends up with
+    # the same vjoy integers as the float path, and is cheaper once the table
+    # is warm
+    import math
+
+    replay = [
+        dequantize_hid_axis(quantize_hid_axis(math.sin(i / 50) * 1.05))
+        for i in range(2000)
+    ]
+    int_axis = TrimmedAxis(TunedAxis(8, AxisTuning(0.3, False, (0.05, 0))), True)
+    int_axis.set_trim(0.2)
+    print("replay per event cost (float vs int domain):")
+    for scaling in Scaling:
+        float_cost = sum(
+            time_per_call(int_axis.set_vjoy, x, scaling, num_calls=100)
+            for x in replay[:200]
+        )
+        expected = [
+            quantize_vjoy_axis(int_axis.calc_output(x, scaling)) for x in replay
+        ]
+
+        int_axis.use_int_domain()
+        for x, y in zip(replay, expected):
+            int_axis.set_vjoy(x, scaling)
+            assert int_axis._int_table.output(quantize_hid_axis(x)) == y
+        int_cost = sum(
+            time_per_call(int_axis.set_vjoy, x, scaling, num_calls=100)
+            for x in replay[:200]
+        )
+        int_axis.use_int_domain(False)
+        print(
+            f"  {scaling}: {float_cost / 200 * 1e9:.0f} ns vs {int_cost / 200 * 1e9:.0f} ns"
+        )
+
+    # NOTE on a simulated clock, trims run instantly and deterministically, on
+    # this thread as the clock advances
+    from jge.utils.clock import SimulatedClock, use_clock
+
+    sim = SimulatedClock()
+    with use_clock(sim):
+        # the latest smooth trim wins and takes over from wherever the trim is
+        trimmed_axis.set_trim(0)
+        trimmed_axis.trim_smooth(0.1)
+        trimmed_axis.trim_smooth(-0.2)
+        trimmed_axis.trim_smooth(0.3)
+        trimmed_axis.trim_smooth(-0.4)
+        sim.advance(1.5)
+        assert abs(trimmed_axis._trim_offset + 0.4) < 1e-9
+
+        # and so does the trim hat, until it's released
+        trimmed_axis._trim_hat_easing = EasingGenerator.ConstantRate(
+            SmoothStep(2, 2), 1, 20, 1
+        )
+        trimmed_axis.trim_smooth(0.4)
+        trimmed_axis.press_trim_hat(-1)
+        sim.advance(0.1)
+        trimmed_axis.release_trim_hat()
+        trim = trimmed_axis._trim_offset
+        assert trim < -0.4
+        sim.advance(0.1)
+        assert trimmed_axis._trim_offset == trim
+
+        # bundles need an easing for every axis
+        try:
+            TrimBundle([trimmed_axis, clamped_axis])
+            assert False
+        except ValueError:
+            pass
+
+        # bundles trim all their axes together from one task
+        bundle = TrimBundle(
+            [trimmed_axis, clamped_axis], trimmed_axis._smooth_trim_easing
+        )
+        assert len(bundle._easings) == 1
+        clamped_axis.set_trim(0.2)
+        trimmed_axis.set_trim(0.5)
+        bundle.trim_smooth([-0.5, 0])
+        sim.advance(0.1)
+        # both axes are the same fraction of the way there
+        x_frac = (0.5 - trimmed_axis._trim_offset) / 1.0
+        y_frac = (0.2 - clamped_axis._trim_offset) / 0.2
+        assert 0 < x_frac < 1 and abs(x_frac - y_frac) < 1e-9
+        # and the latest request for a single axis takes it over
+        clamped_axis.set_trim(0.2)
+        clamped_axis.trim_timed(0.3, 0)
+        sim.advance(1.5)
+        assert abs(trimmed_axis._trim_offset + 0.5) < 1e-9
+        assert abs(clamped_axis._trim_offset - 0.3) < 1e-9
+
+        # each axis eases with its own easing, and the same ones get shared
+        fast = EasingGenerator.ConstantTime(SmoothStep(2, 2), 0.5, 20)
+        slow = EasingGenerator.ConstantTime(SmoothStep(2, 2), 1.0, 20)
+        eased_axes = [
+            TrimmedAxis(TunedAxis(i, AxisTuning(0.3)), smooth_trim_easing=easing)
+            for i, easing in [(12, fast), (13, fast), (14, slow)]
+        ]
+        bundle = TrimBundle(eased_axes)
+        assert len(bundle._easings) == 2 and bundle._easing_idxs == [0, 0, 1]
+        bundle.trim_smooth([0.4, -0.2, 0.4])
+        sim.advance(0.6)
+        trims = [axis._trim_offset for axis in eased_axes]
+        assert abs(trims[0] - 0.4) < 1e-9 and abs(trims[1] + 0.2) < 1e-9
+        assert 0 < trims[2] < 0.4
+        sim.advance(0.5)
+        assert abs(eased_axes[2]._trim_offset - 0.4) < 1e-9
+
+        # smooth trimming in the int domain doesn't reallocate the table on
+        # every tick, its outputs just go stale. NOTE 10 bit controller axis
+        int_axis._smooth_trim_easing = EasingGenerator.ConstantRate(
+            SmoothStep(2, 2), 1, 20, 1
+        )
+        int_axis.use_int_domain(input_resolution=2**10)
+        outputs = int_axis._int_table._outputs
+        int_axis.set_trim(0)
+        int_axis.trim_smooth(0.5)
+        for i in range(20):
+            x = dequantize_hid_axis(quantize_hid_axis(i / 20, 2**10), 2**10)
+            int_axis.set_vjoy(x, Scaling.Static)
+            step = quantize_hid_axis(x, 2**10)
+            expected = quantize_vjoy_axis(int_axis.calc_output(x, Scaling.Static))
+            assert int_axis._int_table.output(step) == expected
+            sim.advance(0.05)
+        assert int_axis._int_table._outputs is outputs
+        assert len(outputs) == 2**10 + 1
+        assert abs(int_axis._trim_offset - 0.5) < 1e-9
+        int_axis.use_int_domain(False)
+
+    print(get_scheduler().stats)
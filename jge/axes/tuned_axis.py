@@ -1,8 +1,24 @@
 import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional. it only speeds up evaluating lots of inputs at once
+    np = None
 
 from jge.utils import utils
+from jge.utils.lut import UniformTable
 from jge.utils.vec2 import Vec2
-from jge.gremlin_interface import VjoyAxis
+from jge.gremlin_interface import (
+    RateLimitedAxis,
+    VjoyAxis,
+    VJOY_AXIS_RESOLUTION,
+    HID_AXIS_RESOLUTION,
+    quantize_hid_axis,
+    dequantize_hid_axis,
+    quantize_vjoy_axis,
+)
 
 
 class AxisTuning:
@@ -27,41 +43,190 @@ class AxisTuning:
               Defaults to (0, 0).
             * saturation_pt (tuple, optional): point that contains x and y
               saturation, similar to DCS. Defaults to (1, 1).
+
+        NOTE call compile() to swap the math for a precomputed table. the table
+        gets rebuilt whenever curvature, invert, deadzone_pt or saturation_pt
+        are set, but not if you modify the x/y of a point in place, so always
+        assign a new point.
         """
-        self.curvature = curvature
-        self.inverted_coef = -1 if invert else 1
-        self.deadzone_pt = Vec2.From(deadzone_pt)
-        self.saturation_pt = Vec2.From(saturation_pt)
+
+        # compiled response curve table (None means we do the math every time)
+        self._table = None
+        self._resolution = None
+        # incremented every time a tuning value changes, so anything caching
+        # values derived from this tuning can tell when they're stale
+        self._version = 0
+
+        self._curvature = curvature
+        self._invert = invert
+        self._deadzone_pt = Vec2.From(deadzone_pt)
+        self._saturation_pt = Vec2.From(saturation_pt)
 
         self.origin_pt = Vec2(0, 0)
 
     def __str__(self):
-        invert = False if self.inverted_coef == 1 else True
-        return f"AxisTuning({self.curvature}, {invert}, {str(self.deadzone_pt)}, {str(self.saturation_pt)})"
+        return f"AxisTuning({self.curvature}, {self.invert}, {str(self.deadzone_pt)}, {str(self.saturation_pt)})"
+
+    def __call__(self, x: float) -> float:
+        """
+        evaluates the response curve's actual math (never the compiled table),
+        so a tuning can be used anywhere a curve function is expected, like
+        LookupTable.FromFunction()
+        """
+        return self._calc_transform(x)
+
+    @property
+    def curvature(self) -> float:
+        return self._curvature
+
+    @curvature.setter
+    def curvature(self, curvature: float) -> None:
+        self._curvature = curvature
+        self._on_tuning_changed()
+
+    @property
+    def invert(self) -> bool:
+        return self._invert
+
+    @invert.setter
+    def invert(self, invert: bool) -> None:
+        self._invert = invert
+        self._on_tuning_changed()
+
+    @property
+    def inverted_coef(self) -> int:
+        return -1 if self._invert else 1
+
+    @property
+    def deadzone_pt(self) -> Vec2:
+        return self._deadzone_pt
+
+    @deadzone_pt.setter
+    def deadzone_pt(self, deadzone_pt) -> None:
+        self._deadzone_pt = Vec2.From(deadzone_pt)
+        self._on_tuning_changed()
+
+    @property
+    def saturation_pt(self) -> Vec2:
+        return self._saturation_pt
+
+    @saturation_pt.setter
+    def saturation_pt(self, saturation_pt) -> None:
+        self._saturation_pt = Vec2.From(saturation_pt)
+        self._on_tuning_changed()
+
+    def _on_tuning_changed(self) -> None:
+        """call this whenever a tuning value changes"""
+        self._version += 1
+        if self.is_compiled():
+            self.compile(self._resolution)
+
+    def compile(self, resolution: int = VJOY_AXIS_RESOLUTION) -> None:
+        """
+        precomputes the response curve into a table, so transforming input is
+        an index and a single lerp instead of doing all the math every time.
+
+        Args:
+            * resolution (int, optional): number of table segments spanning
+              [-1, 1]. Defaults to VJOY_AXIS_RESOLUTION, so each segment is a
+              single vjoy step.
+        """
+
+        self._resolution = resolution
+        # the table is part of the config too (see _version)
+        self._version += 1
+        self._table = UniformTable.FromFunction(
+            self._calc_transform, -1.0, 1.0, resolution
+        )
+
+    def is_compiled(self) -> bool:
+        return self._table is not None
+
+    def get_max_error(self) -> float:
+        """
+        returns the max absolute difference between the compiled table and the
+        actual response curve, so you know whether you can trust it. returns 0
+        if the tuning isn't compiled.
+        """
+
+        if not self.is_compiled():
+            return 0.0
+        return self._table.max_error(self._calc_transform)
 
     def _transform_input(self, x: float) -> float:
         """apply transformation to input to calculate output"""
 
+        if self._table is not None:
+            return self._table.output(x)
+        return self._calc_transform(x)
+
+    def _calc_transform(self, x: float) -> float:
+        """do the math to transform input into output"""
+
+        # NOTE this runs on every axis event, so it sticks to the private
+        # attributes and only makes floats (which python recycles), so it
+        # doesn't allocate anything
+
         # it's easiest to use the abs value and correct the sign at the end
         abs_x = abs(x)
+        deadzone_pt = self._deadzone_pt
+        saturation_pt = self._saturation_pt
 
-        if abs_x < self.deadzone_pt.x:
+        if abs_x < deadzone_pt.x:
             # lerp between origin and deadzone end point
-            p = Vec2.LerpX(self.origin_pt, self.deadzone_pt, abs_x)
-            y = p.y
+            y = Vec2.LerpY(self.origin_pt, deadzone_pt, abs_x)
 
-        elif abs_x < self.saturation_pt.x:
+        elif abs_x < saturation_pt.x:
             # only apply transformation to this section so we don't
             # transform/move the deadzone point! so normalize/denormalize
-            norm_x = utils.normalize(abs_x, self.deadzone_pt.x, self.saturation_pt.x)
-            norm_y = utils.sigmoid(norm_x, self.curvature)
-            y = utils.denormalize(norm_y, self.deadzone_pt.y, self.saturation_pt.y)
+            norm_x = utils.normalize(abs_x, deadzone_pt.x, saturation_pt.x)
+            norm_y = utils.sigmoid(norm_x, self._curvature)
+            y = utils.denormalize(norm_y, deadzone_pt.y, saturation_pt.y)
 
         else:
             # else we simply limit output by saturation's y
-            y = self.saturation_pt.y
+            y = saturation_pt.y
 
-        y = math.copysign(y, x) * self.inverted_coef
+        y = math.copysign(y, x)
+        if self._invert:
+            y = -y
+        return y
+
+    def transform_input_many(self, inputs):
+        """
+        same as _transform_input(), but for a whole buffer of inputs (a list,
+        array, numpy array, etc.) at once.
+
+        returns a numpy array if numpy is installed, else an array("d")
+        """
+
+        if self._table is not None:
+            return self._table.output_many(inputs)
+
+        if np is None:
+            return array("d", [self._calc_transform(x) for x in inputs])
+
+        # NOTE the utils functions work on numpy arrays too, so each section
+        # does the exact same math as _calc_transform()
+        x = np.asarray(inputs, dtype=np.float64)
+        abs_x = np.abs(x)
+        deadzone_pt = self._deadzone_pt
+        saturation_pt = self._saturation_pt
+
+        # start with everything saturated and fill in the other sections
+        y = np.full_like(abs_x, saturation_pt.y)
+
+        in_deadzone = abs_x < deadzone_pt.x
+        y[in_deadzone] = Vec2.LerpY(self.origin_pt, deadzone_pt, abs_x[in_deadzone])
+
+        in_curve = ~in_deadzone & (abs_x < saturation_pt.x)
+        norm_x = utils.normalize(abs_x[in_curve], deadzone_pt.x, saturation_pt.x)
+        norm_y = utils.sigmoid(norm_x, self._curvature)
+        y[in_curve] = utils.denormalize(norm_y, deadzone_pt.y, saturation_pt.y)
+
+        y = np.copysign(y, x)
+        if self._invert:
+            y = -y
         return y
 
 
@@ -98,6 +263,81 @@ class TunedAxis:
         self._is_slider = is_slider
         self._axis = VjoyAxis(axis_id, device_id)
 
+        # vjoy integer for each controller axis step, the controller axis's
+        # resolution, and the tuning versions it was made with (see
+        # use_int_domain())
+        self._int_outputs = None
+        self._int_resolution = HID_AXIS_RESOLUTION
+        self._int_versions = (0, 0)
+
+    def compile(self, resolution: int = VJOY_AXIS_RESOLUTION) -> float:
+        """
+        compiles left and right tunings (see AxisTuning.compile()).
+
+        Returns:
+            float: max error of the compiled tables
+        """
+
+        max_err = 0.0
+        for tuning in {self._right_tuning, self._left_tuning}:
+            tuning.compile(resolution)
+            max_err = max(max_err, tuning.get_max_error())
+        return max_err
+
+    def limit_output_rate(self, max_rate_hz: float = None) -> None:
+        """
+        caps how often the vjoy axis gets written, while still always writing
+        the latest output (see RateLimitedAxis). handy for high rate sticks,
+        since games only sample vjoy at their frame rate.
+
+        Args:
+            * max_rate_hz (float, optional): max writes per second, or None to
+              write every output. Defaults to None.
+        """
+
+        if isinstance(self._axis, RateLimitedAxis):
+            self._axis.flush()
+            self._axis = self._axis._axis
+        if max_rate_hz is not None:
+            self._axis = RateLimitedAxis(self._axis, max_rate_hz)
+
+    def use_int_domain(
+        self, enabled: bool = True, input_resolution: int = HID_AXIS_RESOLUTION
+    ) -> None:
+        """
+        switches set() to work entirely with ints. the input gets quantized to
+        the controller's HID step, which indexes a table holding the vjoy
+        integer for every step, and that gets written to vjoy as is. the vjoy
+        integers are exactly what the float path ends up with (for inputs JG
+        made from HID values), minus all the float math and clamping.
+
+        NOTE the table gets filled right away, and refilled if a tuning changes
+
+        Args:
+            * enabled (bool, optional): Defaults to True.
+            * input_resolution (int, optional): number of steps the
+              controller axis has, e.g. 2**10 for a 10 bit axis. the table has
+              one entry per step. Defaults to HID_AXIS_RESOLUTION.
+        """
+
+        if not enabled:
+            self._int_outputs = None
+            return
+
+        self._int_resolution = input_resolution
+        self._refill_int_table()
+
+    def _calc_int_output(self, step: int) -> int:
+        """calcs the vjoy integer for a controller axis step"""
+        input = dequantize_hid_axis(step, self._int_resolution)
+        return quantize_vjoy_axis(self.calc_output(input))
+
+    def _refill_int_table(self) -> None:
+        self._int_versions = (self._right_tuning._version, self._left_tuning._version)
+        self._int_outputs = array(
+            "i", [self._calc_int_output(i) for i in range(self._int_resolution + 1)]
+        )
+
     def _calc_slider_output(self, input: float) -> float:
         """
         will normalize input and denormalize output to map right tuning over the
@@ -132,6 +372,33 @@ class TunedAxis:
         else:
             return self._right_tuning._transform_input(input)
 
+    def calc_output_many(self, inputs):
+        """
+        same as calc_output(), but for a whole buffer of inputs (a list, array,
+        numpy array, etc.) at once. useful for graphs and offline tools.
+
+        returns a numpy array if numpy is installed, else an array("d")
+        """
+
+        if np is None:
+            return array("d", [self.calc_output(x) for x in inputs])
+
+        inputs = np.asarray(inputs, dtype=np.float64)
+
+        if self._is_slider:
+            output = self._right_tuning.transform_input_many(
+                utils.normalize(inputs, -1, 1)
+            )
+            if self._right_tuning.inverted_coef == -1:
+                output += 1
+            return utils.denormalize(output, -1, 1)
+
+        output = np.empty_like(inputs)
+        is_left = inputs < 0
+        output[is_left] = self._left_tuning.transform_input_many(inputs[is_left])
+        output[~is_left] = self._right_tuning.transform_input_many(inputs[~is_left])
+        return output
+
     def set(self, input: float) -> None:
         """
         calculate output and set vjoy axis's value to it
@@ -140,9 +407,22 @@ class TunedAxis:
             input (float) [-1, 1]: raw controller value
         """
 
-        """"""
+        if self._int_outputs is not None:
+            self._set_int(input)
+            return
+
         self._axis.set_val(self.calc_output(input))
 
+    def _set_int(self, input: float) -> None:
+        if (
+            self._right_tuning._version != self._int_versions[0]
+            or self._left_tuning._version != self._int_versions[1]
+        ):
+            self._refill_int_table()
+
+        step = quantize_hid_axis(input, self._int_resolution)
+        self._axis.set_int_val(self._int_outputs[step])
+
 
 if __name__ == "__main__":
     tuning = AxisTuning(-0.5, deadzone_pt=(0.01, 0.1), saturation_pt=(0.9, 1))
@@ -150,13 +430,104 @@ if __name__ == "__main__":
 
     tuned_axis = TunedAxis(1, tuning)
     xs = [i / 100.0 for i in range(-100, 101, 1)]
-    ys = [tuned_axis.calc_output(x) for x in xs]
+    ys = tuned_axis.calc_output_many(xs)
     print("\ncentered axis")
     for x, y in zip(xs, ys):
         print(f"{x},{y}")
 
     slider_axis = TunedAxis(1, tuning, is_slider=True)
-    ys = [slider_axis.calc_output(x) for x in xs]
+    ys = slider_axis.calc_output_many(xs)
     print("\nslider axis")
     for x, y in zip(xs, ys):
         print(f"{x},{y}")
+
+    compiled_tuning = AxisTuning(-0.5, deadzone_pt=(0.01, 0.1), saturation_pt=(0.9, 1))
+    compiled_axis = TunedAxis(1, compiled_tuning)
+    max_err = compiled_axis.compile()
+    print(f"\ncompiled max error = {max_err}")
+    assert max_err < 1e-4
+    for x in xs:
+        assert abs(compiled_axis.calc_output(x) - tuned_axis.calc_output(x)) < 1e-4
+
+    # batches should match one at a time
+    left_tuning = AxisTuning(0.3, True, (0.05, 0.2), (0.8, 0.9))
+    batch_xs = [i / 500.0 for i in range(-600, 601)]
+    for axis in [
+        tuned_axis,
+        slider_axis,
+        compiled_axis,
+        TunedAxis(1, tuning, left_tuning),
+        TunedAxis(1, left_tuning, is_slider=True),
+    ]:
+        batch_ys = axis.calc_output_many(batch_xs)
+        for x, y in zip(batch_xs, batch_ys):
+            assert abs(y - axis.calc_output(x)) < 1e-12
+
+    # changing a tuning value rebuilds the table
+    compiled_tuning.invert = True
+    assert compiled_axis.calc_output(0.5) == -tuned_axis.calc_output(0.5)
+
+    # the math path shouldn't allocate anything per event, besides bumping the
+    # int write counters (the vjoy axis's and the mock's). NOTE the input has
+    # to move, else every write after the first gets suppressed. (the compiled
+    # path also makes the int it uses to index the table)
+    from jge.utils.profiling import get_counter_alloc, max_sweep_alloc
+
+    sweep = [i / 1000 - 1.0 for i in range(2001)]
+    assert max_sweep_alloc(tuned_axis.set, sweep) <= get_counter_alloc(2)
+    assert max_sweep_alloc(slider_axis.set, sweep) <= get_counter_alloc(2)
+
+    # replay some stick movement through the float and int domain paths. they
+    # should end up with the same vjoy integers, but the int path is cheaper
+    from jge.axes.lut_axis import LutAxis
+    from jge.utils.lut import LookupTable
+    from jge.utils.profiling import time_per_call
+
+    replay = [
+        dequantize_hid_axis(quantize_hid_axis(math.sin(i / 50) * 1.05))
+        for i in range(2000)
+    ]
+
+    def replay_all(axis):
+        for x in replay:
+            axis.set(x)
+
+    lut = LookupTable.FromPoints([(0.01, 0), (0.01, 0.01), (1, 1)], True)
+    int_axes = [
+        (TunedAxis(2, AxisTuning(-0.5, False, (0.01, 0.1), (0.9, 1))), "TunedAxis"),
+        (TunedAxis(3, AxisTuning(0.3), is_slider=True), "TunedAxis slider"),
+        (LutAxis(4, lut), "LutAxis"),
+    ]
+    print("\nreplay per event cost (float vs int domain):")
+    for axis, name in int_axes:
+        float_cost = time_per_call(replay_all, axis, num_calls=20) / len(replay)
+        calc_float_output = getattr(axis, "calc_output", None) or axis._lut.output
+        expected = [quantize_vjoy_axis(calc_float_output(x)) for x in replay]
+
+        axis.use_int_domain()
+        int_outputs = [axis._int_outputs[quantize_hid_axis(x)] for x in replay]
+        assert int_outputs == expected
+        int_cost = time_per_call(replay_all, axis, num_calls=20) / len(replay)
+        print(f"  {name}: {float_cost * 1e9:.0f} ns vs {int_cost * 1e9:.0f} ns")
+
+        # a 10 bit controller axis only needs a table with 2**10 + 1 entries
+        replay_10 = [
+            dequantize_hid_axis(quantize_hid_axis(x, 2**10), 2**10) for x in replay
+        ]
+        axis.use_int_domain(input_resolution=2**10)
+        assert len(axis._int_outputs) == 2**10 + 1
+        steps = [quantize_hid_axis(x, 2**10) for x in replay_10]
+        int_outputs = [axis._int_outputs[step] for step in steps]
+        assert int_outputs == [
+            quantize_vjoy_axis(calc_float_output(x)) for x in replay_10
+        ]
+        axis.use_int_domain(False)
+
+    # rate limiting skips most writes, but the latest output always makes it
+    limited_axis = TunedAxis(5, AxisTuning(0.3))
+    limited_axis.limit_output_rate(50)
+    for x in replay[:100]:
+        limited_axis.set(x)
+    assert limited_axis._axis.num_writes < 100
+    limited_axis.limit_output_rate(None)
+    assert limited_axis._axis.get_val() == limited_axis.calc_output(replay[99])
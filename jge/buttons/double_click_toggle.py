@@ -1,6 +1,7 @@
-import time
+import math
 
 from jge.gremlin_interface import VjoyButton
+from jge.utils import clock
 
 
 class DoubleClickToggle:
@@ -19,15 +20,17 @@ class DoubleClickToggle:
         self._button = VjoyButton(button_id, device_id)
         self._double_click_time_s = double_click_time_s
 
-        self._t0 = 0
-        self._t1 = 0
+        # when the last two presses happened. NOTE starts long ago, so the
+        # first press can't count as a double click
+        self._t0 = -math.inf
+        self._t1 = -math.inf
 
     def press(self):
         """
         presses the button
         """
         self._t0 = self._t1
-        self._t1 = time.time()
+        self._t1 = clock.now()
 
         self._button.press()
 
@@ -50,18 +53,22 @@ class DoubleClickToggle:
 
 
 if __name__ == "__main__":
-    d = DoubleClickToggle(10, 0.1, 1)
-
-    for i in range(2):
-        d.press()
-        time.sleep(0.1)
-        d.release()
-        time.sleep(0.1)
-    assert not d._button.is_pressed()
-
-    for i in range(2):
-        d.press()
-        time.sleep(0.035)
-        d.release()
-        time.sleep(0.035)
-    assert d._button.is_pressed()
+    from jge.utils.clock import SimulatedClock, use_clock
+
+    # NOTE on a simulated clock, so clicks are timed exactly and instantly
+    with use_clock(SimulatedClock()) as sim:
+        d = DoubleClickToggle(10, 0.1, 1)
+
+        for i in range(2):
+            d.press()
+            sim.advance(0.1)
+            d.release()
+            sim.advance(0.1)
+        assert not d._button.is_pressed()
+
+        for i in range(2):
+            d.press()
+            sim.advance(0.035)
+            d.release()
+            sim.advance(0.035)
+        assert d._button.is_pressed()
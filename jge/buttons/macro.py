@@ -1,11 +1,43 @@
+import queue
 import threading
-import time
+import traceback
 
 from jge.gremlin_interface import KeyboardKey, VjoyButton
+from jge.utils import clock
+from jge.utils.scheduler import get_scheduler
 
 
 DEFAULT_WAIT_S = 0.050
 
+# custom callable entries run on these threads instead of the scheduler's (see
+# Macro). NOTE a fixed number of them, so pressing macros over and over can't
+# pile up threads. if they're all busy, callables wait their turn
+NUM_CALLABLE_WORKERS = 4
+_callable_queue = queue.SimpleQueue()
+_callable_workers = []
+_callable_workers_lock = threading.Lock()
+
+
+def _run_callable_worker():
+    while True:
+        fn, args = _callable_queue.get()
+        try:
+            fn(*args)
+        except Exception:
+            # don't let one bad callable take down the worker
+            traceback.print_exc()
+
+
+def _run_on_callable_worker(fn, *args):
+    """runs fn(*args) on one of the callable workers, starting them if needed"""
+    with _callable_workers_lock:
+        if not _callable_workers:
+            for _ in range(NUM_CALLABLE_WORKERS):
+                worker = threading.Thread(target=_run_callable_worker, daemon=True)
+                worker.start()
+                _callable_workers.append(worker)
+    _callable_queue.put((fn, args))
+
 
 def _is_proper_entry(entry) -> bool:
     """returns if the entry is an instance of a macro entry class type"""
@@ -50,7 +82,7 @@ class Wait:
         self._time_s = time_s
 
     def __call__(self) -> None:
-        time.sleep(self._time_s)
+        clock.sleep(self._time_s)
 
     def __str__(self) -> str:
         return f"Wait: {self._time_s}"
@@ -191,43 +223,82 @@ class Macro:
             * callables: list of callables for the macro to execute
             * repeat (bool, optional): whether or not the macro should repeat if
               the button is still held upon completion. Defaults to False.
+
+        NOTE macros run on JGE's scheduler thread. instead of sleeping, a Wait
+        entry schedules the rest of the macro to run after the wait time.
+
+        NOTE the scheduler thread runs every other timed task too, so any entry
+        that isn't a Wait, Button or Key (i.e. your own callable, which might
+        block) runs on one of a few shared worker threads instead, and the
+        macro carries on from there once it returns. on a simulated clock it
+        just runs in place, so tests stay deterministic.
         """
 
         self._callables = callables
         self._repeat = repeat
 
-        self._thread = threading.Thread()
+        # guards _is_running and _pressed, since they get set from the event
+        # thread and the scheduler thread (or a callable entry's thread)
+        self._lock = threading.Lock()
+        self._is_running = False
         self._pressed = False
 
     def __call__(self):
         self.press()
         self.release()
 
-    def __run_async(self):
-        while True:
-            for entry in self._callables:
+    def __run_async(self, start_idx: int):
+        # run entries until we hit a wait, then schedule the rest of the macro
+        # to continue after it
+        for i in range(start_idx, len(self._callables)):
+            entry = self._callables[i]
+            if isinstance(entry, Wait):
+                get_scheduler().call_later(entry._time_s, self.__run_async, i + 1)
+                return
+            if isinstance(entry, Button) or isinstance(entry, Key):
+                entry()
+            elif not clock.get_clock().is_simulated:
+                # don't let a callable that blocks stall the scheduler thread
+                _run_on_callable_worker(self.__run_callable, i)
+                return
+            else:
                 entry()
 
-            if not (self._pressed and self._repeat):
-                break
-            # else repeat the macro again
+        with self._lock:
+            repeat = self._pressed and self._repeat
+            if not repeat:
+                self._is_running = False
+
+        if repeat:
+            # repeat the macro again. schedule it, so a macro without any waits
+            # can't hog the scheduler
+            get_scheduler().call_later(0, self.__run_async, 0)
+
+    def __run_callable(self, idx: int):
+        # runs on a callable worker, then carries on with the macro until the
+        # next wait puts it back on the scheduler thread
+        self._callables[idx]()
+        self.__run_async(idx + 1)
 
     def is_running(self):
         """returns if the macro is currently running"""
-        return self._thread.is_alive()
+        with self._lock:
+            return self._is_running
 
     def press(self):
-        self._pressed = True
+        with self._lock:
+            self._pressed = True
 
-        # don't run multiple times at once!
-        if self.is_running():
-            return
+            # don't run multiple times at once!
+            if self._is_running:
+                return
+            self._is_running = True
 
-        self._thread = threading.Thread(target=self.__run_async)
-        self._thread.start()
+        get_scheduler().call_later(0, self.__run_async, 0)
 
     def release(self):
-        self._pressed = False
+        with self._lock:
+            self._pressed = False
 
 
 if __name__ == "__main__":
@@ -254,8 +325,55 @@ if __name__ == "__main__":
 
     macro = Macro(macro_entries, True)
 
+    from jge.utils.clock import SimulatedClock, use_clock
+
+    # NOTE on a simulated clock, the macro's waits take no real time, and its
+    # steps run on this thread as the clock advances past them
     entries = MacroEntries.FromShorthand([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
     macro1 = Macro(entries, True)
     print("running macro")
-    macro1.press()
-    macro1.release()
+    with use_clock(SimulatedClock()) as sim:
+        macro1.press()
+        macro1.release()
+        assert macro1.is_running()
+
+        while macro1.is_running():
+            sim.advance(0.01)
+        # 10 presses and 10 releases, with a default wait after each
+        assert abs(clock.now() - 20 * DEFAULT_WAIT_S) < 0.02
+    print("macro finished")
+
+    # a callable entry that blocks doesn't stall the other scheduled tasks
+    import time
+
+    unblock = threading.Event()
+    calls = []
+    entries = [Button(1, True), unblock.wait, lambda: calls.append("macro")]
+    blocking_macro = Macro(entries)
+    blocking_macro.press()
+    blocking_macro.release()
+    get_scheduler().call_later(0.05, calls.append, "task")
+    time.sleep(0.2)
+    assert calls == ["task"] and blocking_macro.is_running()
+    unblock.set()
+    time.sleep(0.1)
+    assert calls == ["task", "macro"] and not blocking_macro.is_running()
+
+    # pressing macros with callable entries over and over doesn't keep making
+    # threads, even while the callables are still running
+    def slow_callable():
+        time.sleep(0.005)
+        calls.append("macro")
+
+    num_threads = threading.active_count()
+    max_num_threads = num_threads
+    calls.clear()
+    for i in range(100):
+        macro = Macro([slow_callable])
+        macro.press()
+        macro.release()
+        time.sleep(0.001)
+        max_num_threads = max(max_num_threads, threading.active_count())
+    time.sleep(0.5)
+    assert len(calls) == 100
+    assert max_num_threads == num_threads, max_num_threads
@@ -1,4 +1,4 @@
-from jge.gremlin_interface import VjoyButton
+from jge.gremlin_interface import VjoyButton, vjoy_frame
 
 
 class StickyButtons:
@@ -30,8 +30,19 @@ class StickyButtons:
 
     def release_all(self) -> None:
         """release all buttons"""
-        for b in self._buttons.values():
-            b.release()
+        with vjoy_frame():
+            for b in self._buttons.values():
+                b.release()
+
+    def press_only(self, button_id: int) -> None:
+        """
+        release all other buttons and press the button corresponding to the
+        ID. the game sees it all happen in one update, so the old button and
+        the new one are never both pressed (or both released).
+        """
+        with vjoy_frame():
+            self.release_all()
+            self.press(button_id)
 
 
 if __name__ == "__main__":
@@ -41,3 +52,11 @@ if __name__ == "__main__":
     sticky_buttons.press(1)
     sticky_buttons.press(2)
     sticky_buttons.release_all()
+
+    # only the button that ends up changing gets written
+    sticky_buttons.press_only(3)
+    num_committed = sticky_buttons._buttons[3].get_num_committed()
+    sticky_buttons.press_only(3)
+    assert sticky_buttons._buttons[3].get_num_committed() == num_committed
+    assert sticky_buttons._buttons[3].is_pressed()
+    assert not sticky_buttons._buttons[1].is_pressed()
@@ -1,5 +1,4 @@
-import threading
-import time
+from jge.utils.scheduler import get_scheduler
 
 
 class Tempo:
@@ -21,27 +20,27 @@ class Tempo:
         self._pressed = False
         self._did_long_press = False
 
-        self._press_id = 0
-        # NOTE bah, i want the long press to automatically execute after the
-        # delay. i don't want you to be forced to release the button to have it
-        # execute. but if you press, release, and press again the thread will
-        # have no idea that it's a new press, so every press is going to get a
-        # UID for now.
-
-    def __run_async(self, press_id):
-        time.sleep(self._delay_s)
-        # only execute if we're still on the same press after sleeping
-        if self._pressed and self._press_id == press_id:
+        # i want the long press to automatically execute after the delay. i
+        # don't want you to be forced to release the button to have it execute,
+        # so every press schedules a long press that gets cancelled on release
+        self._task = None
+
+    def __on_long_press(self):
+        # only execute if we're still pressed
+        if self._pressed:
             self._did_long_press = True
             self._long_callable()
 
     def press(self):
         self._pressed = True
-        self._press_id += 1
-        threading.Thread(target=self.__run_async, args=[self._press_id]).start()
+        if self._task:
+            self._task.cancel()
+        self._task = get_scheduler().call_later(self._delay_s, self.__on_long_press)
 
     def release(self):
         self._pressed = False
+        if self._task:
+            self._task.cancel()
 
         # only do short press if long press hasn't been executed
         if not self._did_long_press:
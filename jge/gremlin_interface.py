@@ -13,7 +13,57 @@ try:
 except ImportError:
     import jge.gremlin_mock as gremlin
 
-from jge.utils import utils
+import itertools
+import math
+import threading
+import time
+
+from jge.utils import clock, utils
+from jge.utils.scheduler import get_scheduler
+
+# vjoy axes are 15 bit, so there are this many distinct steps between -1 and 1
+VJOY_AXIS_RESOLUTION = 2**15
+# JG maps [-1, 1] onto vjoy's integer range [0, VJOY_AXIS_MAX] with
+# int(half_range + half_range * value)
+VJOY_AXIS_MAX = VJOY_AXIS_RESOLUTION - 1
+_VJOY_AXIS_HALF_RANGE = VJOY_AXIS_MAX // 2
+
+# JG scales raw HID axis values to [-1, 1]. a 16 bit controller axis has this
+# many distinct steps between -1 and 1, but plenty of controllers only report
+# 10-14 bits, so everything taking a resolution defaults to this
+HID_AXIS_RESOLUTION = 2**16
+
+
+def quantize_hid_axis(value: float, resolution: int = HID_AXIS_RESOLUTION) -> int:
+    """
+    returns the controller axis step [0, resolution] closest to value (a JG
+    axis event's value in [-1, 1])
+
+    Args:
+        * value (float) [-1, 1]: axis value
+        * resolution (int, optional): number of steps the controller axis has.
+          Defaults to HID_AXIS_RESOLUTION.
+    """
+    step = int((value + 1.0) * (resolution * 0.5) + 0.5)
+    if step < 0:
+        return 0
+    if step > resolution:
+        return resolution
+    return step
+
+
+def dequantize_hid_axis(step: int, resolution: int = HID_AXIS_RESOLUTION) -> float:
+    """returns the axis value [-1, 1] of a controller axis step"""
+    return step / (resolution * 0.5) - 1.0
+
+
+def quantize_vjoy_axis(value: float) -> int:
+    """
+    returns the integer vjoy ends up with when an axis gets set to value, using
+    the same clamp and math as VjoyAxis.set_val() and JG
+    """
+    value = utils.clamp(value, -1.0, 1.0)
+    return int(_VJOY_AXIS_HALF_RANGE + _VJOY_AXIS_HALF_RANGE * value)
 
 
 def _get_vjoy_proxy():
@@ -46,43 +96,599 @@ def _get_vjoy_axis(axis_id: int, device_id: int):
     return proxy[device_id].axis(axis_id)
 
 
+class VjoyRegistryStats:
+    def __init__(self) -> None:
+        """
+        keeps track of how much work the registry saved.
+
+        * a resolve is when a handle had to be fetched from JG
+        * a hit is when an already resolved handle got handed out again
+        """
+
+        self.num_resolved = 0
+        self.num_hits = 0
+        self.resolve_time_s = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"VjoyRegistryStats(resolved: {self.num_resolved}, "
+            f"hits: {self.num_hits}, "
+            f"resolve time: {self.resolve_time_s * 1000:.3f} ms)"
+        )
+
+    def reset(self) -> None:
+        self.__init__()
+
+
+class VjoyOutput:
+    __slots__ = (
+        "handle",
+        "val",
+        "committed",
+        "lo",
+        "hi",
+        "num_committed",
+        "num_suppressed",
+        "seq",
+    )
+
+    def __init__(self, handle) -> None:
+        """
+        a vjoy axis/button's JG handle, plus the state every wrapper for that
+        output shares, so redundant writes get caught no matter which wrapper
+        they come from.
+
+        * committed is the last state actually written to a vjoy button, or
+          None if nothing's been written yet
+        * for an axis, [lo, hi) is the vjoy integer it last committed, as the
+          range of `half_range + half_range * value` that int() truncates to
+          it. so redundant writes get caught with float math alone, and never
+          make an int
+        * val is the last float an axis got set to, even if the write got
+          suppressed (None if unknown)
+        * seq is the write sequence number of the latest write that reached
+          the output, so a frame can tell if its buffered write is stale. NOTE
+          only kept up to date while a frame is active somewhere, since that's
+          the only time it gets checked
+        """
+
+        self.handle = handle
+        self.num_committed = 0
+        self.num_suppressed = 0
+        self.seq = 0
+        self.forget()
+
+    def forget(self) -> None:
+        """forgets what was last committed, so the next write goes through"""
+        self.val = None
+        self.committed = None
+        # an empty range, that no vjoy integer equals either
+        self.lo = -1.0
+        self.hi = -1.0
+
+
+class VjoyRegistry:
+    def __init__(self) -> None:
+        """
+        resolves each vjoy axis/button handle from JG once, and hands out the
+        same handle to everything that asks for it after that.
+
+        NOTE JG's handles for a particular device and index all point to the
+        same underlying object anyway (see the note in _get_vjoy_proxy()), so
+        sharing them doesn't change anything except skipping the lookups
+        """
+
+        self._axes = {}
+        self._buttons = {}
+        # NOTE handles usually get resolved while a plugin loads, but macros
+        # and such can make buttons from other threads
+        self._lock = threading.Lock()
+
+        self.stats = VjoyRegistryStats()
+
+    def _get(self, outputs: dict, resolve_fn, id: int, device_id: int) -> VjoyOutput:
+        key = (device_id, id)
+        output = outputs.get(key)
+        if output is not None:
+            self.stats.num_hits += 1
+            return output
+
+        with self._lock:
+            # another thread might've resolved it while waiting on the lock
+            output = outputs.get(key)
+            if output is None:
+                t1 = time.perf_counter()
+                output = VjoyOutput(resolve_fn(id, device_id))
+                self.stats.resolve_time_s += time.perf_counter() - t1
+                self.stats.num_resolved += 1
+                outputs[key] = output
+        return output
+
+    def get_axis_output(self, axis_id: int, device_id: int) -> VjoyOutput:
+        """returns a vjoy axis's shared output, resolving it the first time"""
+        return self._get(self._axes, _get_vjoy_axis, axis_id, device_id)
+
+    def get_button_output(self, button_id: int, device_id: int) -> VjoyOutput:
+        """returns a vjoy button's shared output, resolving it the first time"""
+        return self._get(self._buttons, _get_vjoy_button, button_id, device_id)
+
+    def get_axis(self, axis_id: int, device_id: int):
+        """returns JG's handle for a vjoy axis, resolving it the first time"""
+        return self.get_axis_output(axis_id, device_id).handle
+
+    def get_button(self, button_id: int, device_id: int):
+        """returns JG's handle for a vjoy button, resolving it the first time"""
+        return self.get_button_output(button_id, device_id).handle
+
+    def preresolve(self, axes=(), buttons=()) -> None:
+        """
+        resolves a bunch of handles up front, like when a plugin loads, so
+        nothing has to get resolved later on
+
+        Args:
+            * axes (List[Tuple[int, int]], optional): (axis_id, device_id) of
+              each vjoy axis
+            * buttons (List[Tuple[int, int]], optional): (button_id, device_id)
+              of each vjoy button
+
+        Examples:
+
+        get_vjoy_registry().preresolve(axes=[(1, 1), (2, 1)], buttons=[(5, 1)])
+        """
+
+        for axis_id, device_id in axes:
+            self.get_axis(axis_id, device_id)
+        for button_id, device_id in buttons:
+            self.get_button(button_id, device_id)
+
+    def get_num_handles(self) -> int:
+        return len(self._axes) + len(self._buttons)
+
+    def get_write_counts(self):
+        """
+        returns (num committed, num suppressed) writes, summed over every axis
+        and button
+        """
+        outputs = list(self._axes.values()) + list(self._buttons.values())
+        return (
+            sum(o.num_committed for o in outputs),
+            sum(o.num_suppressed for o in outputs),
+        )
+
+    def forget_committed(self) -> None:
+        """
+        forgets what every output last committed, so the next write to each one
+        always goes through. handy after something wrote to vjoy behind JGE's
+        back (like `vjoy[1].button(5).is_pressed = False` in a plugin)
+        """
+        for output in list(self._axes.values()) + list(self._buttons.values()):
+            output.forget()
+
+    def clear(self) -> None:
+        """forgets every handle, so they all get resolved again"""
+        with self._lock:
+            self._axes.clear()
+            self._buttons.clear()
+
+
+_vjoy_registry = VjoyRegistry()
+
+
+def get_vjoy_registry() -> VjoyRegistry:
+    """returns the vjoy handle registry shared by all of JGE"""
+    return _vjoy_registry
+
+
+# how many threads are inside a vjoy_frame() right now. writes only have to look
+# up their thread's frame when this isn't 0, which keeps them cheap otherwise
+_num_active_frames = 0
+_frames_lock = threading.Lock()
+_frame_local = threading.local()
+# every write made while a frame is active (buffered or not) gets the next
+# number, so the order of writes from different threads is known
+_write_seqs = itertools.count(1)
+# frames commit one at a time, so checking if a buffered write is stale and
+# writing it can't interleave with another frame's commit
+_commit_lock = threading.Lock()
+
+
+def _get_frame():
+    """returns the frame this thread is in, or None"""
+    return getattr(_frame_local, "frame", None)
+
+
+def _next_write_seq() -> int:
+    """returns the sequence number for a write that isn't getting buffered"""
+    # NOTE a frame that's committing writes with the number it buffered with
+    seq = getattr(_frame_local, "commit_seq", None)
+    return next(_write_seqs) if seq is None else seq
+
+
+def _get_pending(output: VjoyOutput):
+    """returns the value buffered for output in this thread's frame, or None"""
+    frame = _get_frame()
+    if frame is None:
+        return None
+    pending = frame._pending.get(output)
+    return None if pending is None else pending[3]
+
+
+class VjoyFrame:
+    def __init__(self) -> None:
+        """
+        buffers every vjoy axis/button write made on this thread while it's
+        active, and commits them all back to back when it exits. see
+        vjoy_frame()
+        """
+
+        # output -> (write fn, val, force, read val, write sequence number)
+        self._pending = {}
+        self._is_nested = False
+
+    def __enter__(self):
+        global _num_active_frames
+
+        if _get_frame() is not None:
+            # nested frames just join the outer one, which commits everything
+            self._is_nested = True
+            return self
+
+        _frame_local.frame = self
+        with _frames_lock:
+            _num_active_frames += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        global _num_active_frames
+
+        if self._is_nested:
+            return
+
+        _frame_local.frame = None
+
+        # NOTE commit even if an exception got raised. writes would've gone out
+        # right away without a frame, so don't lose the ones made so far. this
+        # still counts as an active frame until it's done, so other threads'
+        # writes keep getting sequence numbers in the meantime
+        try:
+            self._commit()
+        finally:
+            with _frames_lock:
+                _num_active_frames -= 1
+
+    def _buffer(self, output: VjoyOutput, write_fn, val, force: bool, read_val):
+        if output in self._pending:
+            # the earlier write never reaches vjoy
+            output.num_suppressed += 1
+        seq = next(_write_seqs)
+        self._pending[output] = (write_fn, val, force, read_val, seq)
+
+    def _commit(self) -> None:
+        # writes everything buffered to vjoy. NOTE only call this once the frame
+        # isn't active anymore, else the writes just get buffered again
+
+        pending = self._pending
+        self._pending = {}
+        with _commit_lock:
+            for output, (write_fn, val, force, _, seq) in pending.items():
+                # another thread made a write to this output after ours got
+                # buffered (and it's already out), so our value is the stale one
+                if output.seq > seq:
+                    output.num_suppressed += 1
+                    continue
+                _frame_local.commit_seq = seq
+                try:
+                    write_fn(val, force)
+                finally:
+                    _frame_local.commit_seq = None
+
+
+def vjoy_frame() -> VjoyFrame:
+    """
+    returns a context that buffers vjoy axis and button writes made on this
+    thread, and commits them all at once when it exits. so when one event
+    updates several outputs, the game sees them all change together, and an
+    output written more than once only gets its last value written.
+
+    * reads (get_val(), is_pressed()) see the frame's buffered writes
+    * frames are per thread, so other threads' writes go out like normal
+    * nested frames join the outermost one
+
+    NOTE if another thread writes to an output after this frame buffered a
+    write to it, the other thread's (newer) value is kept
+
+    Examples:
+
+    with vjoy_frame():
+        sticky_buttons.release_all()
+        sticky_buttons.press(11)
+    """
+    return VjoyFrame()
+
+
 class VjoyAxis:
     def __init__(self, axis_id: int, device_id: int) -> None:
-        self.__axis = _get_vjoy_axis(axis_id, device_id)
+        """
+        a vjoy axis that skips writes that wouldn't change the integer vjoy
+        (and the game) ends up with, since noisy pots and high rate sticks
+        produce a lot of those.
+
+        NOTE what was last written is shared by every VjoyAxis for the same
+        vjoy axis, but writes made straight to JG's handle aren't tracked. pass
+        force=True (or see VjoyRegistry.forget_committed()) if you mix the two
+        """
+
+        self.__output = _vjoy_registry.get_axis_output(axis_id, device_id)
+        self.__axis = self.__output.handle
+        self.__set_absolute_value = getattr(
+            self.__axis, "set_absolute_value", self.__set_absolute_value_fallback
+        )
 
     def get_val(self) -> float:
+        if _num_active_frames:
+            pending = _get_pending(self.__output)
+            if pending is not None:
+                return pending
         return self.__axis.value
 
-    def set_val(self, val) -> None:
-        val = utils.clamp(val, -1.0, 1.0)
-        self.__axis.value = val
-
+    def set_val(self, val, force: bool = False) -> None:
         # NOTE JG clamps values that are OOB before sending them to vjoy, but it
         # will spam the system log with warnings when doing it, so clamp here
-        # before setting vjoy axis val
+        # before setting vjoy axis val. (inlined since this runs on every event)
+        if val < -1.0:
+            val = -1.0
+        elif val > 1.0:
+            val = 1.0
+
+        if _num_active_frames:
+            frame = _get_frame()
+            if frame is not None:
+                frame._buffer(self.__output, self.set_val, val, force, val)
+                return
+            # NOTE another thread's frame might be holding an older write
+            self.__output.seq = _next_write_seq()
+
+        # skip the write if vjoy would end up with the same integer. NOTE this
+        # is the same float JG truncates, so the check is exact
+        output = self.__output
+        scaled = _VJOY_AXIS_HALF_RANGE + _VJOY_AXIS_HALF_RANGE * val
+        if output.lo <= scaled < output.hi and not force:
+            output.val = val
+            output.num_suppressed += 1
+            return
+
+        # floor without making an int (scaled is never negative)
+        output.lo = scaled - scaled % 1.0
+        output.hi = output.lo + 1.0
+        output.val = val
+        output.num_committed += 1
+        self.__axis.value = val
+
+    def set_int_val(self, val: int, force: bool = False) -> None:
+        """
+        sets the axis's integer vjoy value [0, VJOY_AXIS_MAX] directly, with no
+        float math or clamping (see quantize_vjoy_axis())
+        """
+
+        if _num_active_frames:
+            frame = _get_frame()
+            if frame is not None:
+                read_val = (val + 0.5) / _VJOY_AXIS_HALF_RANGE - 1.0
+                frame._buffer(self.__output, self.set_int_val, val, force, read_val)
+                return
+            self.__output.seq = _next_write_seq()
+
+        output = self.__output
+        if val == output.lo and not force:
+            output.val = None
+            output.num_suppressed += 1
+            return
+
+        output.lo = float(val)
+        output.hi = output.lo + 1.0
+        output.val = None
+        output.num_committed += 1
+        self.__set_absolute_value(val)
+
+    def __set_absolute_value_fallback(self, val: int) -> None:
+        # NOTE in case JG's axis doesn't have set_absolute_value(). use the
+        # middle of the integer's range of floats, so rounding can't push it
+        # into the neighboring integer
+        self.__axis.value = (val + 0.5) / _VJOY_AXIS_HALF_RANGE - 1.0
 
     def inc_val(self, delta) -> None:
         """increment axis value by delta"""
 
+        # NOTE start from the last value set, even if it got suppressed, so
+        # lots of tiny increments still add up
+        val = None
+        if _num_active_frames:
+            val = _get_pending(self.__output)
+        if val is None:
+            val = self.__output.val
+        if val is None:
+            val = self.__axis.value
+
         # use set val so it clamps correctly
-        self.set_val(self.get_val() + delta)
+        self.set_val(val + delta)
+
+    def get_num_committed(self) -> int:
+        """returns how many writes to this vjoy axis actually went to vjoy"""
+        return self.__output.num_committed
+
+    def get_num_suppressed(self) -> int:
+        """returns how many writes to this vjoy axis got skipped as redundant"""
+        return self.__output.num_suppressed
+
+
+class RateLimitedAxis:
+    def __init__(self, axis: VjoyAxis, max_rate_hz: float) -> None:
+        """
+        wraps a VjoyAxis so it gets written at most max_rate_hz times a second,
+        since a 1 kHz stick writes vjoy way faster than a game samples it.
+
+        a write that comes in too soon gets held, and later writes replace it,
+        so only the most recent value is kept. a held value always gets
+        written (on the scheduler's thread) one period after the last write,
+        so the axis's final position is never lost, and never shows up more
+        than one period late.
+
+        Args:
+            * axis (VjoyAxis): vjoy axis to write to
+            * max_rate_hz (float): max number of writes per second
+
+        NOTE force=True writes go out right away, like they would without the
+        limiter
+        """
+
+        self._axis = axis
+        self._period_s = 1.0 / max_rate_hz
+
+        self._last_write_s = -math.inf
+        self._flush_task = None
+        # write fn, value and what get_val() should return for the held write
+        self._pending_fn = None
+        self._pending_val = None
+        self._pending_read_val = None
+
+        # NOTE events and flushes run on different threads. not using `with`,
+        # since it allocates on every call
+        self._lock = threading.Lock()
+
+        self.num_writes = 0
+        self.num_held = 0
+
+    def _set(self, write_fn, val, force: bool, read_val: float) -> None:
+        now = clock.now()
+        self._lock.acquire()
+        try:
+            if force or now - self._last_write_s >= self._period_s:
+                # whatever was held is older than this, so drop it
+                self._pending_fn = None
+                self._last_write_s = now
+                self.num_writes += 1
+                write_fn(val, force)
+                return
+
+            self._pending_fn = write_fn
+            self._pending_val = val
+            self._pending_read_val = read_val
+            self.num_held += 1
+            if self._flush_task is None:
+                self._flush_task = get_scheduler().call_later(
+                    self._last_write_s + self._period_s - now, self._flush
+                )
+        finally:
+            self._lock.release()
+
+    def _flush(self) -> None:
+        self._lock.acquire()
+        try:
+            self._flush_task = None
+            if self._pending_fn is None:
+                return
+
+            # NOTE if this ran late, an event might've written in the meantime,
+            # so wait out the rest of that write's period. with a little slack
+            # for rounding, else a flush that's right on time could keep
+            # rescheduling itself (on a simulated clock, forever)
+            now = clock.now()
+            wait_s = self._last_write_s + self._period_s - now
+            if wait_s > 1e-9:
+                self._flush_task = get_scheduler().call_later(wait_s, self._flush)
+                return
+
+            self._last_write_s = now
+            self.num_writes += 1
+            self._pending_fn(self._pending_val, False)
+            self._pending_fn = None
+        finally:
+            self._lock.release()
+
+    def flush(self) -> None:
+        """writes the held value (if any) right now"""
+        self._lock.acquire()
+        try:
+            if self._pending_fn is None:
+                return
+            self._last_write_s = clock.now()
+            self.num_writes += 1
+            self._pending_fn(self._pending_val, False)
+            self._pending_fn = None
+        finally:
+            self._lock.release()
+
+    def get_val(self) -> float:
+        # NOTE reads see the held value, like it had been written already
+        if self._pending_fn is not None:
+            return self._pending_read_val
+        return self._axis.get_val()
+
+    def set_val(self, val, force: bool = False) -> None:
+        self._set(self._axis.set_val, val, force, val)
+
+    def set_int_val(self, val: int, force: bool = False) -> None:
+        read_val = (val + 0.5) / _VJOY_AXIS_HALF_RANGE - 1.0
+        self._set(self._axis.set_int_val, val, force, read_val)
+
+    def inc_val(self, delta) -> None:
+        """increment axis value by delta"""
+        self.set_val(utils.clamp(self.get_val(), -1.0, 1.0) + delta)
+
+    def get_num_committed(self) -> int:
+        return self._axis.get_num_committed()
+
+    def get_num_suppressed(self) -> int:
+        return self._axis.get_num_suppressed()
 
 
 class VjoyButton:
     def __init__(self, button_id: int, device_id: int) -> None:
-        self.__button = _get_vjoy_button(button_id, device_id)
+        """
+        a vjoy button that skips writes that wouldn't change its state. see
+        VjoyAxis for the NOTE about writing to JG's handle directly
+        """
+
+        self.__output = _vjoy_registry.get_button_output(button_id, device_id)
+        self.__button = self.__output.handle
 
     def is_pressed(self) -> bool:
+        if _num_active_frames:
+            pending = _get_pending(self.__output)
+            if pending is not None:
+                return pending
         return self.__button.is_pressed
 
-    def set_pressed(self, b: bool) -> None:
+    def set_pressed(self, b: bool, force: bool = False) -> None:
+        if _num_active_frames:
+            frame = _get_frame()
+            if frame is not None:
+                frame._buffer(self.__output, self.set_pressed, b, force, b)
+                return
+            self.__output.seq = _next_write_seq()
+
+        output = self.__output
+        if b == output.committed and not force:
+            output.num_suppressed += 1
+            return
+
+        output.committed = b
+        output.num_committed += 1
         self.__button.is_pressed = b
 
-    def press(self) -> None:
-        self.set_pressed(True)
+    def press(self, force: bool = False) -> None:
+        self.set_pressed(True, force)
 
-    def release(self) -> None:
-        self.set_pressed(False)
+    def release(self, force: bool = False) -> None:
+        self.set_pressed(False, force)
+
+    def get_num_committed(self) -> int:
+        """returns how many writes to this vjoy button actually went to vjoy"""
+        return self.__output.num_committed
+
+    def get_num_suppressed(self) -> int:
+        """returns how many writes to this vjoy button got skipped as redundant"""
+        return self.__output.num_suppressed
 
 
 class KeyboardKey:
@@ -103,13 +709,173 @@ class KeyboardKey:
 
 
 if __name__ == "__main__":
+    registry = get_vjoy_registry()
+    registry.preresolve(axes=[(1, 1), (2, 1)], buttons=[(1, 1), (2, 1)])
+    assert registry.stats.num_resolved == 4
+
     axis = VjoyAxis(1, 1)
     axis.set_val(0.555)
+    # every wrapper for the same vjoy axis shares one handle, so it sees writes
+    # made through any of them
+    assert VjoyAxis(1, 1).get_val() == axis.get_val()
 
     button = VjoyButton(1, 1)
     button.press()
     button.release()
 
+    # writes that land on the same vjoy integer (or button state) get skipped,
+    # and that's shared between wrappers of the same output
+    axis.set_val(quantize_vjoy_axis(0.555) / _VJOY_AXIS_HALF_RANGE - 1.0 + 1e-5)
+    VjoyAxis(1, 1).set_val(0.555 + 1e-6)
+    assert axis.get_num_committed() == 1 and axis.get_num_suppressed() == 2
+    axis.set_val(0.555, force=True)
+    axis.set_int_val(quantize_vjoy_axis(0.555))
+    assert axis.get_num_committed() == 2 and axis.get_num_suppressed() == 3
+    VjoyButton(1, 1).release()
+    button.release(force=True)
+    assert button.get_num_committed() == 3 and button.get_num_suppressed() == 1
+
+    # tiny increments still add up, even though each one alone gets suppressed
+    axis.set_val(0.0)
+    for _ in range(100):
+        axis.inc_val(1e-5)
+    assert quantize_vjoy_axis(axis.get_val()) == quantize_vjoy_axis(1e-3)
+
     key = KeyboardKey("a")
     key.press()
     key.release()
+    assert list(gremlin.macro.key_log)[-2:] == [("a", True), ("a", False)]
+
+    assert registry.stats.num_resolved == 4
+
+    # the mock keeps what vjoy ends up with, quantized and clamped like JG does
+    mock_axis = gremlin.joystick_handling.VJoyProxy()[1].axis(1)
+    num_writes = mock_axis.num_writes
+    axis.set_val(0.555, force=True)
+    assert mock_axis.raw_value == quantize_vjoy_axis(0.555)
+    axis.set_val(2.0)
+    assert mock_axis.raw_value == quantize_vjoy_axis(1.0)
+    assert mock_axis.num_writes == num_writes + 2
+
+    # a write only goes out when vjoy's integer changes, exactly
+    import random
+
+    from jge.utils.profiling import (
+        get_counter_alloc,
+        max_sweep_alloc,
+        max_transient_alloc,
+    )
+
+    for x in [random.uniform(-1, 1) for _ in range(10_000)] + [-1.0, 1.0, 0.0]:
+        num_writes = mock_axis.num_writes
+        raw_value = mock_axis.raw_value
+        axis.set_val(x)
+        wrote = mock_axis.num_writes != num_writes
+        assert wrote == (quantize_vjoy_axis(x) != raw_value)
+        assert mock_axis.raw_value == quantize_vjoy_axis(x)
+
+    # and moving input doesn't allocate anything, besides bumping the int write
+    # counters (the axis's, and the mock's)
+    sweep = [i / 1000 - 1.0 for i in range(2001)]
+    assert max_sweep_alloc(axis.set_val, sweep) <= get_counter_alloc(2)
+    # and neither do suppressed writes
+    assert max_transient_alloc(axis.set_val, 0.3) <= get_counter_alloc(1)
+
+    # making a lot of macro buttons, like a profile full of macros does
+    from jge.utils.profiling import time_per_call
+
+    uncached = time_per_call(_get_vjoy_button, 1, 1, num_calls=10_000)
+    cached = time_per_call(VjoyButton, 1, 1, num_calls=10_000)
+    print(
+        f"handle lookup cost: {uncached * 1e9:.0f} ns vs {cached * 1e9:.0f} ns cached"
+    )
+    print(registry.stats)
+
+    # a frame buffers writes until it exits, and only the last write to each
+    # output goes out. reads see the buffered writes
+    button2 = VjoyButton(2, 1)
+    button.press()
+    num_committed = button.get_num_committed()
+    with vjoy_frame():
+        button.release()
+        button2.press()
+        button.press()
+        axis.set_val(-0.5)
+        axis.inc_val(0.25)
+        with vjoy_frame():
+            button2.release()
+        assert button.is_pressed() and not button2.is_pressed()
+        assert axis.get_val() == -0.25 and registry._axes[(1, 1)].handle.value != -0.25
+    assert button.is_pressed() and not button2.is_pressed()
+    assert button.get_num_committed() == num_committed
+    assert abs(axis.get_val() - -0.25) < 1e-12
+
+    # writes made by other threads aren't buffered, and a newer write from
+    # another thread beats an older buffered one
+    with vjoy_frame():
+        axis.set_val(0.75)
+        thread = threading.Thread(target=VjoyAxis(1, 1).set_val, args=(0.5,))
+        thread.start()
+        thread.join()
+        assert registry._axes[(1, 1)].handle.value == 0.5
+    assert axis.get_val() == 0.5
+
+    # frames on different threads buffering the same output keep the newer
+    # write, no matter which frame exits first
+    def write_in_frame(val, buffered, release):
+        with vjoy_frame():
+            VjoyAxis(1, 1).set_val(val)
+            buffered.set()
+            release.wait()
+
+    for exit_order in [(0, 1), (1, 0)]:
+        buffered = [threading.Event(), threading.Event()]
+        release = [threading.Event(), threading.Event()]
+        threads = []
+        # 0 buffers the older write, 1 the newer one
+        for i, val in enumerate([0.2, 0.7]):
+            args = (val, buffered[i], release[i])
+            threads.append(threading.Thread(target=write_in_frame, args=args))
+            threads[i].start()
+            buffered[i].wait()
+        for i in exit_order:
+            release[i].set()
+            threads[i].join()
+        assert registry._axes[(1, 1)].handle.value == 0.7, exit_order
+        axis.set_val(0)
+
+    # a noisy pot sitting still
+    noisy = [0.3 + random.uniform(-1e-5, 1e-5) for _ in range(1000)]
+    registry.forget_committed()
+    committed, suppressed = registry.get_write_counts()
+    for x in noisy:
+        axis.set_val(x)
+    num_suppressed = registry.get_write_counts()[1] - suppressed
+    print(f"noisy pot: {num_suppressed} of {len(noisy)} writes suppressed")
+    print(f"set_val() cost: {time_per_call(axis.set_val, 0.3) * 1e9:.0f} ns")
+
+    # a 1 kHz stick sweeping through a limiter that writes at most 100 times a
+    # second. the final position always makes it out, at most a period late
+    # NOTE on a simulated clock, so the counts are exact
+    limited_axis = RateLimitedAxis(VjoyAxis(2, 1), 100)
+    handle = registry._axes[(1, 2)].handle
+    num_events = 300
+    with clock.use_clock(clock.SimulatedClock()) as sim:
+        for i in range(num_events):
+            x = -0.8 + 1.6 * i / num_events
+            limited_axis.set_val(x)
+            sim.advance(0.001)
+        assert limited_axis.get_val() == x
+        sim.advance(0.01)
+    assert handle.value == x and limited_axis.get_val() == x
+    assert limited_axis.num_writes == 0.3 * 100 + 1
+    print(f"rate limited stick: {limited_axis.num_writes} of {num_events} written")
+
+    # NOTE holding a write costs more than a write to the mock, but a real
+    # vjoy write goes through JG and the vjoy driver, which costs way more. so
+    # make the mock's writes cost about what they do for real
+    gremlin.joystick_handling.set_write_latency(5e-6)
+    held = time_per_call(limited_axis.set_val, 0.1, num_calls=10_000)
+    written = time_per_call(axis.set_val, 0.1, True, num_calls=10_000)
+    gremlin.joystick_handling.set_write_latency(0.0)
+    print(f"write cost: {written * 1e9:.0f} ns vs {held * 1e9:.0f} ns held")
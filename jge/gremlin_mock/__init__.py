@@ -1,3 +1,14 @@
 from .joystick_handling import *
 from .macro import *
 from .util import *
+
+# so `gremlin.input_devices.JoystickDecorator`, etc. work like in JG
+from . import (
+    common,
+    event_handler,
+    input_devices,
+    joystick_handling,
+    macro,
+    user_plugin,
+    util,
+)
@@ -0,0 +1,12 @@
+# mirrors the parts of JG's common.py that plugins use
+
+import enum
+
+
+class InputType(enum.Enum):
+    Keyboard = 1
+    JoystickAxis = 2
+    JoystickButton = 3
+    JoystickHat = 4
+    Mouse = 5
+    VirtualButton = 6
@@ -0,0 +1,29 @@
+# mirrors JG's event_handler.Event, which is what callbacks get as `event`
+
+from .common import InputType
+
+
+class Event:
+    def __init__(
+        self,
+        event_type: InputType,
+        identifier,
+        device_guid,
+        value=None,
+        is_pressed=None,
+        raw_value=None,
+    ) -> None:
+        self.event_type = event_type
+        self.identifier = identifier
+        self.device_guid = device_guid
+        # axis events: [-1, 1] float. hat events: (x, y) direction tuple
+        self.value = value
+        # button events only
+        self.is_pressed = is_pressed
+        self.raw_value = raw_value
+
+    def __repr__(self) -> str:
+        return (
+            f"Event({self.event_type.name}, {self.identifier}, {self.device_guid}, "
+            f"value={self.value}, is_pressed={self.is_pressed})"
+        )
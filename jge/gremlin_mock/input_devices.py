@@ -0,0 +1,165 @@
+"""
+mirrors the parts of JG's input_devices.py that plugins use: JoystickDecorator
+to register callbacks, and the physical joystick proxy that gets passed in as
+`joy`.
+
+nothing calls the registered callbacks on its own. see plugin_driver.py, which
+feeds synthetic events into them.
+"""
+
+import inspect
+
+from .common import InputType
+from .joystick_handling import VJoyProxy
+
+
+def normalize_guid(guid) -> str:
+    """JG parses guids into objects, the mock just uses uppercase strings"""
+    return str(guid).upper()
+
+
+# physical devices ---------------------------------------------------------------
+
+
+class JoystickAxis:
+    def __init__(self, id: int) -> None:
+        self.id = id
+        self.value = 0.0
+
+
+class JoystickButton:
+    def __init__(self, id: int) -> None:
+        self.id = id
+        self.is_pressed = False
+
+
+class JoystickHat:
+    def __init__(self, id: int) -> None:
+        self.id = id
+        self.direction = (0, 0)
+
+
+class Joystick:
+    def __init__(self, device_guid: str) -> None:
+        self.device_guid = device_guid
+        self._axes = {}
+        self._buttons = {}
+        self._hats = {}
+
+    def axis(self, id: int) -> JoystickAxis:
+        if id not in self._axes:
+            self._axes[id] = JoystickAxis(id)
+        return self._axes[id]
+
+    def button(self, id: int) -> JoystickButton:
+        if id not in self._buttons:
+            self._buttons[id] = JoystickButton(id)
+        return self._buttons[id]
+
+    def hat(self, id: int) -> JoystickHat:
+        if id not in self._hats:
+            self._hats[id] = JoystickHat(id)
+        return self._hats[id]
+
+
+# NOTE like vjoy, every proxy shares the same devices. the driver keeps their
+# state in sync with the events it sends
+_joysticks = {}
+
+
+class JoystickProxy:
+    def __getitem__(self, device_guid) -> Joystick:
+        device_guid = normalize_guid(device_guid)
+        if device_guid not in _joysticks:
+            _joysticks[device_guid] = Joystick(device_guid)
+        return _joysticks[device_guid]
+
+
+def reset_joysticks() -> None:
+    """forgets every physical device's state"""
+    _joysticks.clear()
+
+
+# callbacks --------------------------------------------------------------------
+
+
+class Callback:
+    def __init__(self, fn, mode: str, always_execute: bool = False) -> None:
+        """
+        a registered callback, and the parameters JG would inject into it.
+
+        like JG, the event is always passed first, and `joy` and `vjoy` only get
+        passed if the callback's signature asks for them by name.
+        """
+        self.fn = fn
+        self.mode = mode
+        self.always_execute = always_execute
+
+        params = inspect.signature(fn).parameters
+        self.kwargs = {}
+        if "joy" in params:
+            self.kwargs["joy"] = JoystickProxy()
+        if "vjoy" in params:
+            self.kwargs["vjoy"] = VJoyProxy()
+
+    def __call__(self, event) -> None:
+        self.fn(event, **self.kwargs)
+
+
+class CallbackRegistry:
+    def __init__(self) -> None:
+        # (device guid, InputType, input id) -> [Callback]
+        self._callbacks = {}
+
+    def add(self, fn, device_guid, input_type, input_id, mode, always_execute):
+        key = (normalize_guid(device_guid), input_type, input_id)
+        callback = Callback(fn, mode, always_execute)
+        self._callbacks.setdefault(key, []).append(callback)
+        return callback
+
+    def get(self, device_guid: str, input_type: InputType, input_id: int):
+        """returns every callback for an input, in the order they were added"""
+        return self._callbacks.get((device_guid, input_type, input_id), [])
+
+    def get_num_callbacks(self) -> int:
+        return sum(len(callbacks) for callbacks in self._callbacks.values())
+
+    def clear(self) -> None:
+        self._callbacks.clear()
+
+
+callback_registry = CallbackRegistry()
+
+
+class JoystickDecorator:
+    def __init__(self, name: str, device_guid: str, mode: str) -> None:
+        """
+        registers callbacks for one physical device's inputs in one mode, like:
+
+        @JoystickDecorator("stick", "{...}", "Default").button(3)
+        def on_press(event, joy, vjoy): ...
+
+        NOTE unlike JG, the decorators hand back the callback as is instead of
+        wrapping it, so profiling doesn't count an extra call per event
+        """
+        self.name = name
+        self.device_guid = normalize_guid(device_guid)
+        self.mode = mode
+
+    def axis(self, axis_id: int, always_execute: bool = False):
+        return self._decorator(InputType.JoystickAxis, axis_id, always_execute)
+
+    def button(self, button_id: int, always_execute: bool = False):
+        return self._decorator(InputType.JoystickButton, button_id, always_execute)
+
+    def hat(self, hat_id: int, always_execute: bool = False):
+        return self._decorator(InputType.JoystickHat, hat_id, always_execute)
+
+    def _decorator(self, input_type: InputType, input_id: int, always_execute: bool):
+        def decorator(fn):
+            callback_registry.add(
+                fn, self.device_guid, input_type, input_id, self.mode, always_execute
+            )
+            return fn
+
+        return decorator
@@ -2,30 +2,149 @@
 these classes will mock the JG classes and get loaded automatically in
 `gremlin_interface.py` so i can run each JG extension as a standalone python
 script
+
+like the real thing, devices, axes and buttons are persistent. so anything
+written to vjoy can be read back, from any handle to the same input, and the
+mock keeps count of writes so it can stand in for vjoy when benchmarking.
 """
 
+import time
+
+# vjoy axes are 15 bit, and JG maps [-1, 1] onto them with
+# int(half_range + half_range * value)
+VJOY_AXIS_MAX = 2**15 - 1
+_HALF_RANGE = VJOY_AXIS_MAX // 2
+
+# how long each write to vjoy takes. see set_write_latency()
+_write_latency_s = 0.0
+
+
+def set_write_latency(latency_s: float) -> None:
+    """
+    makes every vjoy write take latency_s seconds, to simulate JG and the vjoy
+    driver's cost per write when benchmarking
+
+    NOTE it busy waits, since a real write keeps the CPU busy too, and sleep()
+    can't do microseconds
+    """
+    global _write_latency_s
+    _write_latency_s = latency_s
+
+
+def _simulate_write() -> None:
+    if _write_latency_s > 0.0:
+        end = time.perf_counter() + _write_latency_s
+        while time.perf_counter() < end:
+            pass
+
 
 class MockAxis:
     def __init__(self, id: int) -> None:
         self.id = id
-        self.value = 0.0
+        self._value = 0.0
+        # set by set_absolute_value(), else raw_value gets worked out from the
+        # float on read, so writing doesn't make an int
+        self._raw_value = _HALF_RANGE
+        self.num_writes = 0
+        self.num_clamped_writes = 0
+
+    @property
+    def value(self) -> float:
+        # NOTE like JG, this is the last float that got set, not what vjoy has
+        return self._value
+
+    @value.setter
+    def value(self, value: float) -> None:
+        # JG clamps out of bounds values (and logs a warning)
+        if value < -1.0 or value > 1.0:
+            self.num_clamped_writes += 1
+            value = max(-1.0, min(1.0, value))
+        _simulate_write()
+        self._value = value
+        self._raw_value = None
+        self.num_writes += 1
+
+    @property
+    def raw_value(self) -> int:
+        """what vjoy (and the game) actually has"""
+        if self._raw_value is None:
+            return int(_HALF_RANGE + _HALF_RANGE * self._value)
+        return self._raw_value
+
+    def set_absolute_value(self, value: int) -> None:
+        # vjoy's integer range is [0, 32767]
+        if not 0 <= value <= VJOY_AXIS_MAX:
+            raise ValueError(f"vjoy axis value out of range: {value}")
+        _simulate_write()
+        self._value = value / _HALF_RANGE - 1.0
+        self._raw_value = value
+        self.num_writes += 1
 
 
 class MockButton:
     def __init__(self, id: int) -> None:
         self.id = id
-        self.is_pressed = False
+        self._is_pressed = False
+        self.num_writes = 0
+
+    @property
+    def is_pressed(self) -> bool:
+        return self._is_pressed
+
+    @is_pressed.setter
+    def is_pressed(self, is_pressed: bool) -> None:
+        _simulate_write()
+        self._is_pressed = is_pressed
+        self.num_writes += 1
+
+
+class MockHat:
+    def __init__(self, id: int) -> None:
+        self.id = id
+        self._direction = (0, 0)
+        self.num_writes = 0
+
+    @property
+    def direction(self):
+        return self._direction
+
+    @direction.setter
+    def direction(self, direction) -> None:
+        _simulate_write()
+        self._direction = direction
+        self.num_writes += 1
 
 
 class MockDevice:
     def __init__(self, id) -> None:
         self.id = id
+        self._axes = {}
+        self._buttons = {}
+        self._hats = {}
 
     def button(self, id) -> MockButton:
-        return MockButton(id)
+        if id not in self._buttons:
+            self._buttons[id] = MockButton(id)
+        return self._buttons[id]
 
-    def axis(self, id) -> MockButton:
-        return MockAxis(id)
+    def axis(self, id) -> MockAxis:
+        if id not in self._axes:
+            self._axes[id] = MockAxis(id)
+        return self._axes[id]
+
+    def hat(self, id) -> MockHat:
+        if id not in self._hats:
+            self._hats[id] = MockHat(id)
+        return self._hats[id]
+
+    def get_num_writes(self) -> int:
+        """returns how many writes were made to all of this device's inputs"""
+        inputs = [*self._axes.values(), *self._buttons.values(), *self._hats.values()]
+        return sum(i.num_writes for i in inputs)
+
+
+# NOTE like JG's VJoyProxy, every proxy shares the same devices
+_devices = {}
 
 
 class MockProxy:
@@ -33,8 +152,15 @@ class MockProxy:
         pass
 
     def __getitem__(self, id) -> MockDevice:
-        return MockDevice(id)
+        if id not in _devices:
+            _devices[id] = MockDevice(id)
+        return _devices[id]
 
 
 def VJoyProxy():
     return MockProxy()
+
+
+def reset_vjoy() -> None:
+    """forgets every mock vjoy device (and so every value and write count)"""
+    _devices.clear()
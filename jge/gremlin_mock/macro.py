@@ -1,16 +1,26 @@
 # these functions mirror the ones found in the JG repo's macro.py (at the time
 # of 13.3 release)
 
+import collections
+
+# the latest key events sent, in order, as (key, is_pressed). handy for checking
+# what a macro did, without printing everything. NOTE capped, so long benchmark
+# and driver runs don't keep growing it
+KEY_LOG_SIZE = 1000
+key_log = collections.deque(maxlen=KEY_LOG_SIZE)
+
+
+def clear_key_log():
+    key_log.clear()
+
 
 def key_from_name(name):
     return name
 
 
 def _send_key_down(key):
-    # pass
-    print(f'Key "{key}" down')
+    key_log.append((key, True))
 
 
 def _send_key_up(key):
-    # pass
-    print(f'Key "{key}" up')
+    key_log.append((key, False))
@@ -0,0 +1,179 @@
+"""
+loads JG user plugins outside of JG, and feeds synthetic events straight into
+their registered callbacks. handy for profiling a whole plugin on any OS:
+
+    driver = PluginDriver()
+    plugin = driver.load("Plugins.helo_trim")
+    driver.axis(plugin.stick, 1, 0.5)
+    driver.button(plugin.stick, 18, True)
+
+NOTE run it from the folder that holds Plugins and jge, so the plugins'
+imports resolve like they do in JG
+"""
+
+import importlib
+import sys
+import time
+
+from .common import InputType
+from .event_handler import Event
+from .input_devices import JoystickProxy, callback_registry, normalize_guid
+from .macro import clear_key_log
+
+# the gremlin modules plugins import, and the mock module standing in for each
+_GREMLIN_SUBMODULES = [
+    "common",
+    "event_handler",
+    "input_devices",
+    "joystick_handling",
+    "macro",
+    "user_plugin",
+    "util",
+]
+
+
+def install_gremlin_mock() -> None:
+    """
+    makes `import gremlin` (and `from gremlin.user_plugin import *`, etc.)
+    load the mock. does nothing if the real gremlin is already loaded.
+
+    NOTE every submodule gets aliased too, else python would import a second
+    copy of it under the gremlin name, with its own callback registry
+    """
+    if "gremlin" in sys.modules:
+        return
+
+    import jge.gremlin_mock as gremlin_mock
+
+    sys.modules["gremlin"] = gremlin_mock
+    for name in _GREMLIN_SUBMODULES:
+        sys.modules[f"gremlin.{name}"] = getattr(gremlin_mock, name)
+
+
+def _get_device_guid(device) -> str:
+    # takes a JoystickDecorator, a PhysicalInputVariable or a guid
+    return normalize_guid(getattr(device, "device_guid", device))
+
+
+class PluginDriver:
+    def __init__(self, mode: str = "Default") -> None:
+        """
+        Args:
+            * mode (str, optional): JG mode that's active, so only callbacks
+              registered for it (or with always_execute) get called. Defaults
+              to "Default".
+        """
+        install_gremlin_mock()
+        self.mode = mode
+        self._joy = JoystickProxy()
+
+        self.num_events = 0
+        self.num_calls = 0
+        self.callback_time_s = 0.0
+
+    def load(self, module_name: str):
+        """imports a plugin, like "Plugins.helo_trim", and returns its module"""
+        return importlib.import_module(module_name)
+
+    def axis(self, device, axis_id: int, value: float) -> None:
+        """moves a physical axis to value, in [-1, 1]"""
+        device_guid = _get_device_guid(device)
+        self._joy[device_guid].axis(axis_id).value = value
+        event = Event(InputType.JoystickAxis, axis_id, device_guid, value=value)
+        self._dispatch(event)
+
+    def button(self, device, button_id: int, is_pressed: bool) -> None:
+        """presses or releases a physical button"""
+        device_guid = _get_device_guid(device)
+        self._joy[device_guid].button(button_id).is_pressed = is_pressed
+        event = Event(
+            InputType.JoystickButton, button_id, device_guid, is_pressed=is_pressed
+        )
+        self._dispatch(event)
+
+    def click(self, device, button_id: int) -> None:
+        """presses and releases a physical button"""
+        self.button(device, button_id, True)
+        self.button(device, button_id, False)
+
+    def hat(self, device, hat_id: int, direction) -> None:
+        """points a physical hat in direction, an (x, y) tuple like (0, 1)"""
+        device_guid = _get_device_guid(device)
+        self._joy[device_guid].hat(hat_id).direction = direction
+        event = Event(InputType.JoystickHat, hat_id, device_guid, value=direction)
+        self._dispatch(event)
+
+    def _dispatch(self, event: Event) -> None:
+        self.num_events += 1
+        callbacks = callback_registry.get(
+            event.device_guid, event.event_type, event.identifier
+        )
+        start = time.perf_counter()
+        for callback in callbacks:
+            if callback.mode == self.mode or callback.always_execute:
+                callback(event)
+                self.num_calls += 1
+        self.callback_time_s += time.perf_counter() - start
+
+    def get_time_per_call(self) -> float:
+        """returns the average time each callback took, in seconds"""
+        return self.callback_time_s / max(self.num_calls, 1)
+
+    def reset_stats(self) -> None:
+        """resets the stats (and the mock's key log) between runs"""
+        self.num_events = 0
+        self.num_calls = 0
+        self.callback_time_s = 0.0
+        clear_key_log()
+
+
+if __name__ == "__main__":
+    import math
+
+    driver = PluginDriver()
+    plugin = driver.load("Plugins.helo_trim")
+
+    import gremlin
+
+    assert gremlin.input_devices is sys.modules["gremlin.input_devices"]
+    assert callback_registry.get_num_callbacks() >= 8
+
+    stick, pedals = plugin.stick, plugin.pedals
+    vjoy = gremlin.joystick_handling.VJoyProxy()
+
+    # axis events reach vjoy through the plugin's callbacks
+    driver.axis(stick, 1, 0.5)
+    driver.axis(pedals, 6, -0.25)
+    assert driver.num_events == 2 and driver.num_calls == 2
+    assert abs(vjoy[1].axis(1).value - 0.5) < 1e-3
+    assert abs(vjoy[1].axis(3).value + 0.25) < 1e-3
+
+    # `event` and `joy` get injected. trimming right with the paddle pulled
+    # doesn't care about the paddle, but trimming aft does
+    driver.click(stick, 10)
+    assert abs(plugin.x_axis._trim_offset - 0.1) < 1e-9
+    driver.button(stick, 19, True)
+    driver.click(stick, 11)
+    driver.button(stick, 19, False)
+    assert plugin.y_axis._trim_offset == 0.0
+
+    # other modes' callbacks don't run
+    driver.mode = "Other"
+    num_calls = driver.num_calls
+    driver.axis(stick, 1, 0.0)
+    assert driver.num_calls == num_calls
+    driver.mode = "Default"
+
+    # profile the axis callbacks with a 1 second sweep at 1kHz
+    gremlin.macro._send_key_down("a")
+    driver.reset_stats()
+    assert not gremlin.macro.key_log
+    for i in range(1000):
+        t = i / 1000
+        driver.axis(stick, 1, math.sin(2 * math.pi * t))
+        driver.axis(stick, 2, math.cos(2 * math.pi * t))
+        driver.axis(pedals, 6, 0.5 * math.sin(4 * math.pi * t))
+    assert driver.num_calls == 3000
+
+    print(f"helo_trim: {driver.num_calls} axis callbacks")
+    print(f"  per callback: {driver.get_time_per_call() * 1e6:.2f} µs")
@@ -0,0 +1,124 @@
+"""
+mirrors the variables in JG's user_plugin.py. in JG, their values come from the
+profile's UI. in the mock they're each variable's initial_value, unless a value
+got set with set_variable_value() before the plugin was loaded.
+"""
+
+from .common import InputType
+from .input_devices import JoystickDecorator, normalize_guid
+
+# label -> value, for variables made after it's set
+_variable_values = {}
+
+
+def set_variable_value(label: str, value) -> None:
+    """
+    sets what a variable will hold, like filling it in in JG's UI.
+
+    NOTE physical inputs take a dict like JG saves:
+    {"device_id": guid, "input_id": int, "input_type": InputType}
+    """
+    _variable_values[label] = value
+
+
+def reset_variable_values() -> None:
+    _variable_values.clear()
+
+
+class AbstractVariable:
+    def __init__(self, label: str, description: str, is_optional: bool = False):
+        self.label = label
+        self.description = description
+        self.is_optional = is_optional
+        self._value = None
+
+    @property
+    def value(self):
+        return self._value
+
+
+class _NumericVariable(AbstractVariable):
+    def __init__(
+        self,
+        label: str,
+        description: str,
+        initial_value=None,
+        min_value=None,
+        max_value=None,
+        is_optional: bool = False,
+    ) -> None:
+        super().__init__(label, description, is_optional)
+        self.min_value = min_value
+        self.max_value = max_value
+        self._value = _variable_values.get(label, initial_value)
+
+
+class IntegerVariable(_NumericVariable):
+    pass
+
+
+class FloatVariable(_NumericVariable):
+    pass
+
+
+class BoolVariable(AbstractVariable):
+    def __init__(
+        self,
+        label: str,
+        description: str,
+        initial_value: bool = False,
+        is_optional: bool = False,
+    ) -> None:
+        super().__init__(label, description, is_optional)
+        self._value = _variable_values.get(label, initial_value)
+
+
+class ModeVariable(AbstractVariable):
+    def __init__(self, label: str, description: str, is_optional: bool = False):
+        super().__init__(label, description, is_optional)
+        self._value = _variable_values.get(label, "Default")
+
+
+# unset physical inputs each get their own input on this made up device, so
+# their callbacks don't trample each other
+UNSET_DEVICE_GUID = "{00000000-0000-0000-0000-000000000000}"
+_num_unset_inputs = 0
+
+
+class PhysicalInputVariable(AbstractVariable):
+    def __init__(
+        self,
+        label: str,
+        description: str,
+        valid_types=None,
+        is_optional: bool = False,
+    ) -> None:
+        super().__init__(label, description, is_optional)
+        self.valid_types = valid_types
+
+        value = _variable_values.get(label)
+        if value is None:
+            global _num_unset_inputs
+            _num_unset_inputs += 1
+            input_type = valid_types[0] if valid_types else InputType.JoystickButton
+            value = {
+                "device_id": UNSET_DEVICE_GUID,
+                "input_id": _num_unset_inputs,
+                "input_type": input_type,
+            }
+        self._value = dict(value, device_id=normalize_guid(value["device_id"]))
+
+    @property
+    def device_guid(self) -> str:
+        return self._value["device_id"]
+
+    @property
+    def input_id(self) -> int:
+        return self._value["input_id"]
+
+    @property
+    def input_type(self) -> InputType:
+        return self._value["input_type"]
+
+    def create_decorator(self, mode_name: str) -> JoystickDecorator:
+        return JoystickDecorator(self.label, self.device_guid, mode_name)
@@ -1,9 +1,7 @@
-import time
-
 import dearpygui.dearpygui as dpg
 import pyperclip
 
-from jge.utils import utils
+from jge.utils import clock, utils
 from jge.utils.vec2 import Vec2
 from jge.axes.tuned_axis import AxisTuning, TunedAxis
 from jge.axes.trimmed_axis import Scaling, TrimmedAxis
@@ -297,13 +295,13 @@ class App:
         # update all data series
 
         self.response["default"].update_ys(
-            [trimmed_axis.calc_output(x, Scaling.Nil) for x in self.xs]
+            trimmed_axis.calc_output_many(self.xs, Scaling.Nil).tolist()
         )
         self.response["static"].update_ys(
-            [trimmed_axis.calc_output(x, Scaling.Static) for x in self.xs]
+            trimmed_axis.calc_output_many(self.xs, Scaling.Static).tolist()
         )
         self.response["dynamic"].update_ys(
-            [trimmed_axis.calc_output(x, Scaling.Dynamic) for x in self.xs]
+            trimmed_axis.calc_output_many(self.xs, Scaling.Dynamic).tolist()
         )
 
         self.sensitivity["default"].update_ys(
@@ -317,13 +315,13 @@ class App:
         )
 
         self.scaling["default"].update_ys(
-            [trimmed_axis._get_scaling_coef(x, Scaling.Nil) for x in self.xs]
+            trimmed_axis._get_scaling_coef_many(self.xs, Scaling.Nil).tolist()
         )
         self.scaling["static"].update_ys(
-            [trimmed_axis._get_scaling_coef(x, Scaling.Static) for x in self.xs]
+            trimmed_axis._get_scaling_coef_many(self.xs, Scaling.Static).tolist()
         )
         self.scaling["dynamic"].update_ys(
-            [trimmed_axis._get_scaling_coef(x, Scaling.Dynamic) for x in self.xs]
+            trimmed_axis._get_scaling_coef_many(self.xs, Scaling.Dynamic).tolist()
         )
 
     def copy_to_clipboard(self):
@@ -357,13 +355,13 @@ class App:
         ]
 
         for easing, interval in zip(easing_generators, intervals):
-            time.sleep(0.5)
+            clock.sleep(0.5)
             for _ in range(easing.get_num_steps()):
                 norm_val = easing.get_output()
                 val = utils.lerp(0, interval[0], 1, interval[1], norm_val)
                 dpg.set_value(tag, val)
                 self.update()
-                time.sleep(easing.get_sleep_time())
+                clock.sleep(easing.get_sleep_time())
 
         dpg.configure_app(wait_for_input=True)
 
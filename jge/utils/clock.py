@@ -0,0 +1,135 @@
+"""
+the clock all of JGE tells time with. it's the real monotonic clock by default,
+but it can be swapped for a SimulatedClock, which only moves when told to. then
+anything timed (macros, tempos, relative axes, trim animations, rate limits,
+smoothing, etc.) can be tested instantly and deterministically:
+
+    with use_clock(SimulatedClock()) as sim:
+        macro.press()
+        sim.advance(2.0)  # runs every scheduler task due in the next 2s, now
+"""
+
+import contextlib
+import time
+
+
+class Clock:
+    """the real clock. time is in seconds, from an arbitrary starting point"""
+
+    is_simulated = False
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def sleep(self, time_s: float) -> None:
+        time.sleep(time_s)
+
+
+class SimulatedClock(Clock):
+    is_simulated = True
+
+    def __init__(self, start_s: float = 0.0) -> None:
+        """
+        a clock that stands still until advance() (or sleep()) moves it.
+
+        NOTE while it's in use the scheduler's thread stays idle, and tasks run
+        on whichever thread calls advance() instead, in due time order, with
+        the clock set to each task's due time as it runs
+        """
+        self._now_s = start_s
+
+    def now(self) -> float:
+        return self._now_s
+
+    def sleep(self, time_s: float) -> None:
+        self.advance(time_s)
+
+    def advance(self, time_s: float) -> None:
+        """moves time forward, running every scheduler task due along the way"""
+
+        from jge.utils.scheduler import get_scheduler
+
+        end_s = self._now_s + time_s
+        scheduler = get_scheduler()
+        while True:
+            due_s = scheduler.get_next_due_time()
+            if due_s is None or due_s > end_s:
+                break
+            self._now_s = max(self._now_s, due_s)
+            scheduler.run_due_tasks()
+        self._now_s = end_s
+
+
+_clock = Clock()
+
+
+def get_clock() -> Clock:
+    """returns the clock shared by all of JGE"""
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """
+    swaps the clock shared by all of JGE, and returns the old one. tasks already
+    scheduled keep how long they had left to wait.
+    """
+    from jge.utils.scheduler import get_scheduler
+
+    def swap_clock():
+        global _clock
+        _clock = clock
+
+    old_clock = _clock
+    get_scheduler().rebase(old_clock.now(), clock.now(), swap_clock)
+    return old_clock
+
+
+@contextlib.contextmanager
+def use_clock(clock: Clock):
+    """uses clock for the duration of a with block, then puts the old one back"""
+    old_clock = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(old_clock)
+
+
+def now() -> float:
+    """returns the current time in seconds, from the shared clock"""
+    return _clock.now()
+
+
+def sleep(time_s: float) -> None:
+    """sleeps for time_s seconds on the shared clock"""
+    _clock.sleep(time_s)
+
+
+if __name__ == "__main__":
+    # NOTE use the imported module, not this __main__ copy of it, since that's
+    # the one the scheduler reads
+    from jge.utils.clock import SimulatedClock, now, sleep, use_clock
+    from jge.utils.scheduler import get_scheduler
+
+    scheduler = get_scheduler()
+    calls = []
+
+    # 10 simulated seconds of work run instantly, and in order
+    t1 = time.perf_counter()
+    with use_clock(SimulatedClock()) as sim:
+        scheduler.call_later(5.0, lambda: calls.append(("later", now())))
+        scheduler.call_every(1.0, lambda: calls.append(("tick", now())), num_calls=3)
+        sim.advance(2.5)
+        assert calls == [("tick", 1.0), ("tick", 2.0)]
+        sleep(7.5)
+        assert now() == 10.0
+    assert time.perf_counter() - t1 < 0.5
+    assert calls == [("tick", 1.0), ("tick", 2.0), ("tick", 3.0), ("later", 5.0)]
+
+    # tasks scheduled on a simulated clock keep their remaining delay on the
+    # real one
+    with use_clock(SimulatedClock()) as sim:
+        scheduler.call_later(0.05, calls.append, "real")
+        sim.advance(0.04)
+    assert "real" not in calls
+    time.sleep(0.1)
+    assert calls[-1] == "real"
@@ -0,0 +1,205 @@
+import functools
+import inspect
+import threading
+
+from jge.utils import clock
+
+
+class CoalescedCallback:
+    def __init__(self, fn) -> None:
+        """
+        wraps a plugin's axis callback so it only ever processes an input's
+        latest value.
+
+        when nothing's running, calling this just runs the callback right
+        there, on the caller's thread. but events that show up while the
+        callback is already running (from another thread, or from the callback
+        itself) get dropped into a mailbox instead, replacing whatever was
+        there, and whoever's running the callback runs it again on whatever's
+        in the mailbox once it's done. so the whole TrimmedAxis/smoothing chain
+        only runs on the newest event instead of every stale one in between.
+
+        Args:
+            * fn (function): JG axis callback to wrap. any args JG passes (like
+              `joy` or `vjoy`) get passed along with the event. if it has a
+              `sample_time_s` parameter, that gets the clock time the event
+              showed up at
+
+        NOTE stateful stages that care about time between samples should
+        measure it instead of counting samples, like ExponentialSmoothing with
+        a sample_period_s. and since a mailboxed event runs late, they should
+        measure it from sample_time_s
+
+        Examples:
+
+        @stick.axis(1)
+        @CoalescedCallback
+        def roll_moved(event, sample_time_s=None):
+            x = smoothing(event.value, time_s=sample_time_s)
+            x_axis.set_vjoy(x, Scaling.Dynamic)
+        """
+
+        self._fn = fn
+        # JG looks at a callback's parameters to decide what to pass it, so
+        # look like the wrapped callback
+        functools.update_wrapper(self, fn)
+        self._wants_sample_time = "sample_time_s" in inspect.signature(fn).parameters
+
+        self._args = None
+        self._kwargs = None
+        self._has_pending = False
+        self._is_running = False
+        self._lock = threading.Lock()
+
+        self.num_received = 0
+        self.num_dropped = 0
+
+    def __call__(self, *args, **kwargs) -> None:
+        if self._wants_sample_time:
+            kwargs["sample_time_s"] = clock.now()
+
+        self._lock.acquire()
+        try:
+            self.num_received += 1
+            if self._is_running:
+                # whoever's running the callback picks this up once it's done
+                if self._has_pending:
+                    # the callback never got to see the last one
+                    self.num_dropped += 1
+                self._args = args
+                self._kwargs = kwargs
+                self._has_pending = True
+                return
+            self._is_running = True
+        finally:
+            self._lock.release()
+
+        self._run(args, kwargs)
+
+    def _run(self, args, kwargs) -> None:
+        # runs the callback, then again on whatever showed up in the meantime,
+        # until the mailbox is empty
+        while True:
+            try:
+                self._fn(*args, **kwargs)
+            except BaseException:
+                # NOTE don't leave it running forever, and the mailboxed event
+                # goes with the one that failed
+                self._lock.acquire()
+                try:
+                    if self._has_pending:
+                        self.num_dropped += 1
+                    self._clear_pending()
+                    self._is_running = False
+                finally:
+                    self._lock.release()
+                raise
+
+            self._lock.acquire()
+            try:
+                if not self._has_pending:
+                    self._is_running = False
+                    return
+                args = self._args
+                kwargs = self._kwargs
+                self._clear_pending()
+            finally:
+                self._lock.release()
+
+    def _clear_pending(self) -> None:
+        # NOTE hold self._lock while calling this
+        self._args = None
+        self._kwargs = None
+        self._has_pending = False
+
+    def get_num_processed(self) -> int:
+        self._lock.acquire()
+        try:
+            return self.num_received - self.num_dropped - self._has_pending
+        finally:
+            self._lock.release()
+
+
+if __name__ == "__main__":
+    import time
+
+    from jge.utils.clock import SimulatedClock, use_clock
+    from jge.utils.scheduler import get_scheduler
+    from jge.utils.smoothing import ExponentialSmoothing
+
+    class Event:
+        def __init__(self, value: float) -> None:
+            self.value = value
+
+    smoothing = ExponentialSmoothing(0.05, sample_period_s=0.001)
+    processed = []
+    sample_times = []
+    # lets the test hold the callback up, like a slow callback would
+    running = threading.Event()
+    resume = threading.Event()
+    resume.set()
+
+    def axis_moved(event, joy, sample_time_s=None):
+        running.set()
+        resume.wait()
+        processed.append(event.value)
+        sample_times.append(sample_time_s)
+        smoothing(event.value, time_s=sample_time_s)
+
+    callback = CoalescedCallback(axis_moved)
+    assert list(inspect.signature(callback).parameters) == [
+        "event",
+        "joy",
+        "sample_time_s",
+    ]
+
+    # NOTE on a simulated clock, so the sample times are exact
+    sim = SimulatedClock()
+    with use_clock(sim):
+        # with nothing running, events get processed right away, on the
+        # caller's thread
+        callback(Event(0.5), joy=None)
+        assert processed == [0.5] and callback.get_num_processed() == 1
+
+        # a backlog of events showing up while the callback is running only
+        # gets processed once, and it's the newest
+        resume.clear()
+        running.clear()
+        thread = threading.Thread(
+            target=callback, args=(Event(0.0),), kwargs={"joy": None}
+        )
+        thread.start()
+        running.wait()
+        sim.advance(0.01)
+        for i in range(1000):
+            callback(Event(i / 1000), joy=None)
+        # the newest one runs late, but still knows when it showed up
+        sim.advance(0.04)
+        resume.set()
+        thread.join()
+        assert processed == [0.5, 0.0, 0.999], processed
+        assert sample_times[-1] == 0.01
+        assert callback.num_received == 1002
+        assert callback.get_num_processed() == 3
+        assert callback.num_dropped == 999
+        print(f"backlog: {callback.num_dropped} of 1000 stale events dropped")
+
+        # events spread out in time all get processed, and smoothing still gets
+        # the right amount of time between samples either way, so it settles
+        # just like it would've with no events dropped
+        for i in range(5):
+            callback(Event(1.0), joy=None)
+            sim.advance(0.02)
+        assert callback.num_dropped == 999
+        sim.advance(0.2)
+        callback(Event(1.0), joy=None)
+        assert smoothing.get_val() > 0.99
+
+    # a slow callback runs on the caller's thread, so it doesn't hold up the
+    # scheduler's thread (trims, macros, etc.)
+    ran_at = []
+    slow_callback = CoalescedCallback(lambda event: time.sleep(0.1))
+    start = time.perf_counter()
+    get_scheduler().call_later(0.01, lambda: ran_at.append(time.perf_counter()))
+    slow_callback(Event(0.5))
+    assert ran_at and ran_at[0] - start < 0.1
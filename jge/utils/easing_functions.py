@@ -114,6 +114,25 @@ class EasingGenerator:
         c.reset()
         return c
 
+    def is_same_as(self, other) -> bool:
+        """
+        returns if other steps along the same easing at the same rate, so both
+        would generate the same values. where either one is in its loop
+        doesn't matter, and neither does magnitude, since set_magnitude()
+        changes it anyways. (constant time ones still have to take the same
+        number of steps)
+        """
+
+        if self._easing_fn != other._easing_fn:
+            return False
+        if self._sleep_time_s != other._sleep_time_s:
+            return False
+        rate = getattr(self, "_rate", None)
+        if rate != getattr(other, "_rate", None):
+            return False
+        # NOTE a constant rate one's steps follow from its magnitude
+        return rate is not None or self._num_steps == other._num_steps
+
     @staticmethod
     def ConstantTime(
         easing_fn, time_s: float, frequency_hz: float, magnitude: float = 1.0
@@ -227,24 +246,27 @@ class EasingGenerator:
 
 
 if __name__ == "__main__":
-    import time
+    from jge.utils import clock
 
+    # NOTE on a simulated clock, the loops' sleeps take no real time
     smooth_step = SmoothStep(3, 3)
-
-    print("\nEasing Generator Constant Time")
-    easing_gen_ct = EasingGenerator.ConstantTime(smooth_step, 2, 20, 100)
-    t1 = time.time()
-    for i in range(easing_gen_ct.get_num_steps()):
-        print(easing_gen_ct.get_output())
-        time.sleep(easing_gen_ct.get_sleep_time())
-    t2 = time.time()
-    print(f"easing generator ran for: {t2-t1}s")
-
-    print("\nEasing Generator Constant Rate")
-    easing_gen_cr = EasingGenerator.ConstantRate(smooth_step, 10, 20, 30)
-    t1 = time.time()
-    for i in range(easing_gen_cr.get_num_steps()):
-        print(easing_gen_cr.get_output())
-        time.sleep(easing_gen_cr.get_sleep_time())
-    t2 = time.time()
-    print(f"easing generator ran for: {t2-t1}s")
+    with clock.use_clock(clock.SimulatedClock()):
+        print("\nEasing Generator Constant Time")
+        easing_gen_ct = EasingGenerator.ConstantTime(smooth_step, 2, 20, 100)
+        t1 = clock.now()
+        for i in range(easing_gen_ct.get_num_steps()):
+            print(easing_gen_ct.get_output())
+            clock.sleep(easing_gen_ct.get_sleep_time())
+        t2 = clock.now()
+        print(f"easing generator ran for: {t2-t1}s")
+        assert abs(t2 - t1 - 2) < 1e-9
+
+        print("\nEasing Generator Constant Rate")
+        easing_gen_cr = EasingGenerator.ConstantRate(smooth_step, 10, 20, 30)
+        t1 = clock.now()
+        for i in range(easing_gen_cr.get_num_steps()):
+            print(easing_gen_cr.get_output())
+            clock.sleep(easing_gen_cr.get_sleep_time())
+        t2 = clock.now()
+        print(f"easing generator ran for: {t2-t1}s")
+        assert abs(t2 - t1 - 3) < 1e-9
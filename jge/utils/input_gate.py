@@ -0,0 +1,218 @@
+import functools
+
+
+class InputGate:
+    def __init__(
+        self,
+        epsilon: float,
+        moving_epsilon: float = None,
+        extreme: float = 1.0,
+        settle_samples: int = 10,
+        feed=(),
+    ) -> None:
+        """
+        a deadband on an axis's raw input, meant to sit in front of set() or
+        set_vjoy(). hall sensor sticks sitting still still send tiny changes,
+        and those would otherwise run the whole axis pipeline just to end up
+        with the same output.
+
+        an input only gets through if it moved at least epsilon from the last
+        input that got through. once the input's moving though, the threshold
+        drops to moving_epsilon, and stays there until settle_samples inputs
+        in a row don't get through. that hysteresis keeps slow, steady
+        movements smooth, and means the last input that got through is never
+        more than moving_epsilon from where the stick actually stopped.
+
+        NOTE that means moving_epsilon should be bigger than the stick's
+        noise, else noise keeps it moving. and movement slower than
+        moving_epsilon every settle_samples inputs counts as stopped
+
+        inputs always get through if they:
+            * reach an extreme (abs(input) >= extreme)
+            * cross (or land on) the center
+
+        Args:
+            * epsilon (float): min change to get through when the input's been
+              sitting still
+            * moving_epsilon (float, optional): min change to get through while
+              the input's moving. if None, it's epsilon / 4. Defaults to None.
+            * extreme (float, optional): inputs at least this far from center
+              always get through. Defaults to 1.0.
+            * settle_samples (int, optional): how many inputs in a row have to
+              stay within moving_epsilon of the last one that got through for
+              the input to count as stopped again. Defaults to 10.
+            * feed (List[function], optional): functions that need every input
+              (like a smoothing's update()), which get called with each input
+              that gets filtered. inputs that get through are up to the
+              pipeline to feed. Defaults to ().
+
+        Examples:
+
+        gate = InputGate(0.002)
+
+        @stick.axis(1)
+        def roll_moved(event):
+            if gate(event.value):
+                x_axis.set_vjoy(event.value, Scaling.Dynamic)
+        """
+
+        self._epsilon = epsilon
+        self._moving_epsilon = epsilon / 4 if moving_epsilon is None else moving_epsilon
+        self._extreme = extreme
+        self._settle_samples = settle_samples
+        self._feed = list(feed)
+
+        # the last input that got through
+        self._last = None
+        self._is_moving = False
+        # how many inputs in a row got filtered while moving
+        self._num_settling = 0
+
+        self.num_passed = 0
+        self.num_filtered = 0
+
+    def __call__(self, input: float) -> bool:
+        """returns if input should be processed"""
+
+        last = self._last
+        if last is None:
+            return self._pass(input)
+
+        # NOTE always measured from the last input that got through, so slow
+        # movements add up instead of each small step getting filtered
+        delta = input - last if input > last else last - input
+        if self._is_moving:
+            if delta >= self._moving_epsilon:
+                return self._pass(input)
+        elif delta >= self._epsilon:
+            self._is_moving = True
+            return self._pass(input)
+
+        if input != last:
+            if input >= self._extreme or input <= -self._extreme:
+                return self._pass(input)
+            if (input < 0.0) != (last < 0.0) or (input > 0.0) != (last > 0.0):
+                return self._pass(input)
+
+        # the input's settling (or it's noise)
+        if self._is_moving:
+            self._num_settling += 1
+            if self._num_settling >= self._settle_samples:
+                self._is_moving = False
+        self.num_filtered += 1
+        for fn in self._feed:
+            fn(input)
+        return False
+
+    def _pass(self, input: float) -> bool:
+        self._last = input
+        self._num_settling = 0
+        self.num_passed += 1
+        return True
+
+    def reset(self) -> None:
+        """lets the next input through no matter what"""
+        self._last = None
+        self._is_moving = False
+        self._num_settling = 0
+
+    def wrap_callback(self, fn):
+        """
+        returns a JG axis callback that only calls fn(event, ...) for events
+        whose value gets through this gate. it has fn's parameters, so JG
+        still passes it the same things.
+        """
+
+        @functools.wraps(fn)
+        def gated(event, *args, **kwargs):
+            if self(event.value):
+                fn(event, *args, **kwargs)
+
+        return gated
+
+
+if __name__ == "__main__":
+    import math
+    import random
+
+    from jge.utils.smoothing import ExponentialSmoothing
+
+    # a stick sitting still barely gets anything through
+    smoothing = ExponentialSmoothing(0.2)
+    gate = InputGate(0.002, feed=[smoothing.update])
+    outputs = []
+    for _ in range(1000):
+        x = 0.3 + random.uniform(-0.0005, 0.0005)
+        if gate(x):
+            outputs.append(smoothing(x))
+    assert gate.num_passed == 1 and gate.num_filtered == 999
+    # smoothing still saw every sample
+    assert abs(smoothing.get_val() - 0.3) < 0.001
+
+    # slow movements get through at moving_epsilon's finer resolution, and
+    # wherever the stick stops, the last input that got through is never more
+    # than moving_epsilon off
+    for stop in [0.12, 0.2, 0.2137, 0.25003, 0.2994, 0.3]:
+        gate = InputGate(0.002)
+        ramp = [0.1 + 0.0001 * i for i in range(round((stop - 0.1) / 0.0001) + 1)]
+        last_passed = None
+        for x in ramp + [stop] * 50:
+            if gate(x):
+                last_passed = x
+            assert abs(x - last_passed) < 0.002
+        assert abs(stop - last_passed) < 0.0005, (stop, last_passed)
+        assert not gate._is_moving
+        if stop == 0.3:
+            # way more than epsilon's resolution (100) gets through
+            assert gate.num_passed > 300, gate.num_passed
+
+    # once it's stopped, small noise doesn't get through
+    num_passed = gate.num_passed
+    for i in range(1000):
+        gate(0.3 + random.uniform(-0.0004, 0.0004))
+    assert gate.num_passed == num_passed
+
+    # extremes and center crossings always get through
+    gate = InputGate(0.01)
+    for x, expected in [(0.995, True), (1.0, True), (1.0, False), (0.001, True)]:
+        assert gate(x) == expected
+    for x, expected in [(-0.001, True), (0.0, True), (0.0, False), (0.002, True)]:
+        assert gate(x) == expected
+
+    # wrapped callbacks keep their parameters
+    class Event:
+        def __init__(self, value: float) -> None:
+            self.value = value
+
+    calls = []
+
+    def axis_moved(event, vjoy):
+        calls.append(event.value)
+
+    gated = InputGate(0.01).wrap_callback(axis_moved)
+    for x in [0.5, 0.501, 0.6]:
+        gated(Event(x), vjoy=None)
+    assert calls == [0.5, 0.6]
+
+    # what the gate saves on a trimmed axis, for a stick held still with some
+    # sensor noise
+    from jge.axes.tuned_axis import AxisTuning, TunedAxis
+    from jge.axes.trimmed_axis import Scaling, TrimmedAxis
+    from jge.utils.profiling import time_per_call
+
+    axis = TrimmedAxis(TunedAxis(1, AxisTuning(0.3)))
+    noisy = [0.2 + 0.0004 * math.sin(i) for i in range(1000)]
+    gate = InputGate(0.002)
+
+    def run_ungated():
+        for x in noisy:
+            axis.set_vjoy(x, Scaling.Dynamic)
+
+    def run_gated():
+        for x in noisy:
+            if gate(x):
+                axis.set_vjoy(x, Scaling.Dynamic)
+
+    ungated = time_per_call(run_ungated, num_calls=20) / len(noisy)
+    gated = time_per_call(run_gated, num_calls=20) / len(noisy)
+    print(f"still stick per event cost: {ungated * 1e9:.0f} ns vs {gated * 1e9:.0f} ns")
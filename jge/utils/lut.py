@@ -1,22 +1,48 @@
-from jge.utils.utils import lerp, binary_floor_excl
+from array import array
+from bisect import bisect_right
+from enum import Enum
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional. it only speeds up evaluating lots of inputs at once
+    np = None
+
+from jge.utils.utils import clamp, lerp, binary_floor_excl
+
+
+class Interpolation(Enum):
+    Linear = 1
+    """straight lines between points"""
+    MonotoneCubic = 2
+    """
+    smooth curve through the points that never overshoots them (PCHIP), so a
+    handful of points can replace a big linear table
+    """
 
 
 def negate_and_reverse(values):
-    reversed = values.copy()
-    for i in range(len(reversed)):
-        reversed[i] *= -1
-    reversed.reverse()
-    return reversed
+    return array("d", [-v for v in reversed(values)])
 
 
 class LookupTable:
     def __init__(self, keys, vals) -> None:
-        """a lookup table that linearly interpolates between values"""
-        self.keys = keys
-        self.vals = vals
+        """
+        a lookup table that linearly interpolates between values
+
+        NOTE keys and vals are stored in contiguous array("d") buffers, which
+        both the scalar and batch lookups read from (numpy just wraps them
+        without copying)
+        """
+        self.keys = array("d", keys)
+        self.vals = array("d", vals)
 
     @staticmethod
-    def FromPoints(points, make_symmetrical: bool = False):
+    def FromPoints(
+        points,
+        make_symmetrical: bool = False,
+        interpolation: Interpolation = Interpolation.Linear,
+    ):
         """
         returns a lookup table created from the list of points
 
@@ -26,17 +52,100 @@ class LookupTable:
               symmetrical LUT, where you supply all positive points and the
               corresponding negative points will automatically get added.
               Defaults to False.
+            * interpolation (Interpolation, optional): how to interpolate
+              between points. Defaults to Interpolation.Linear.
 
         Returns:
             LookupTable:
         """
-        keys = [p[0] for p in points]
-        vals = [p[1] for p in points]
+        keys = array("d", [p[0] for p in points])
+        vals = array("d", [p[1] for p in points])
 
         if make_symmetrical:
             keys = negate_and_reverse(keys) + keys
             vals = negate_and_reverse(vals) + vals
 
+        if interpolation == Interpolation.MonotoneCubic:
+            return MonotoneCubicTable(keys, vals)
+        return LookupTable(keys, vals)
+
+    @staticmethod
+    def FromFunction(
+        fn,
+        tolerance: float = 1e-3,
+        x_min: float = -1.0,
+        x_max: float = 1.0,
+        resolution: int = 1024,
+    ):
+        """
+        compiles any curve into the smallest linear lookup table (that this
+        could find) that stays within tolerance of it, so the curve's math runs
+        once at load time instead of on every event.
+
+        fn gets sampled at resolution + 1 evenly spaced candidate keys (and 3
+        more points between each pair for checking error). then, starting at
+        x_min, each segment is stretched as far as it can go while staying
+        within tolerance.
+
+        Args:
+            * fn (function/functor): curve to compile. takes a float and returns
+              a float. e.g. an AxisTuning, an easing functor like SmoothStep, or
+              a lambda composing a few of them
+            * tolerance (float, optional): max allowed absolute error. Defaults
+              to 1e-3.
+            * x_min (float, optional): smallest input. Defaults to -1.0.
+            * x_max (float, optional): largest input. Defaults to 1.0.
+            * resolution (int, optional): number of segments between candidate
+              keys. this is the finest the table can get, so if the curve
+              bends too sharply for it, the error will end up over tolerance
+              there. Defaults to 1024.
+
+        Returns:
+            LookupTable:
+        """
+
+        # sample the curve once. every 4th sample is a candidate key
+        num_checks = 4 * resolution
+        x_range = x_max - x_min
+        xs = [x_min + x_range * i / num_checks for i in range(num_checks + 1)]
+        ys = [fn(x) for x in xs]
+
+        def is_within_tolerance(start_key: int, end_key: int) -> bool:
+            # checks the straight line between two candidate keys
+            start, end = 4 * start_key, 4 * end_key
+            x1, y1, x2, y2 = xs[start], ys[start], xs[end], ys[end]
+            for i in range(start + 1, end):
+                if abs(lerp(x1, y1, x2, y2, xs[i]) - ys[i]) > tolerance:
+                    return False
+            return True
+
+        key_idxs = [0]
+        while key_idxs[-1] < resolution:
+            start = key_idxs[-1]
+
+            # gallop to find a segment that's too long, then binary search
+            # for the longest one that isn't
+            good, step = start + 1, 1
+            while good < resolution:
+                bad = min(start + 2 * step, resolution)
+                if not is_within_tolerance(start, bad):
+                    break
+                good, step = bad, 2 * step
+            else:
+                bad = None
+
+            if bad is not None and good < resolution:
+                while bad - good > 1:
+                    mid = (good + bad) // 2
+                    if is_within_tolerance(start, mid):
+                        good = mid
+                    else:
+                        bad = mid
+
+            key_idxs.append(good)
+
+        keys = [xs[4 * i] for i in key_idxs]
+        vals = [ys[4 * i] for i in key_idxs]
         return LookupTable(keys, vals)
 
     def output(self, input) -> float:
@@ -51,7 +160,412 @@ class LookupTable:
             input,
         )
 
-    # TODO add another function to handle the case where input may be OOB?
+    def output_many(self, inputs):
+        """
+        same as output(), but for a whole buffer of inputs at once.
+
+        returns a numpy array if numpy is installed, else an array("d")
+        """
+
+        if np is None:
+            return array("d", [self.output(x) for x in inputs])
+
+        inputs = np.asarray(inputs, dtype=np.float64)
+        keys = np.frombuffer(self.keys)
+        vals = np.frombuffer(self.vals)
+
+        # same segments as binary_floor_excl()
+        floor_idx = np.searchsorted(keys, inputs, side="left") - 1
+        np.clip(floor_idx, 0, len(keys) - 2, out=floor_idx)
+        x1, y1 = keys[floor_idx], vals[floor_idx]
+        x2, y2 = keys[floor_idx + 1], vals[floor_idx + 1]
+
+        # same math as lerp(), so results match output() exactly. NOTE
+        # np.interp() would be simpler, but it clamps past the end keys and
+        # doesn't promise anything about duplicate keys
+        widths = x2 - x1
+        is_step = widths == 0
+        widths[is_step] = 1
+        f = (inputs - x1) / widths
+        output = y1 * (1 - f) + y2 * f
+        output[is_step] = y1[is_step]
+        return output
+
+    def _output_right(self, input) -> float:
+        """
+        same as output(), except at a vertical step (duplicate keys) this
+        returns the value just to the right of the step instead of the left
+        """
+        floor_idx = bisect_right(self.keys, input) - 1
+        floor_idx = clamp(floor_idx, 0, len(self.keys) - 2)
+        ceil_idx = floor_idx + 1
+        return lerp(
+            self.keys[floor_idx],
+            self.vals[floor_idx],
+            self.keys[ceil_idx],
+            self.vals[ceil_idx],
+            input,
+        )
+
+    def to_uniform(self, max_segments: int = 4096, tolerance: float = 1e-9):
+        """
+        resamples the table onto a uniform grid, so lookups don't need to search
+        for the segment an input lands in (see UniformTable).
+
+        the grid is the coarsest one (up to max_segments) that has a grid point
+        on every key, which makes the uniform table exactly match this one,
+        vertical steps (duplicate keys) included. if no grid that small fits
+        all keys, max_segments gets used and the result is only approximate.
+
+        NOTE the uniform table clamps inputs outside of the keys to the end
+        values, where this table would extrapolate
+
+        Args:
+            * max_segments (int, optional): max number of segments in the
+              uniform grid. Defaults to 4096.
+            * tolerance (float, optional): how close a key has to be to a grid
+              point to count as being on it. Defaults to 1e-9.
+
+        Returns:
+            UniformTable: table with its max_deviation from this one filled in
+        """
+
+        x_min = self.keys[0]
+        x_range = self.keys[-1] - x_min
+
+        num_segments = max_segments
+        for n in range(1, max_segments + 1):
+            positions = [(k - x_min) / x_range * n for k in self.keys]
+            if all(abs(p - round(p)) <= tolerance * n for p in positions):
+                num_segments = n
+                break
+
+        # grid points, snapped onto keys that (almost) land on them so the
+        # steps and breakpoints stay exactly where they were
+        grid_xs = [x_min + x_range * i / num_segments for i in range(num_segments + 1)]
+        for k in self.keys:
+            i = round((k - x_min) / x_range * num_segments)
+            if abs(grid_xs[i] - k) <= tolerance * x_range:
+                grid_xs[i] = k
+
+        vals = [self.output(x) for x in grid_xs]
+        starts = [self._output_right(x) for x in grid_xs[:-1]]
+        table = UniformTable(vals, x_min, self.keys[-1], starts)
+
+        # check between grid points, plus on and right next to every key
+        check_xs = [
+            x_min + x_range * (i + 0.5) / (4 * num_segments)
+            for i in range(4 * num_segments)
+        ]
+        # NOTE "right next to" can't be the very next float, because rounding
+        # while finding the segment can land that on the key itself
+        nudge = x_range * tolerance
+        for k in self.keys:
+            check_xs += [max(k - nudge, x_min), k, min(k + nudge, self.keys[-1])]
+        table.max_deviation = max(
+            abs(table.output(x) - self.output(x)) for x in check_xs
+        )
+
+        return table
+
+
+def _calc_pchip_slopes(keys, vals):
+    """
+    returns the curve's slope at each key for monotone cubic (PCHIP)
+    interpolation. keys must be strictly increasing.
+
+    https://en.wikipedia.org/wiki/Monotone_cubic_interpolation (same slopes as
+    scipy's PchipInterpolator)
+    """
+
+    num_segments = len(keys) - 1
+    widths = [keys[i + 1] - keys[i] for i in range(num_segments)]
+    secants = [(vals[i + 1] - vals[i]) / widths[i] for i in range(num_segments)]
+
+    if num_segments == 1:
+        return [secants[0], secants[0]]
+
+    slopes = [0.0] * len(keys)
+    for i in range(1, num_segments):
+        s1, s2 = secants[i - 1], secants[i]
+        if s1 * s2 <= 0:
+            # local min/max (or flat), so flatten out to avoid overshooting
+            continue
+        # weighted harmonic mean
+        w1 = 2 * widths[i] + widths[i - 1]
+        w2 = widths[i] + 2 * widths[i - 1]
+        slopes[i] = (w1 + w2) / (w1 / s1 + w2 / s2)
+
+    def calc_end_slope(h1, h2, s1, s2):
+        # one sided three point estimate, limited so it stays monotone
+        slope = ((2 * h1 + h2) * s1 - h1 * s2) / (h1 + h2)
+        if slope * s1 <= 0:
+            return 0.0
+        if s1 * s2 <= 0 and abs(slope) > abs(3 * s1):
+            return 3 * s1
+        return slope
+
+    slopes[0] = calc_end_slope(widths[0], widths[1], secants[0], secants[1])
+    slopes[-1] = calc_end_slope(widths[-1], widths[-2], secants[-1], secants[-2])
+    return slopes
+
+
+class MonotoneCubicTable(LookupTable):
+    def __init__(self, keys, vals) -> None:
+        """
+        a lookup table that interpolates with a monotone cubic (PCHIP) curve,
+        so it's smooth but never overshoots the points. use
+        LookupTable.FromPoints() with Interpolation.MonotoneCubic to make one.
+
+        NOTE duplicate keys (vertical steps) split the curve into separate
+        pieces, which are each smooth on their own
+
+        NOTE inputs past the end keys extrapolate along the end slopes
+        """
+
+        super().__init__(keys, vals)
+
+        # slope at the start of each segment, and at the very last key
+        slopes = [0.0] * len(keys)
+        start = 0
+        for end in range(1, len(keys) + 1):
+            if end == len(keys) or keys[end] == keys[end - 1]:
+                if end - start > 1:
+                    piece_slopes = _calc_pchip_slopes(keys[start:end], vals[start:end])
+                    slopes[start:end] = piece_slopes
+                start = end
+        self._end_slopes = (slopes[0], slopes[-1])
+
+        # cubic coefficients for each segment, in terms of the distance past
+        # the segment's left key: y = c0 + t * (c1 + t * (c2 + t * c3))
+        self._coefs = array("d")
+        for i in range(len(keys) - 1):
+            width = keys[i + 1] - keys[i]
+            if width == 0:
+                # vertical step. nothing ever gets looked up in here
+                self._coefs.extend([vals[i], 0.0, 0.0, 0.0])
+                continue
+            secant = (vals[i + 1] - vals[i]) / width
+            d1, d2 = slopes[i], slopes[i + 1]
+            c2 = (3 * secant - 2 * d1 - d2) / width
+            c3 = (d1 + d2 - 2 * secant) / (width * width)
+            self._coefs.extend([vals[i], d1, c2, c3])
+
+    def _calc_segment(self, idx: int, input: float) -> float:
+        t = input - self.keys[idx]
+        coefs = self._coefs
+        i = 4 * idx
+        return coefs[i] + t * (coefs[i + 1] + t * (coefs[i + 2] + t * coefs[i + 3]))
+
+    def output(self, input) -> float:
+        """evaluates the segment's cubic to calc output based on input"""
+        if input < self.keys[0]:
+            return self.vals[0] + self._end_slopes[0] * (input - self.keys[0])
+        if input > self.keys[-1]:
+            return self.vals[-1] + self._end_slopes[1] * (input - self.keys[-1])
+        return self._calc_segment(binary_floor_excl(self.keys, input), input)
+
+    def output_many(self, inputs):
+        """
+        same as output(), but for a whole buffer of inputs at once.
+
+        returns a numpy array if numpy is installed, else an array("d")
+        """
+
+        if np is None:
+            return array("d", [self.output(x) for x in inputs])
+
+        inputs = np.asarray(inputs, dtype=np.float64)
+        keys = np.frombuffer(self.keys)
+        coefs = np.frombuffer(self._coefs).reshape(-1, 4)
+
+        floor_idx = np.searchsorted(keys, inputs, side="left") - 1
+        np.clip(floor_idx, 0, len(keys) - 2, out=floor_idx)
+        c = coefs[floor_idx]
+        t = inputs - keys[floor_idx]
+        output = c[:, 0] + t * (c[:, 1] + t * (c[:, 2] + t * c[:, 3]))
+
+        is_below = inputs < self.keys[0]
+        output[is_below] = self.vals[0] + self._end_slopes[0] * (
+            inputs[is_below] - self.keys[0]
+        )
+        is_above = inputs > self.keys[-1]
+        output[is_above] = self.vals[-1] + self._end_slopes[1] * (
+            inputs[is_above] - self.keys[-1]
+        )
+        return output
+
+    def _output_right(self, input) -> float:
+        floor_idx = bisect_right(self.keys, input) - 1
+        floor_idx = clamp(floor_idx, 0, len(self.keys) - 2)
+        return self._calc_segment(floor_idx, input)
+
+
+class IntTable:
+    def __init__(self, fn, num_inputs: int) -> None:
+        """
+        a table of ints for the int inputs [0, num_inputs), where the output for
+        an input is fn(input). each output gets computed the first time it's
+        looked up (or all at once with fill()), so lookups are just indexing.
+
+        Args:
+            * fn (function/functor): takes an int and returns an int. outputs
+              must fit in a 32 bit int
+            * num_inputs (int): number of inputs
+        """
+
+        self._fn = fn
+        self._outputs = array("i", [0]) * num_inputs
+        # generation each output was computed in. an output from an older
+        # generation is stale. NOTE a bytearray, so reading it never allocates
+        # an int
+        self._generations = bytearray(num_inputs)
+        self._generation = 1
+
+    def reset(self) -> None:
+        """
+        forgets all outputs, so they get computed again (e.g. if fn changed).
+        NOTE this is cheap, the outputs just go stale instead of getting
+        cleared
+        """
+
+        self._generation += 1
+        if self._generation > 255:
+            # out of generations, so actually clear them (once every 255 resets)
+            self._generations = bytearray(len(self._outputs))
+            self._generation = 1
+
+    def fill(self) -> None:
+        """computes all outputs up front"""
+        self._outputs = array("i", [self._fn(i) for i in range(len(self._outputs))])
+        self._generations = bytearray([self._generation]) * len(self._outputs)
+
+    def output(self, input: int) -> int:
+        if self._generations[input] != self._generation:
+            output = self._fn(input)
+            self._outputs[input] = output
+            self._generations[input] = self._generation
+            return output
+        return self._outputs[input]
+
+
+class UniformTable:
+    def __init__(self, vals, x_min: float, x_max: float, starts=None) -> None:
+        """
+        a lookup table whose keys are evenly spaced between x_min and x_max, so
+        finding the segment an input lands in is a multiply instead of a search.
+
+        Args:
+            * vals (List[float]): values at evenly spaced keys, where the first
+              value belongs to x_min and the last value belongs to x_max
+            * x_min (float): key of the first value
+            * x_max (float): key of the last value
+            * starts (List[float], optional): value each segment starts at,
+              right after its left key. only needed for vertical steps, where
+              it's different from the value at the key itself. if None, every
+              segment starts at its left key's value. Defaults to None.
+
+        NOTE inputs outside of [x_min, x_max] get clamped to the end values
+
+        NOTE like LookupTable, an input right on a key uses the segment to the
+        left of it, so the value at a vertical step is the left side's value
+        """
+
+        self.vals = array("d", vals)
+        self.x_min = x_min
+        self.x_max = x_max
+
+        self._max_idx = len(self.vals) - 1
+        self._scale = self._max_idx / (x_max - x_min)
+
+        if starts is None:
+            starts = self.vals[:-1]
+        self._starts = array("d", starts)
+
+        # store the delta across each segment, so a lookup is a single lerp
+        self._deltas = array(
+            "d", [self.vals[i + 1] - self._starts[i] for i in range(self._max_idx)]
+        )
+
+        # max difference from the table this was resampled from (if any). see
+        # LookupTable.to_uniform()
+        self.max_deviation = 0.0
+
+    @staticmethod
+    def FromFunction(fn, x_min: float, x_max: float, resolution: int):
+        """
+        returns a uniform table made by sampling fn
+
+        Args:
+            * fn (function/functor): function to sample. takes a float and
+              returns a float
+            * x_min (float): smallest input to sample
+            * x_max (float): largest input to sample
+            * resolution (int): number of segments between x_min and x_max (the
+              table will hold resolution + 1 values)
+
+        Returns:
+            UniformTable:
+        """
+
+        x_range = x_max - x_min
+        vals = [fn(x_min + x_range * i / resolution) for i in range(resolution + 1)]
+        return UniformTable(vals, x_min, x_max)
+
+    def output(self, input: float) -> float:
+        """finds segment with a multiply and lerps to calc output"""
+        pos = (input - self.x_min) * self._scale
+        if pos <= 0:
+            return self.vals[0]
+        if pos >= self._max_idx:
+            return self.vals[self._max_idx]
+
+        # segment i covers (i, i + 1], so this is ceil(pos) - 1
+        i = int(pos)
+        if i == pos:
+            i -= 1
+        return self._starts[i] + self._deltas[i] * (pos - i)
+
+    def output_many(self, inputs):
+        """
+        same as output(), but for a whole buffer of inputs at once.
+
+        returns a numpy array if numpy is installed, else an array("d")
+        """
+
+        if np is None:
+            return array("d", [self.output(x) for x in inputs])
+
+        pos = (np.asarray(inputs, dtype=np.float64) - self.x_min) * self._scale
+        vals = np.frombuffer(self.vals)
+        starts = np.frombuffer(self._starts)
+        deltas = np.frombuffer(self._deltas)
+
+        i = np.clip(np.ceil(pos).astype(np.intp) - 1, 0, self._max_idx - 1)
+        output = starts[i] + deltas[i] * (pos - i)
+        output[pos <= 0] = vals[0]
+        output[pos >= self._max_idx] = vals[self._max_idx]
+        return output
+
+    def max_error(self, fn, samples_per_segment: int = 4) -> float:
+        """
+        returns the max absolute difference between the table and fn, checked
+        at evenly spaced points inside every segment
+
+        Args:
+            * fn (function/functor): function the table was made from
+            * samples_per_segment (int, optional): how many points to check in
+              each segment. Defaults to 4.
+        """
+
+        x_range = self.x_max - self.x_min
+        num_samples = self._max_idx * samples_per_segment
+
+        max_err = 0.0
+        for i in range(num_samples + 1):
+            x = self.x_min + x_range * i / num_samples
+            max_err = max(max_err, abs(self.output(x) - fn(x)))
+        return max_err
 
 
 if __name__ == "__main__":
@@ -64,3 +578,113 @@ if __name__ == "__main__":
     )
     for k, v in zip(lut2.keys, lut2.vals):
         print(k, v)
+
+    # lookups shouldn't allocate anything per event
+    from jge.utils.profiling import max_sweep_alloc
+
+    assert max_sweep_alloc(lut2.output, [i / 1000 - 0.5 for i in range(1001)]) == 0
+
+    square = lambda x: x * x
+    table = UniformTable.FromFunction(square, 0, 10, 10)
+    assert table.output(5) == 25
+    assert table.output(5.5) == 30.5
+    assert table.output(-1) == 0
+    assert table.output(11) == 100
+    assert table.max_error(square, 2) == 0.25
+    xs = [x / 10 for x in range(-20, 121)]
+    assert list(table.output_many(xs)) == [table.output(x) for x in xs]
+
+    # resampling keeps vertical steps, like in the dcs_f18 example
+    min_spd = 0.011
+    lut3 = LookupTable.FromPoints(
+        [(0.01, 0), (0.01, min_spd), (0.15, min_spd), (1, 1)], make_symmetrical=True
+    )
+    table = lut3.to_uniform()
+    assert table._max_idx == 200
+    assert table.max_deviation < 1e-12
+    for x in lut3.keys:
+        assert table.output(x) == lut3.output(x)
+    assert table.output(0.01) == 0
+    assert table.output(0.0101) == min_spd
+    xs = [x / 1000 for x in range(-1200, 1201)]
+    assert list(table.output_many(xs)) == [table.output(x) for x in xs]
+    # keys that don't fit a grid still resample, just not exactly
+    assert 0 < lut2.to_uniform(max_segments=7).max_deviation < 1
+
+    # monotone cubic tables go through every point, stay monotone between them
+    # and keep symmetry
+    cubic = LookupTable.FromPoints(
+        [(0.1, 0.1), (0.2, 0.4), (0.3, 1.0)],
+        make_symmetrical=True,
+        interpolation=Interpolation.MonotoneCubic,
+    )
+    for k, v in zip(cubic.keys, cubic.vals):
+        assert abs(cubic.output(k) - v) < 1e-12
+    xs = [x / 1000 for x in range(-300, 301)]
+    ys = [cubic.output(x) for x in xs]
+    assert all(y1 <= y2 for y1, y2 in zip(ys, ys[1:]))
+    assert all(abs(cubic.output(x) + cubic.output(-x)) < 1e-12 for x in xs)
+    # a flat spot stays flat instead of overshooting
+    cubic = LookupTable.FromPoints(
+        [(-1, -1), (-0.2, 0), (0.2, 0), (1, 1)],
+        interpolation=Interpolation.MonotoneCubic,
+    )
+    assert all(cubic.output(x / 100) == 0 for x in range(-20, 21))
+    # vertical steps still work
+    cubic = LookupTable.FromPoints(
+        [(0.01, 0), (0.01, min_spd), (0.15, min_spd), (1, 1)],
+        make_symmetrical=True,
+        interpolation=Interpolation.MonotoneCubic,
+    )
+    assert cubic.output(0.01) == 0 and cubic.output(0.0101) == min_spd
+    assert abs(cubic.output(1) - 1) < 1e-12
+
+    # compiling curves into small tables that stay within tolerance
+    from jge.axes.tuned_axis import AxisTuning
+    from jge.utils.easing_functions import SmoothStep
+
+    curves = [
+        (AxisTuning(0.3, False, (0.05, 0), (0.95, 1)), -1, 1),
+        (SmoothStep(2, 3), 0, 1),
+        (lambda x: 0.5 * x + 0.5 * x**3, -1, 1),
+    ]
+    for fn, x_min, x_max in curves:
+        compiled = LookupTable.FromFunction(fn, 1e-3, x_min, x_max)
+        assert len(compiled.keys) < 64
+        assert compiled.keys[0] == x_min and compiled.keys[-1] == x_max
+        for i in range(10001):
+            x = x_min + (x_max - x_min) * i / 10000
+            assert abs(compiled.output(x) - fn(x)) <= 1e-3 + 1e-12
+        print(f"compiled {type(fn).__name__} into {len(compiled.keys)} points")
+    # a straight line only needs its end points
+    assert len(LookupTable.FromFunction(lambda x: 2 * x).keys) == 2
+
+    # batches should match one at a time, steps and extrapolation included
+    xs = [x / 1000 for x in range(-1200, 1201)]
+    for t in [lut, lut2, lut3, cubic, compiled]:
+        assert list(t.output_many(xs)) == [t.output(x) for x in xs]
+
+    # int tables compute outputs lazily, and resetting one doesn't touch its
+    # memory (besides once every 255 resets)
+    offset = [0]
+    int_table = IntTable(lambda i: i + offset[0], 1025)
+    for i in range(1000):
+        offset[0] = i
+        generations = int_table._generations
+        int_table.reset()
+        assert int_table._generations is generations or i % 255 == 254
+        assert int_table.output(i % 1025) == i % 1025 + i
+        assert int_table.output(7) == 7 + i
+    int_table.fill()
+    assert list(int_table._outputs) == [j + offset[0] for j in range(1025)]
+
+    from jge.utils.profiling import time_per_call
+
+    print("output() per event cost:")
+    print(f"  LookupTable: {time_per_call(lut3.output, 0.3) * 1e9:.0f} ns")
+    print(f"  UniformTable: {time_per_call(table.output, 0.3) * 1e9:.0f} ns")
+    print(f"  MonotoneCubicTable: {time_per_call(cubic.output, 0.3) * 1e9:.0f} ns")
+
+    many_xs = [x / 50000 for x in range(-50000, 50001)]
+    t = time_per_call(lut3.output_many, many_xs, num_calls=10) / len(many_xs)
+    print(f"  LookupTable.output_many(): {t * 1e9:.0f} ns per input")
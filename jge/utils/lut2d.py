@@ -0,0 +1,194 @@
+import threading
+from array import array
+from bisect import bisect_left
+
+from jge.utils.utils import clamp
+
+
+def _find_cell(keys, key: float, i: int) -> int:
+    """
+    returns the cell key lands in, given the cell it was last in. tries the
+    neighboring cells before searching
+    """
+    if i > 0 and keys[i - 1] <= key <= keys[i]:
+        return i - 1
+    if i < len(keys) - 2 and keys[i + 1] <= key <= keys[i + 2]:
+        return i + 1
+    return clamp(bisect_left(keys, key) - 1, 0, len(keys) - 2)
+
+
+class _CachedCell(threading.local):
+    # last cell used. NOTE per thread, so threads looking up different inputs
+    # don't fight over it
+    i = 0
+    j = 0
+
+
+class LookupTable2D:
+    def __init__(self, x_keys, y_keys, vals) -> None:
+        """
+        a lookup table with 2 inputs, that bilinearly interpolates between
+        values on a grid. handy for compensating one axis based on two others,
+        like a helo's pedals based on collective and an airspeed proxy.
+
+        Args:
+            * x_keys (List[float]): strictly increasing keys for the first
+              input
+            * y_keys (List[float]): strictly increasing keys for the second
+              input
+            * vals (List[List[float]]): grid of values, where vals[i][j] is the
+              value at (x_keys[i], y_keys[j])
+
+        NOTE inputs outside of the keys get clamped to the grid's edges
+
+        each cell's bilinear coefficients are precomputed, and the last cell
+        used (by each thread) gets cached. inputs usually don't move far between
+        events, so most lookups skip searching for the cell completely, and
+        most of the rest land in a neighboring cell, which gets checked before
+        falling back to a binary search.
+        """
+
+        assert len(x_keys) >= 2 and len(y_keys) >= 2
+        assert len(vals) == len(x_keys)
+        assert all(len(row) == len(y_keys) for row in vals)
+        # NOTE duplicate keys would make zero width cells
+        for keys in [x_keys, y_keys]:
+            assert all(
+                k1 < k2 for k1, k2 in zip(keys, keys[1:])
+            ), f"keys must be strictly increasing: {list(keys)}"
+
+        self.x_keys = array("d", x_keys)
+        self.y_keys = array("d", y_keys)
+
+        # each cell's value is c0 + c1 * dx + c2 * dy + c3 * dx * dy, where dx
+        # and dy are the distances past the cell's lower keys
+        num_y_cells = len(y_keys) - 1
+        self._num_y_cells = num_y_cells
+        self._coefs = array("d")
+        for i in range(len(x_keys) - 1):
+            width = x_keys[i + 1] - x_keys[i]
+            for j in range(num_y_cells):
+                height = y_keys[j + 1] - y_keys[j]
+                v00, v01 = vals[i][j], vals[i][j + 1]
+                v10, v11 = vals[i + 1][j], vals[i + 1][j + 1]
+                self._coefs.extend(
+                    [
+                        v00,
+                        (v10 - v00) / width,
+                        (v01 - v00) / height,
+                        (v11 - v10 - v01 + v00) / (width * height),
+                    ]
+                )
+
+        self._cell = _CachedCell()
+
+    @staticmethod
+    def FromFunction(fn, x_keys, y_keys):
+        """
+        returns a 2D lookup table made by sampling fn at every grid point
+
+        Args:
+            * fn (function/functor): takes 2 floats (x, y) and returns a float
+            * x_keys (List[float]): increasing keys for the first input
+            * y_keys (List[float]): increasing keys for the second input
+
+        Returns:
+            LookupTable2D:
+        """
+
+        vals = [[fn(x, y) for y in y_keys] for x in x_keys]
+        return LookupTable2D(x_keys, y_keys, vals)
+
+    def output(self, x: float, y: float) -> float:
+        """bilinearly interpolates to calc output based on inputs"""
+
+        x_keys = self.x_keys
+        y_keys = self.y_keys
+
+        # clamp to the grid. NOTE not using utils.clamp() since this runs on
+        # every event and it's just as easy to inline
+        if x < x_keys[0]:
+            x = x_keys[0]
+        elif x > x_keys[-1]:
+            x = x_keys[-1]
+        if y < y_keys[0]:
+            y = y_keys[0]
+        elif y > y_keys[-1]:
+            y = y_keys[-1]
+
+        # only search for the cell if the inputs left the last one
+        cell = self._cell
+        i = cell.i
+        if not (x_keys[i] <= x <= x_keys[i + 1]):
+            i = _find_cell(x_keys, x, i)
+            cell.i = i
+        j = cell.j
+        if not (y_keys[j] <= y <= y_keys[j + 1]):
+            j = _find_cell(y_keys, y, j)
+            cell.j = j
+
+        dx = x - x_keys[i]
+        dy = y - y_keys[j]
+        coefs = self._coefs
+        k = 4 * (i * self._num_y_cells + j)
+        return coefs[k] + dx * (coefs[k + 1] + dy * coefs[k + 3]) + dy * coefs[k + 2]
+
+
+if __name__ == "__main__":
+    fn = lambda x, y: x * y + 2 * x - y
+    keys = [-1, -0.5, 0, 0.25, 1]
+    table = LookupTable2D.FromFunction(fn, keys, [0, 0.5, 1])
+
+    # bilinear interpolation is exact for functions like this one
+    for x in [k / 20 for k in range(-20, 21)]:
+        for y in [k / 20 for k in range(0, 21)]:
+            assert abs(table.output(x, y) - fn(x, y)) < 1e-12
+
+    # outside the grid clamps to the edges
+    assert abs(table.output(-2, -1) - fn(-1, 0)) < 1e-12
+    assert abs(table.output(2, 3) - fn(1, 1)) < 1e-12
+
+    # moving to a neighboring cell, or jumping anywhere, finds the right cell
+    cells = [(x0, x1) for x0, x1 in zip(keys, keys[1:])]
+    sweep_and_jumps = [i / 500 - 1.0 for i in range(1001)]
+    sweep_and_jumps += [((i * 7919) % 2001) / 1000 - 1.0 for i in range(1000)]
+    for x in sweep_and_jumps:
+        i_cell = _find_cell(table.x_keys, x, table._cell.i)
+        assert cells[i_cell][0] <= x <= cells[i_cell][1], (x, i_cell)
+        assert abs(table.output(x, 0.3) - fn(x, 0.3)) < 1e-12
+
+    # duplicate or unsorted keys get caught up front
+    for bad_keys in [[-1, 0, 0, 1], [-1, 0.5, 0, 1]]:
+        try:
+            LookupTable2D.FromFunction(fn, bad_keys, [0, 1])
+        except AssertionError:
+            continue
+        assert False, bad_keys
+
+    # threads looking up different cells each keep their own cached cell
+    import threading
+
+    def look_up(x, y):
+        for _ in range(20000):
+            assert abs(table.output(x, y) - fn(x, y)) < 1e-12
+
+    main_cell = (table._cell.i, table._cell.j)
+    threads = [
+        threading.Thread(target=look_up, args=(x, y))
+        for x, y in [(-0.9, 0.1), (0.9, 0.9), (0.1, 0.6)]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (table._cell.i, table._cell.j) == main_cell
+
+    # lookups shouldn't allocate anything per event, cached cell or not
+    from jge.utils.profiling import max_sweep_alloc, time_per_call
+
+    sweep = [i / 1000 - 1.0 for i in range(2001)]
+    assert max_sweep_alloc(table.output, sweep, 0.3) == 0
+    assert max_sweep_alloc(lambda y: table.output(0.1, y), sweep) == 0
+
+    same_cell = time_per_call(table.output, 0.1, 0.3)
+    print(f"output() per event cost: {same_cell * 1e9:.0f} ns")
@@ -0,0 +1,112 @@
+"""
+little helpers for measuring hot paths. these are used by the checks and
+benchmarks at the bottom of some modules
+"""
+
+import time
+import tracemalloc
+
+
+def max_transient_alloc(fn, *args, num_calls: int = 1000) -> int:
+    """
+    calls fn(*args) repeatedly and returns the most memory (in bytes) any single
+    call allocated, even if it was freed again before returning. 0 means the
+    calls didn't allocate any python objects.
+
+    NOTE the first few calls are made before measuring, so one-time allocations
+    (like caches or float free lists filling up) don't count.
+    """
+
+    for _ in range(10):
+        fn(*args)
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+
+    max_alloc = 0
+    for _ in range(num_calls):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        max_alloc = max(max_alloc, peak - current)
+
+    if not was_tracing:
+        tracemalloc.stop()
+
+    return max_alloc
+
+
+def max_sweep_alloc(fn, inputs, *args) -> int:
+    """
+    same as max_transient_alloc(), but calls fn(x, *args) for each x in inputs,
+    so hot paths get measured with a moving input instead of one that might
+    take a shortcut (like a suppressed write) after the first call
+
+    NOTE the whole sweep runs once before measuring, since python specializes
+    each branch of code the first few times it runs, which allocates
+    """
+
+    # NOTE premade, since fn(x, *args) would make a new tuple every call
+    calls = [(x, *args) for x in inputs]
+    for call in calls:
+        fn(*call)
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+
+    # NOTE the first few measurements after tracing starts include some of
+    # tracemalloc's own setup, so they're thrown away
+    for is_warmup in [True, False]:
+        max_alloc = 0
+        for call in calls[:10] if is_warmup else calls:
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            fn(*call)
+            _, peak = tracemalloc.get_traced_memory()
+            if peak - current > max_alloc:
+                max_alloc = peak - current
+
+    if not was_tracing:
+        tracemalloc.stop()
+
+    return max_alloc
+
+
+class _Counter:
+    def __init__(self) -> None:
+        self.n = 1000
+
+    def bump(self) -> None:
+        self.n += 1
+
+
+def get_counter_alloc(num_counters: int = 1) -> int:
+    """
+    returns what bumping num_counters int counters once each allocates. ints
+    past 256 are new objects every time, so anything that counts its calls in
+    ints (like vjoy write counters) can't get below this. the ints are freed
+    right away and the GC never tracks them, so checks can allow for them
+    """
+    return num_counters * max_transient_alloc(_Counter().bump)
+
+
+def time_per_call(fn, *args, num_calls: int = 100_000) -> float:
+    """returns the average time (in seconds) of calling fn(*args)"""
+
+    t1 = time.perf_counter()
+    for _ in range(num_calls):
+        fn(*args)
+    t2 = time.perf_counter()
+    return (t2 - t1) / num_calls
+
+
+if __name__ == "__main__":
+    nums = []
+    assert max_transient_alloc(abs, -1.5) == 0
+    assert max_transient_alloc(lambda: nums.append([])) > 0
+    assert max_sweep_alloc(abs, [-1.5, 2.5, -3.5]) == 0
+    assert 0 < get_counter_alloc(1) < get_counter_alloc(2)
+    print(f"abs() takes {time_per_call(abs, -1.5) * 1e9:.1f} ns")
@@ -0,0 +1,319 @@
+"""
+a single worker thread that runs timed tasks for all of JGE.
+
+anything that used to start its own thread just to sleep in a loop (relative
+axes, macros, tempos, trimming) schedules tasks here instead, so mashing buttons
+never creates more than this one extra thread fighting JG's event thread.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import traceback
+
+from jge.utils import clock
+
+
+class Task:
+    def __init__(self, fn, args, due_s: float, period_s: float, num_calls: int):
+        """
+        a handle to a scheduled call. don't make these directly, use
+        Scheduler.call_later() or Scheduler.call_every() instead.
+        """
+
+        self._fn = fn
+        self._args = args
+        self._due_s = due_s
+        # None for one-shot tasks
+        self._period_s = period_s
+        # None for periodic tasks that run until they're cancelled
+        self._calls_left = num_calls
+
+        self._cancelled = False
+        self._done = num_calls == 0
+
+    def cancel(self) -> None:
+        """
+        stops the task from running again. it's safe to call this more than
+        once, from any thread, or from inside the task itself.
+        """
+        self._cancelled = True
+
+    def is_active(self) -> bool:
+        """returns if the task is still going to run"""
+        return not (self._cancelled or self._done)
+
+
+class SchedulerStats:
+    def __init__(self) -> None:
+        """
+        keeps track of how well the scheduler keeps up.
+
+        * lateness (jitter) is how long after its due time a task actually ran
+        * an overrun is when a periodic task fell so far behind that it skipped
+          at least one whole tick
+        """
+
+        self.num_runs = 0
+        self.num_overruns = 0
+        self.max_lateness_s = 0.0
+        self.total_lateness_s = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"SchedulerStats(runs: {self.num_runs}, overruns: {self.num_overruns}, "
+            f"avg lateness: {self.get_avg_lateness_s() * 1000:.3f} ms, "
+            f"max lateness: {self.max_lateness_s * 1000:.3f} ms)"
+        )
+
+    def record_run(self, lateness_s: float) -> None:
+        self.num_runs += 1
+        self.total_lateness_s += lateness_s
+        if lateness_s > self.max_lateness_s:
+            self.max_lateness_s = lateness_s
+
+    def get_avg_lateness_s(self) -> float:
+        if self.num_runs == 0:
+            return 0.0
+        return self.total_lateness_s / self.num_runs
+
+    def reset(self) -> None:
+        self.__init__()
+
+
+class Scheduler:
+    def __init__(self) -> None:
+        """
+        runs one-shot and periodic tasks on a single worker thread, ordered by
+        due time with a heap.
+
+        NOTE tasks all share the one thread, so they should be quick (set a
+        vjoy value, press a button, etc.) and never sleep. a task that needs to
+        wait should schedule another task instead.
+        """
+
+        self._heap = []
+        # tie breaker so tasks due at the same time run in the order they were
+        # scheduled (and heapq never has to compare two tasks)
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+        self.stats = SchedulerStats()
+
+    def _now(self) -> float:
+        return clock.now()
+
+    def call_later(self, delay_s: float, fn, *args) -> Task:
+        """
+        calls fn(*args) once, after delay_s seconds
+
+        Returns:
+            Task: handle that can cancel the call
+        """
+
+        task = Task(fn, args, self._now() + delay_s, None, 1)
+        self._push(task)
+        return task
+
+    def call_every(
+        self,
+        period_s: float,
+        fn,
+        *args,
+        num_calls: int = None,
+        delay_s: float = None,
+    ) -> Task:
+        """
+        calls fn(*args) every period_s seconds
+
+        Args:
+            * period_s (float): time between calls in seconds
+            * fn (function/functor): what to call
+            * num_calls (int, optional): stop after this many calls. if None,
+              calls continue until the task is cancelled. Defaults to None.
+            * delay_s (float, optional): delay before the first call. if None,
+              the first call happens after one period. Defaults to None.
+
+        Returns:
+            Task: handle that can cancel the calls
+        """
+
+        if delay_s is None:
+            delay_s = period_s
+
+        task = Task(fn, args, self._now() + delay_s, period_s, num_calls)
+        if task.is_active():
+            self._push(task)
+        return task
+
+    def _push(self, task: Task) -> None:
+        with self._condition:
+            heapq.heappush(self._heap, (task._due_s, next(self._counter), task))
+
+            self._start_thread()
+            self._condition.notify()
+
+    def _start_thread(self) -> None:
+        """
+        starts the worker thread, if it's needed and isn't running yet. NOTE
+        hold the condition's lock while calling this
+        """
+        if self._thread is None and not clock.get_clock().is_simulated:
+            self._thread = threading.Thread(
+                target=self._run, name="jge scheduler", daemon=True
+            )
+            self._thread.start()
+
+    def _pop_due_task(self, now: float) -> Task:
+        """
+        pops and returns the next task that's due (or None if nothing is due).
+        cancelled tasks get thrown away along the way.
+
+        NOTE hold the condition's lock while calling this
+        """
+
+        while self._heap:
+            due_s, _, task = self._heap[0]
+            if not task.is_active():
+                heapq.heappop(self._heap)
+            elif due_s <= now:
+                heapq.heappop(self._heap)
+                return task
+            else:
+                return None
+        return None
+
+    def _get_wait_time(self, now: float) -> float:
+        """
+        returns how long until the next task is due (or None if there are no
+        tasks). NOTE hold the condition's lock while calling this
+        """
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - now, 0.0)
+
+    def _pop_worker_task(self) -> Task:
+        # NOTE a simulated clock runs tasks itself, from SimulatedClock.advance()
+        if clock.get_clock().is_simulated:
+            return None
+        return self._pop_due_task(self._now())
+
+    def _run(self) -> None:
+        """worker thread loop"""
+
+        while True:
+            with self._condition:
+                task = self._pop_worker_task()
+                while task is None:
+                    if clock.get_clock().is_simulated:
+                        self._condition.wait()
+                    else:
+                        self._condition.wait(self._get_wait_time(self._now()))
+                    task = self._pop_worker_task()
+
+            self._run_task(task)
+
+    def get_next_due_time(self) -> float:
+        """returns when the next task is due (or None if there are no tasks)"""
+        with self._condition:
+            while self._heap and not self._heap[0][2].is_active():
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def run_due_tasks(self) -> None:
+        """
+        runs every task that's due on the calling thread, including ones that
+        come due while running them. SimulatedClock.advance() uses this.
+        """
+        while True:
+            with self._condition:
+                task = self._pop_due_task(self._now())
+            if task is None:
+                return
+            self._run_task(task)
+
+    def rebase(self, old_now: float, new_now: float, swap_clock) -> None:
+        """
+        moves every task from one clock's timeline to another's, keeping how long
+        each one has left to wait. clock.set_clock() calls this, and swaps the
+        clock with swap_clock() while the worker can't run anything.
+        """
+        offset = new_now - old_now
+        with self._condition:
+            swap_clock()
+            for _, _, task in self._heap:
+                task._due_s += offset
+            # shifting every entry the same amount keeps the heap ordered
+            self._heap = [(due_s + offset, n, task) for due_s, n, task in self._heap]
+            if self._heap:
+                self._start_thread()
+            self._condition.notify()
+
+    def _run_task(self, task: Task) -> None:
+        start = self._now()
+        self.stats.record_run(start - task._due_s)
+
+        try:
+            task._fn(*task._args)
+        except Exception:
+            # don't let one bad task take down every other task
+            traceback.print_exc()
+
+        if task._calls_left is not None:
+            task._calls_left -= 1
+            if task._calls_left <= 0:
+                task._done = True
+
+        if task._period_s is None:
+            task._done = True
+
+        if not task.is_active():
+            return
+
+        # keep a steady rate by scheduling from the due time instead of from
+        # now, but if we fell a whole tick (or more) behind, skip ahead instead
+        # of running a burst of catch up calls
+        task._due_s += task._period_s
+        now = self._now()
+        if task._due_s < now:
+            self.stats.num_overruns += 1
+            task._due_s = now
+
+        self._push(task)
+
+
+_scheduler = Scheduler()
+
+
+def get_scheduler() -> Scheduler:
+    """returns the scheduler shared by all of JGE"""
+    return _scheduler
+
+
+if __name__ == "__main__":
+    scheduler = get_scheduler()
+    calls = []
+
+    scheduler.call_later(0.05, calls.append, "later")
+    scheduler.call_later(0.01, calls.append, "sooner")
+    cancelled = scheduler.call_later(0.02, calls.append, "cancelled")
+    cancelled.cancel()
+    ticks = scheduler.call_every(0.01, calls.append, "tick", num_calls=3, delay_s=0)
+    forever = scheduler.call_every(0.01, calls.append, "forever")
+
+    time.sleep(0.1)
+    forever.cancel()
+    num_calls = len(calls)
+    time.sleep(0.05)
+
+    assert len(calls) == num_calls
+    assert calls.index("sooner") < calls.index("later")
+    assert "cancelled" not in calls
+    assert calls.count("tick") == 3
+    assert not ticks.is_active()
+    assert calls.count("forever") >= 5
+    assert threading.active_count() == 2
+
+    print(scheduler.stats)
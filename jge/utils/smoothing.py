@@ -1,3 +1,6 @@
+from jge.utils import clock
+
+
 class MovingAverage:
     def __init__(self, size: int) -> None:
         self._nums = [0] * size
@@ -24,16 +27,53 @@ class MovingAverage:
 
 
 class ExponentialSmoothing:
-    def __init__(self, alpha: float) -> None:
+    def __init__(self, alpha: float, sample_period_s: float = None) -> None:
+        """
+        Args:
+            * alpha (float) [0, 1]: how much each new sample counts. lower is
+              smoother
+            * sample_period_s (float, optional): if set, alpha is how much a
+              sample counts after this much time, and each update's alpha gets
+              scaled by how much time actually passed since the last one. so
+              the smoothing stays the same even if samples get skipped (like
+              with CoalescedCallback) or show up at an uneven rate. if None,
+              every update counts the same. Defaults to None.
+        """
+
         self._alpha = alpha
         self._prev_value = 0
 
-    def __call__(self, num: float) -> float:
-        self.update(num)
+        self._sample_period_s = sample_period_s
+        self._prev_time_s = None
+
+    def __call__(self, num: float, dt_s: float = None, time_s: float = None) -> float:
+        self.update(num, dt_s, time_s)
         return self.get_val()
 
-    def update(self, num: float):
-        self._prev_value = self._alpha * num + (1 - self._alpha) * self._prev_value
+    def update(self, num: float, dt_s: float = None, time_s: float = None):
+        """
+        Args:
+            * num (float): new sample
+            * dt_s (float, optional): time since the last sample. only used
+              with sample_period_s. if None, it's measured. Defaults to None.
+            * time_s (float, optional): clock time the sample was taken at (like
+              CoalescedCallback's sample_time_s), for measuring dt_s. if None,
+              it's now. Defaults to None.
+        """
+
+        alpha = self._alpha
+        if self._sample_period_s is not None:
+            if dt_s is None:
+                now = clock.now() if time_s is None else time_s
+                prev_time_s = self._prev_time_s
+                self._prev_time_s = now
+                # the first sample counts like it came one period late
+                dt_s = (
+                    self._sample_period_s if prev_time_s is None else now - prev_time_s
+                )
+            alpha = 1 - (1 - alpha) ** (dt_s / self._sample_period_s)
+
+        self._prev_value = alpha * num + (1 - alpha) * self._prev_value
 
     def get_val(self) -> float:
         return self._prev_value
@@ -76,3 +116,13 @@ if __name__ == "__main__":
     moving_average = MovingAverage(10)
     for _ in range(20):
         moving_average(1.0)
+
+    # with a sample period, skipping samples of a steady input doesn't change
+    # where the smoothing ends up
+    every_sample = ExponentialSmoothing(0.1, sample_period_s=0.001)
+    skipped_samples = ExponentialSmoothing(0.1, sample_period_s=0.001)
+    for _ in range(10):
+        every_sample(1.0, 0.001)
+    skipped_samples(1.0, 0.01)
+    assert abs(every_sample.get_val() - skipped_samples.get_val()) < 1e-12
+    assert abs(every_sample.get_val() - (1 - 0.9**10)) < 1e-12
@@ -5,7 +5,14 @@ def clamp(num, min_val, max_val):
     """
     clamps num to be between min and max
     """
-    return max(min(num, max_val), min_val)
+
+    # NOTE this is equivalent to max(min(num, max_val), min_val), but calling
+    # min/max allocates an args tuple every time and clamp runs on every event
+    if num > max_val:
+        num = max_val
+    if num < min_val:
+        num = min_val
+    return num
 
 
 def lerp(x1, y1, x2, y2, x) -> float:
@@ -104,3 +111,8 @@ if __name__ == "__main__":
     assert is_between(5, 12, -5) == True
     assert is_between(11, 20, 13) == False
     assert is_between(-2, -3, -4) == False
+
+    assert clamp(5, 1, 10) == 5
+    assert clamp(-5, 1, 10) == 1
+    assert clamp(15, 1, 10) == 10
+    assert clamp(5, 3, 1) == max(min(5, 1), 3)
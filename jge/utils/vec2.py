@@ -2,6 +2,9 @@ from jge.utils.utils import lerp
 
 
 class Vec2:
+    # no per-instance dict, just the two floats
+    __slots__ = ("x", "y")
+
     def __init__(self, x: float, y: float):
         self.x = x
         self.y = y
@@ -40,6 +43,29 @@ class Vec2:
     def __mul__(self, scalar):
         return Vec2.Multiply(self, scalar)
 
+    # in-place operators modify self instead of returning a new Vec2
+
+    def __iadd__(self, other):
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def __imul__(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def set(self, x: float, y: float):
+        """sets x and y in place. returns self"""
+        self.x = x
+        self.y = y
+        return self
+
     @staticmethod
     def Copy(p):
         return Vec2(p.x, p.y)
@@ -75,7 +101,16 @@ class Vec2:
 
         diff = p2 - p1
         diff *= t
-        return p1 + diff
+        diff += p1
+        return diff
+
+    @staticmethod
+    def LerpInto(out, p1, p2, t):
+        """
+        linearly interpolates between p1 and p2, using proportion t, and stores
+        the result in out instead of making a new Vec2. returns out
+        """
+        return out.set(p1.x + (p2.x - p1.x) * t, p1.y + (p2.y - p1.y) * t)
 
     @staticmethod
     def LerpX(p1, p2, x):
@@ -85,6 +120,14 @@ class Vec2:
         t = lerp(p1.x, 0, p2.x, 1, x)
         return Vec2.Lerp(p1, p2, t)
 
+    @staticmethod
+    def LerpY(p1, p2, x) -> float:
+        """
+        returns just the y value of linearly interpolating between p1 and p2,
+        using value x. no Vec2s get made
+        """
+        return lerp(p1.x, p1.y, p2.x, p2.y, x)
+
     @staticmethod
     def Slope(p1, p2) -> float:
         """returns slope between p1 and p2"""
@@ -102,3 +145,13 @@ if __name__ == "__main__":
     p11 = Vec2(0, 0)
     p12 = Vec2(100, 500)
     assert Vec2.Lerp(p11, p12, 0.50) == Vec2(50, 250)
+    assert Vec2.LerpX(p11, p12, 20) == Vec2(20, 100)
+    assert Vec2.LerpY(p11, p12, 20) == 100
+
+    p13 = Vec2(0, 0)
+    assert Vec2.LerpInto(p13, p11, p12, 0.25) is p13
+    assert p13 == Vec2(25, 125)
+
+    p14 = p13
+    p14 += p1
+    assert p13 is p14 and p13 == Vec2(26, 127)